@@ -1,6 +1,7 @@
 using System;
 using System.Diagnostics;
 using System.IO;
+using System.Net.Http;
 using System.Threading;
 using System.Threading.Tasks;
 using Microsoft.Extensions.Hosting;
@@ -8,104 +9,228 @@ using Microsoft.Extensions.Logging;
 
 namespace BlockchainNews.Services
 {
+    /// <summary>
+    /// 托管 Python 爬虫守护进程（Crawler/daemon.py）：
+    /// 启动时拉起一次守护进程，由它内部按间隔调度各爬虫并在两轮之间保持浏览器打开；
+    /// 这里只定时做健康检查，守护进程退出或无响应时重启，不再每轮都启动新的 Python 进程
+    /// </summary>
     public class BinanceCrawlerService : IHostedService, IDisposable
     {
         private readonly ILogger<BinanceCrawlerService> _logger;
+        private readonly HttpClient _http;
         private Timer _timer;
-        
-        // 定时间隔：2小时（可根据需要调整）
-        private readonly TimeSpan _interval = TimeSpan.FromHours(2);
+        private Process _daemon;
+        private int _checking;
+
+        // 守护进程监听的本机端口
+        private const int DaemonPort = 8765;
+
+        // 健康检查间隔（爬取间隔由守护进程内部调度，默认每个来源 2 小时）
+        private readonly TimeSpan _healthInterval = TimeSpan.FromMinutes(5);
+
+        // 每个爬虫单轮的运行时间预算：守护进程依次运行各来源，都要在下一轮之前完成
+        private readonly TimeSpan _crawlerTimeBudget = TimeSpan.FromMinutes(50);
 
 
         public BinanceCrawlerService(ILogger<BinanceCrawlerService> logger)
         {
             _logger = logger;
+            _http = new HttpClient
+            {
+                BaseAddress = new Uri($"http://127.0.0.1:{DaemonPort}/"),
+                Timeout = TimeSpan.FromSeconds(10)
+            };
         }
 
         public Task StartAsync(CancellationToken cancellationToken)
         {
             _logger.LogInformation("BinanceCrawlerService 启动");
 
-            // 启动后立即执行一次，然后按间隔定时执行
-            _timer = new Timer(ExecuteCrawler, null, TimeSpan.Zero, _interval);
+            // 启动后立即检查一次（守护进程未运行时拉起），然后定时健康检查
+            _timer = new Timer(CheckDaemon, null, TimeSpan.Zero, _healthInterval);
 
             return Task.CompletedTask;
         }
 
-        private void ExecuteCrawler(object state)
+        private async void CheckDaemon(object state)
         {
-            // 执行 binance blog 爬虫
-            ExecutePythonScript("binance", "main.py");
-            
-            // 执行 binance_detail 爬虫
-            ExecutePythonScript("binance_detail", "main.py");
-        }
+            // 上一次检查（可能正在等待守护进程启动）未结束时跳过
+            if (Interlocked.Exchange(ref _checking, 1) == 1)
+            {
+                return;
+            }
 
-        private void ExecutePythonScript(string crawlerFolder, string scriptName)
-        {
             try
             {
-                _logger.LogInformation($"开始执行 {crawlerFolder} 爬虫...");
+                if (await IsHealthyAsync())
+                {
+                    return;
+                }
 
-                var baseDir = AppDomain.CurrentDomain.BaseDirectory;
-                var scriptPath = Path.GetFullPath(Path.Combine(baseDir, "..", "..", "..", "Crawler", crawlerFolder, scriptName));
-                var workingDir = Path.GetDirectoryName(scriptPath);
+                _logger.LogWarning("爬虫守护进程未运行或无响应，正在重启...");
+                StopDaemonProcess();
+                StartDaemonProcess();
+            }
+            catch (Exception ex)
+            {
+                _logger.LogError(ex, "检查爬虫守护进程时发生异常");
+            }
+            finally
+            {
+                Interlocked.Exchange(ref _checking, 0);
+            }
+        }
 
-                // 发布后路径可能不同
-                if (!File.Exists(scriptPath))
+        private async Task<bool> IsHealthyAsync()
+        {
+            try
+            {
+                using (var response = await _http.GetAsync("health"))
                 {
-                    scriptPath = Path.Combine(baseDir, "Crawler", crawlerFolder, scriptName);
-                    workingDir = Path.GetDirectoryName(scriptPath);
+                    return response.IsSuccessStatusCode;
                 }
+            }
+            catch (HttpRequestException)
+            {
+                return false;
+            }
+            catch (TaskCanceledException)
+            {
+                return false;
+            }
+        }
 
-                if (!File.Exists(scriptPath))
+        /// <summary>
+        /// 立即运行某个来源（"blog" 或 "square"），不等待爬取完成
+        /// </summary>
+        public async Task<bool> TriggerAsync(string source)
+        {
+            try
+            {
+                using (var response = await _http.PostAsync($"run/{source}", null))
                 {
-                    _logger.LogError($"找不到爬虫脚本: {scriptPath}");
-                    return;
+                    return response.IsSuccessStatusCode;
                 }
+            }
+            catch (Exception ex)
+            {
+                _logger.LogError(ex, $"触发 {source} 爬虫失败");
+                return false;
+            }
+        }
 
-                var processInfo = new ProcessStartInfo
-                {
-                    FileName = "python",
-                    Arguments = $"\"{scriptPath}\"",
-                    WorkingDirectory = workingDir,
-                    RedirectStandardOutput = true,
-                    RedirectStandardError = true,
-                    UseShellExecute = false,
-                    CreateNoWindow = true
-                };
-
-                using (var process = Process.Start(processInfo))
+        /// <summary>
+        /// 守护进程的运行状态（JSON）
+        /// </summary>
+        public Task<string> GetStatusAsync()
+        {
+            return _http.GetStringAsync("status");
+        }
+
+        private void StartDaemonProcess()
+        {
+            var baseDir = AppDomain.CurrentDomain.BaseDirectory;
+            var scriptPath = Path.GetFullPath(Path.Combine(baseDir, "..", "..", "..", "Crawler", "daemon.py"));
+
+            // 发布后路径可能不同
+            if (!File.Exists(scriptPath))
+            {
+                scriptPath = Path.Combine(baseDir, "Crawler", "daemon.py");
+            }
+
+            if (!File.Exists(scriptPath))
+            {
+                _logger.LogError($"找不到爬虫守护进程脚本: {scriptPath}");
+                return;
+            }
+
+            var processInfo = new ProcessStartInfo
+            {
+                FileName = "python",
+                Arguments = $"\"{scriptPath}\" --port {DaemonPort}",
+                WorkingDirectory = Path.GetDirectoryName(scriptPath),
+                RedirectStandardOutput = true,
+                RedirectStandardError = true,
+                UseShellExecute = false,
+                CreateNoWindow = true
+            };
+            // 爬虫按该预算提前停止抓取，保证每一轮都能生成 feed
+            processInfo.Environment["CRAWL_TIME_BUDGET"] = ((int)_crawlerTimeBudget.TotalSeconds).ToString();
+            processInfo.Environment["PYTHONUNBUFFERED"] = "1";
+
+            _daemon = new Process { StartInfo = processInfo, EnableRaisingEvents = true };
+            _daemon.OutputDataReceived += (sender, e) =>
+            {
+                if (e.Data != null) _logger.LogInformation($"[crawler] {e.Data}");
+            };
+            _daemon.ErrorDataReceived += (sender, e) =>
+            {
+                if (e.Data != null) _logger.LogWarning($"[crawler] {e.Data}");
+            };
+            _daemon.Exited += (sender, e) =>
+                _logger.LogWarning($"爬虫守护进程已退出，退出码: {((Process)sender).ExitCode}");
+
+            _daemon.Start();
+            _daemon.BeginOutputReadLine();
+            _daemon.BeginErrorReadLine();
+            _logger.LogInformation($"爬虫守护进程已启动，PID: {_daemon.Id}");
+        }
+
+        private void StopDaemonProcess()
+        {
+            if (_daemon == null)
+            {
+                return;
+            }
+
+            try
+            {
+                if (!_daemon.HasExited)
                 {
-                    var output = process.StandardOutput.ReadToEnd();
-                    var error = process.StandardError.ReadToEnd();
-                    process.WaitForExit();
-
-                    if (process.ExitCode == 0)
-                    {
-                        _logger.LogInformation($"{crawlerFolder} 爬虫执行成功\n{output}");
-                    }
-                    else
-                    {
-                        _logger.LogError($"{crawlerFolder} 爬虫执行失败，退出码: {process.ExitCode}\n{error}");
-                    }
+                    _daemon.Kill();
+                    _daemon.WaitForExit(10000);
                 }
             }
             catch (Exception ex)
             {
-                _logger.LogError(ex, $"执行 {crawlerFolder} 爬虫时发生异常");
+                _logger.LogWarning(ex, "结束爬虫守护进程失败");
+            }
+            finally
+            {
+                _daemon.Dispose();
+                _daemon = null;
             }
         }
-        public Task StopAsync(CancellationToken cancellationToken)
+
+        public async Task StopAsync(CancellationToken cancellationToken)
         {
             _logger.LogInformation("BinanceCrawlerService 停止");
             _timer?.Change(Timeout.Infinite, 0);
-            return Task.CompletedTask;
+
+            if (_daemon == null)
+            {
+                return;
+            }
+
+            try
+            {
+                // 先请求守护进程自行停止（关闭浏览器），超时再强制结束
+                await _http.PostAsync("stop", null, cancellationToken);
+                await Task.Run(() => _daemon.WaitForExit(90000), cancellationToken);
+            }
+            catch (Exception ex)
+            {
+                _logger.LogWarning(ex, "请求爬虫守护进程停止失败");
+            }
+
+            StopDaemonProcess();
         }
 
         public void Dispose()
         {
             _timer?.Dispose();
+            StopDaemonProcess();
+            _http.Dispose();
         }
     }
-}
\ No newline at end of file
+}
@@ -0,0 +1,174 @@
+"""
+页面解析基准
+用录制的文章详情页测量:
+    1. 解析吞吐: 在当前线程解析 与 1、2……N 个解析进程 的页面/秒、加速比、每个核的加速比
+    2. 抓取循环: 模拟每篇加载 --load 秒的串行抓取，比较在抓取线程里解析与交给进程池解析的总耗时
+       （后者解析与下一篇的加载重叠，浏览器不再等 Python 解析）
+
+页面默认取 bench_fixtures/<来源>/*.html（用 --record 录制）；还没有录制的页面时
+退回 binance/binance_blog_detail.html（按渲染后的博客详情页构造的约 300KB 页面，结果只作参考）
+
+用法:
+    python bench_extraction.py --record 文章链接 [文章链接 ...] [--source blog|square]
+    python bench_extraction.py [页面.html ...] [--pages 200] [--workers 4] [--load 0.5] [--source blog|square]
+"""
+import glob
+import os
+import re
+import sys
+import time
+from collections import deque
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common.extraction import ExtractionExecutor, PendingExtraction, take_all, take_ready
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# 录制的页面：bench_fixtures/<来源>/*.html
+RECORDED_DIR = os.path.join(BASE_DIR, 'bench_fixtures')
+# 没有录制页面时使用的构造页面（binance_blog_html.html 只有 2KB 的 WAF 验证页，解析太快，体现不出进程池的收益）
+FALLBACK_FIXTURE = os.path.join(BASE_DIR, 'binance', 'binance_blog_detail.html')
+
+
+# 带值的选项
+VALUE_OPTIONS = ('--pages', '--workers', '--load', '--source')
+
+
+def _option(name: str, default):
+    if name in sys.argv:
+        return type(default)(sys.argv[sys.argv.index(name) + 1])
+    return default
+
+
+def _parser(source: str):
+    if source == 'square':
+        from binance_detail.crawler import parse_article_html
+    else:
+        from binance.crawler import parse_article_html
+    return parse_article_html
+
+
+def record(urls, source: str) -> int:
+    """
+    用爬虫的浏览器渲染文章详情页，把渲染后的 HTML 存到 bench_fixtures/<来源>/
+
+    Returns:
+        保存的页面数
+    """
+    from sources import load
+    from common.article import Article
+    from common.runtime import close_runtime
+
+    out_dir = os.path.join(RECORDED_DIR, source)
+    os.makedirs(out_dir, exist_ok=True)
+    crawler = load(source).create_crawler()
+    saved = 0
+    try:
+        for url in urls:
+            result = crawler._fetch(Article(link=url))
+            if not result.ok or not result.html:
+                print(f"  [{result.status.value}] 未保存 {url}")
+                continue
+            name = re.sub(r'[^A-Za-z0-9_-]+', '_', url.rstrip('/').rsplit('/', 1)[-1])[:80] or 'page'
+            path = os.path.join(out_dir, f'{name}.html')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(result.html)
+            print(f"  已保存 {path}（{len(result.html) / 1024:.0f} KB）")
+            saved += 1
+    finally:
+        close_runtime()
+    return saved
+
+
+def default_fixtures(source: str):
+    """录制的页面，没有时为构造页面"""
+    recorded = sorted(glob.glob(os.path.join(RECORDED_DIR, source, '*.html')))
+    if recorded:
+        return recorded
+    print(f"提示: 没有录制的 {source} 页面（bench_fixtures/{source}/），使用构造页面，"
+          f"先运行 --record 录制真实页面")
+    return [FALLBACK_FIXTURE]
+
+
+def _load_fixtures(paths):
+    pages = []
+    for pattern in paths:
+        for path in sorted(glob.glob(pattern)):
+            with open(path, 'r', encoding='utf-8') as f:
+                pages.append(f.read())
+    return pages
+
+
+def throughput(parse, pages, workers: int) -> float:
+    """解析全部页面的秒数（进程池先预热，不计启动与导入的时间）"""
+    executor = ExtractionExecutor(workers)
+    try:
+        executor.submit(parse, pages[0]).result()
+        started = time.perf_counter()
+        futures = [executor.submit(parse, html) for html in pages]
+        for future in futures:
+            future.result()
+        return time.perf_counter() - started
+    finally:
+        executor.close()
+
+
+def crawl_loop(parse, pages, workers: int, load: float) -> float:
+    """模拟串行抓取（每篇 sleep load 秒代替浏览器加载）的总秒数，结果按顺序取回"""
+    executor = ExtractionExecutor(workers)
+    try:
+        executor.submit(parse, pages[0]).result()
+        started = time.perf_counter()
+        pending = deque()
+        for html in pages:
+            time.sleep(load)
+            future = executor.submit(parse, html)
+            pending.append(PendingExtraction(future.result, future))
+            for _ in take_ready(pending, executor.window):
+                pass
+        for _ in take_all(pending):
+            pass
+        return time.perf_counter() - started
+    finally:
+        executor.close()
+
+
+def main():
+    source = _option('--source', 'blog')
+    # 位置参数：页面文件，--record 时为文章链接
+    args = [arg for i, arg in enumerate(sys.argv[1:], 1)
+            if not arg.startswith('--') and sys.argv[i - 1] not in VALUE_OPTIONS]
+    if '--record' in sys.argv:
+        sys.exit(0 if record(args, source) else 1)
+    count = _option('--pages', 200)
+    max_workers = _option('--workers', os.cpu_count() or 1)
+    load = _option('--load', 0.5)
+
+    fixtures = _load_fixtures(args or default_fixtures(source))
+    if not fixtures:
+        print("没有找到页面文件")
+        sys.exit(1)
+    pages = [fixtures[i % len(fixtures)] for i in range(count)]
+    parse = _parser(source)
+    size = sum(map(len, fixtures)) // len(fixtures)
+    print(f"页面: {len(fixtures)} 个文件（平均 {size / 1024:.1f} KB），共解析 {count} 次；"
+          f"CPU {os.cpu_count()} 核，解析函数 {source}")
+
+    print("\n1. 解析吞吐")
+    print(f"{'进程数':<8}{'秒':>10}{'页面/秒':>10}{'加速比':>10}{'每核':>10}")
+    baseline = throughput(parse, pages, 0)
+    print(f"{'当前线程':<8}{baseline:>10.2f}{count / baseline:>10.1f}{1:>10.2f}{1:>10.2f}")
+    for workers in range(1, max_workers + 1):
+        seconds = throughput(parse, pages, workers)
+        speedup = baseline / seconds
+        print(f"{workers:<8}{seconds:>10.2f}{count / seconds:>10.1f}{speedup:>10.2f}{speedup / workers:>10.2f}")
+
+    loop_pages = pages[:max(1, min(count, int(30 / max(load, 0.01))))]
+    print(f"\n2. 抓取循环（{len(loop_pages)} 篇，每篇加载 {load}s）")
+    inline = crawl_loop(parse, loop_pages, 0, load)
+    offloaded = crawl_loop(parse, loop_pages, max_workers, load)
+    print(f"  抓取线程里解析: {inline:.2f}s")
+    print(f"  进程池解析（{max_workers} 个进程）: {offloaded:.2f}s（节省 {inline - offloaded:.2f}s）")
+
+
+if __name__ == '__main__':
+    main()
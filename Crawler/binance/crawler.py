@@ -3,37 +3,205 @@
 用于爬取 https://www.binance.com/en/blog 的文章内容
 """
 from bs4 import BeautifulSoup
+import os
+import sys
 import time
-from typing import List, Dict
+from typing import Iterator, List, Dict, Optional, Set, Tuple
 from datetime import datetime
+from itertools import islice
 import re
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import startup
+from common.fetch_result import FetchResult, FetchStatus, classify_page, fetch_with_policy
+from common.article import Article
+from common import sitemap
+from common.deadline import CrawlDeadline
+from common.locales import locale_of
+from common.runtime import Runtime
+from common.source import Source
+from common.feed_formats import sanitize
 
-class BinanceBlogCrawler:
-    def __init__(self, base_url: str = "https://www.binance.com/en/blog"):
+# 文章详情页中标题与正文的容器
+ARTICLE_CONTENT_SELECTOR = '#__APP div[class*="bn-flex"][class*="flex-col"][class*="gap-2"]'
+# 列表页中的文章链接
+ARTICLE_LINK_SELECTOR = '#__APP a[href*="/blog/"]'
+# 列表页底部"加载更多"按钮的文字
+LOAD_MORE_PATTERN = r'load more|view more|show more|more articles|加载更多|查看更多'
+
+
+def parse_article_soup(soup: BeautifulSoup) -> Dict:
+    """
+    从已渲染的文章详情页中解析正文、作者、发布时间
+    
+    Args:
+        soup: 解析后的HTML
+        
+    Returns:
+        包含 content, author, pub_date, page_title 的字典
+    """
+    # 文章详情页中标题与正文的容器（与你在开发者工具中看到的 JS path 对应）
+    # 对应: #__APP > ... > div.bn-flex.flex-col.gap-2.desktop:gap-4
+    content_elem = soup.select_one(ARTICLE_CONTENT_SELECTOR)
+    content = ''
+    if content_elem:
+        # 移除脚本和样式，避免把无关内容算进正文
+        for tag in content_elem.find_all(['script', 'style', 'nav', 'footer', 'header', 'aside']):
+            tag.decompose()
+        # 先按纯文本取，保证有内容；若你要 content:encoded 用 HTML，可再改为取内部 HTML
+        content = content_elem.decode_contents()
+    
+    # 提取作者
+    author_elem = soup.find(['span', 'div', 'a'], class_=re.compile(r'author|writer', re.I))
+    author = author_elem.get_text(strip=True) if author_elem else ''
+    
+    # 提取发布时间（更精确）
+    time_elem = soup.find('time', datetime=True) or soup.find(['span', 'div'], class_=re.compile(r'date|published', re.I))
+    pub_date = ''
+    if time_elem:
+        pub_date = time_elem.get('datetime', '') or time_elem.get_text(strip=True)
+    
+    # 页面标题（sitemap 发现的文章没有列表页标题时使用）
+    title_elem = soup.find('meta', property='og:title') or soup.find('title')
+    page_title = ''
+    if title_elem:
+        page_title = title_elem.get('content', '') if title_elem.name == 'meta' else title_elem.get_text(strip=True)
+    
+    return {
+        'content': content,
+        'author': author,
+        'pub_date': pub_date,
+        'page_title': page_title
+    }
+
+
+def parse_article_html(html: str) -> Dict:
+    """
+    解析渲染后的文章详情页（在解析进程池中运行，只返回紧凑的详情字段）
+    
+    Args:
+        html: 页面 HTML
+        
+    Returns:
+        包含 content, author, pub_date, page_title 的字典（正文已去掉 XML 不允许的字符）
+    """
+    info = parse_article_soup(BeautifulSoup(html, 'lxml'))
+    info['content'] = sanitize(info['content'])
+    return info
+
+
+class BinanceBlogCrawler(Source):
+    name = 'blog'
+    # 博客详情页渲染较慢，多标签页模式下导航后多等一会儿
+    tab_settle_time = 5.0
+    parse_html = staticmethod(parse_article_html)
+
+    def __init__(self, base_url: str = "https://www.binance.com/en/blog", tabs: int = 1,
+                 capture_api: bool = False, runtime: Runtime = None,
+                 rate_limiter=None, circuit_breaker=None, category_urls: List[str] = None,
+                 discovery: str = 'dom', sitemap_url: str = sitemap.SITEMAP_INDEX_URL,
+                 deadline: CrawlDeadline = None):
         """
         初始化爬虫
         
         Args:
-            base_url: 博客基础URL
+            base_url: 博客基础URL（其中的语言段决定爬取哪个语言，如 /zh-CN/blog）
+            tabs: 详情页并发标签页数量，1 表示单驱动串行抓取
+            capture_api: 是否优先从页面自身的 JSON 接口响应中提取文章（失败时回退到 DOM 解析）
+            runtime: 共享运行时（浏览器、限速器、熔断器），默认使用进程内共享实例
+            rate_limiter: 按主机限速器，默认使用运行时的
+            circuit_breaker: 按主机熔断器，默认使用运行时的
+            category_urls: 额外遍历的分类列表页（首页之后依次遍历）
+            discovery: 文章发现方式，'dom' 渲染列表页，'sitemap' 流式解析站点地图（不需要浏览器）
+            sitemap_url: discovery='sitemap' 时使用的 sitemap 索引
+            deadline: 运行时间预算，剩余时间不够再抓一篇时停止抓取详情
         """
+        super().__init__(runtime=runtime, tabs=tabs, capture_api=capture_api, rate_limiter=rate_limiter,
+                         circuit_breaker=circuit_breaker, deadline=deadline)
         self.base_url = base_url
-        chrome_options = Options()
-        chrome_options.add_argument('--headless')  # 无头模式
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-gpu')
-        chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-        self.driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
-        self.driver.implicitly_wait(10)
-        self.articles = []
+        self.locale = locale_of(base_url)
+        self.category_urls = list(category_urls or [])
+        self.discovery = discovery
+        self.sitemap_url = sitemap_url
+    
+    def _has_selector(self, selector: str) -> bool:
+        """检查页面中是否存在某个元素（不受 implicitly_wait 影响）"""
+        return bool(self.driver.execute_script("return document.querySelector(arguments[0]) !== null;", selector))
+    
+    def _load_page(self, url: str, wait_selector: str = None) -> Tuple[str, bool]:
+        """
+        打开页面并等待渲染
+        
+        Returns:
+            (页面HTML, 是否等到了 wait_selector)
+        """
+        self.driver.get(url)
+        
+        # 增加等待时间，确保页面完全加载
+        time.sleep(5)  # 从3秒增加到5秒
+        
+        # 滚动页面以触发懒加载（如果页面有懒加载）
+        # 先滚动到底部，再回到顶部
+        self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        time.sleep(2)  # 等待懒加载内容
+        self.driver.execute_script("window.scrollTo(0, 0);")
+        time.sleep(1)
+        
+        # 如果提供了等待选择器，等待元素出现
+        found = True
+        if wait_selector:
+            # 404/拦截页不会出现选择器，不必再等 20 秒
+            html = self.driver.page_source
+            if classify_page(html, self.driver.current_url) in (FetchStatus.NOT_FOUND, FetchStatus.BLOCKED):
+                return html, True
+            try:
+                WebDriverWait(self.driver, 20).until(  # 从15秒增加到20秒
+                    EC.presence_of_element_located((By.CSS_SELECTOR, wait_selector))
+                )
+                # 额外等待一下，确保内容完全渲染
+                time.sleep(2)
+            except:
+                print(f"警告: 等待选择器 {wait_selector} 未找到，继续执行...")
+                found = False
+        
+        # 获取页面HTML
+        return self.driver.page_source, found
+    
+    def fetch_page_result(self, url: str, retry: int = 3, wait_selector: str = None,
+                          content_selector: str = None) -> FetchResult:
+        """
+        获取网页并对结果分类（ok/empty/not_found/blocked/timeout/driver_dead），按类别重试
+        
+        Args:
+            url: 要获取的URL
+            retry: 总尝试次数上限（各类别的重试次数见 RETRY_POLICIES）
+            wait_selector: 等待元素出现的CSS选择器
+            content_selector: 判断正文是否存在的CSS选择器（只检查不等待）
+            
+        Returns:
+            FetchResult
+        """
+        startup.mark('first_request')
+        
+        def load(reload: bool):
+            if reload:
+                html, found = self._load_page(url, wait_selector)
+            else:
+                # 不重新加载，只读取当前页面最新的渲染结果
+                html = self.driver.page_source
+                found = not wait_selector or self._has_selector(wait_selector)
+            if content_selector:
+                found = found and self._has_selector(content_selector)
+            return html, found, self.driver.current_url
+        
+        return fetch_with_policy(url, load,
+                                 restart=self._restart_driver,
+                                 rate_limiter=self.rate_limiter,
+                                 circuit_breaker=self.circuit_breaker,
+                                 max_attempts=retry)
     
     def fetch_page(self, url: str, retry: int = 3, wait_selector: str = None) -> BeautifulSoup:
         """
@@ -45,41 +213,11 @@ class BinanceBlogCrawler:
             wait_selector: 等待元素出现的CSS选择器
             
         Returns:
-            BeautifulSoup对象
+            BeautifulSoup对象，页面不存在/被拦截/超时时返回 None
         """
-        for attempt in range(retry):
-            try:
-                self.driver.get(url)
-                
-                # 增加等待时间，确保页面完全加载
-                time.sleep(5)  # 从3秒增加到5秒
-                
-                # 滚动页面以触发懒加载（如果页面有懒加载）
-                # 先滚动到底部，再回到顶部
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)  # 等待懒加载内容
-                self.driver.execute_script("window.scrollTo(0, 0);")
-                time.sleep(1)
-                
-                # 如果提供了等待选择器，等待元素出现
-                if wait_selector:
-                    try:
-                        WebDriverWait(self.driver, 20).until(  # 从15秒增加到20秒
-                            EC.presence_of_element_located((By.CSS_SELECTOR, wait_selector))
-                        )
-                        # 额外等待一下，确保内容完全渲染
-                        time.sleep(2)
-                    except:
-                        print(f"警告: 等待选择器 {wait_selector} 未找到，继续执行...")
-                
-                # 获取页面HTML
-                html = self.driver.page_source
-                return BeautifulSoup(html, 'lxml')
-            except Exception as e:
-                if attempt == retry - 1:
-                    print(f"获取页面失败 {url}: {e}")
-                    raise
-                time.sleep(2 ** attempt)
+        result = self.fetch_page_result(url, retry=retry, wait_selector=wait_selector)
+        if result.status in (FetchStatus.OK, FetchStatus.EMPTY) and result.html:
+            return BeautifulSoup(result.html, 'lxml')
         return None
     
     def extract_article_list(self, soup: BeautifulSoup) -> List[Dict]:
@@ -95,7 +233,7 @@ class BinanceBlogCrawler:
         articles = []
         
         # 使用你提供的选择器路径找到所有文章链接
-        article_links = soup.select('#__APP a[href*="/blog/"]')
+        article_links = soup.select(ARTICLE_LINK_SELECTOR)
 
         # 如果上面找不到，尝试备用选择器
         if not article_links:
@@ -219,14 +357,14 @@ class BinanceBlogCrawler:
                 
 
                 if title and link:
-                    articles.append({
-                        'title': title,
-                        'link': link,
-                        'date': date_str,
-                        'category': category,
-                        'description': description,
-                        'image_url': image_url
-                    })
+                    articles.append(Article(
+                        title=title,
+                        link=link,
+                        date=date_str,
+                        category=category,
+                        description=description,
+                        image_url=image_url
+                    ))
                 else:
                     if not title:
                         print(f"[跳过] 第 {article_index} 篇文章：标题为空")
@@ -249,80 +387,271 @@ class BinanceBlogCrawler:
             包含文章详细信息的字典
         """
         try:
-            soup = self.fetch_page(article_url)
-            
-            # 文章详情页中标题与正文的容器（与你在开发者工具中看到的 JS path 对应）
-            # 对应: #__APP > ... > div.bn-flex.flex-col.gap-2.desktop:gap-4
-            content_elem = soup.select_one('#__APP div[class*="bn-flex"][class*="flex-col"][class*="gap-2"]')
-            content = ''
-            if content_elem:
-                # 移除脚本和样式，避免把无关内容算进正文
-                for tag in content_elem.find_all(['script', 'style', 'nav', 'footer', 'header', 'aside']):
-                    tag.decompose()
-                # 先按纯文本取，保证有内容；若你要 content:encoded 用 HTML，可再改为取内部 HTML
-                content = content_elem.decode_contents()
+            return self.content_from_result(self._fetch(Article(link=article_url)))
+        except Exception as e:
+            print(f"提取文章内容失败 {article_url}: {e}")
+            return self._empty_content()
+
+    def fetch_detail(self, article: Dict) -> FetchResult:
+        """
+        获取单篇文章的原始结果（不解析 DOM）
+        
+        启用 capture_api 时优先使用接口数据（放在 data 中），否则返回渲染后的页面
+        
+        Args:
+            article: 文章（需包含 link）
             
-            # 提取作者
-            author_elem = soup.find(['span', 'div', 'a'], class_=re.compile(r'author|writer', re.I))
-            author = author_elem.get_text(strip=True) if author_elem else ''
+        Returns:
+            FetchResult
+        """
+        article_url = article['link']
+        if self.capture_api:
+            content_info = self.extract_article_from_api(article_url)
+            if content_info:
+                return FetchResult(article_url, FetchStatus.OK, data=content_info)
+            print(f"  未捕获到文章接口数据，回退到 DOM 解析: {article_url[:80]}")
+        
+        return self.fetch_page_result(article_url, content_selector=ARTICLE_CONTENT_SELECTOR)
+
+    def extract(self, article: Dict, result: FetchResult) -> Dict:
+        """把抓取结果解析进文章"""
+        try:
+            content_info = self.content_from_result(result)
+        except Exception as e:
+            print(f"提取文章内容失败 {article['link']}: {e}")
+            content_info = self._empty_content()
+        self._merge_content(article, content_info)
+        return article
+
+    def content_from_result(self, result: FetchResult) -> Dict:
+        """
+        把抓取结果转换为文章详细字段
+        
+        Args:
+            result: fetch_article_result 的返回值
             
-            # 提取发布时间（更精确）
-            time_elem = soup.find('time', datetime=True) or soup.find(['span', 'div'], class_=re.compile(r'date|published', re.I))
-            pub_date = ''
-            if time_elem:
-                pub_date = time_elem.get('datetime', '') or time_elem.get_text(strip=True)
+        Returns:
+            包含 content, author, pub_date 的字典
+        """
+        if result is None:
+            return self._empty_content()
+        if result.data:
+            return result.data
+        if result.status not in (FetchStatus.OK, FetchStatus.EMPTY) or not result.html:
+            return self._empty_content()
+        return parse_article_html(result.html)
+
+    def extract_article_from_api(self, article_url: str) -> Dict:
+        """
+        打开文章页并从其 JSON 接口响应中直接构造文章字段
+        
+        Args:
+            article_url: 文章URL
             
-            return {
-                'content': content,
-                'author': author,
-                'pub_date': pub_date
-            }
+        Returns:
+            包含 title, content, author, pub_date 的字典，未捕获到正文时返回 None
+        """
+        try:
+            self.network_capture.reset()
+            self.rate_limiter.acquire(article_url)
+            self.driver.get(article_url)
+            info = self.network_capture.wait_for_article(timeout=10)
         except Exception as e:
-            print(f"提取文章内容失败 {article_url}: {e}")
-            return {
-                'content': '',
-                'author': '',
-                'pub_date': ''
-            }
+            print(f"  接口拦截失败 {article_url}: {e}")
+            self.rate_limiter.failure(article_url)
+            return None
+        if not info or not info['content']:
+            return None
+        self.rate_limiter.success(article_url)
+        if not info['title']:
+            # 没有标题时保留列表页中的标题
+            info.pop('title')
+        return info
+
+    def _empty_content(self) -> Dict:
+        """获取失败时的空内容"""
+        return {
+            'content': '',
+            'author': '',
+            'pub_date': ''
+        }
+
+    def parse_article_content(self, soup: BeautifulSoup) -> Dict:
+        """
+        从已渲染的文章详情页中解析正文、作者、发布时间
+        
+        Args:
+            soup: 解析后的HTML
+            
+        Returns:
+            包含 content, author, pub_date 的字典
+        """
+        return parse_article_soup(soup)
     
-    def crawl_blog(self, max_articles: int = 20, fetch_content: bool = True) -> List[Dict]:
+    def _merge_content(self, article: Dict, content_info: Dict):
+        """把详情字段写回文章，补全 sitemap 发现的文章缺少的标题与日期"""
+        content_info = dict(content_info)
+        page_title = content_info.pop('page_title', '')
+        article.update(content_info)
+        if not article.get('title'):
+            article['title'] = page_title or sitemap.title_from_link(article['link'])
+        if not article.get('date') and not article.get('pub_date'):
+            article['date'] = article.get('lastmod', '')
+    
+    def _load_more(self, listing_url: str, wait: float = 10.0) -> Optional[BeautifulSoup]:
         """
-        爬取博客文章
+        在当前列表页上加载下一批文章：滚动到底部触发无限滚动，有"加载更多"按钮时点击，
+        都没有新文章出现时再尝试分页链接
         
         Args:
-            max_articles: 最大爬取文章数量
-            fetch_content: 是否获取文章详细内容
+            listing_url: 列表页 URL（用于限速）
+            wait: 等待新文章出现的秒数
             
         Returns:
-            文章列表
+            加载后的页面，没有更多文章时返回 None
         """
-        print(f"开始爬取 {self.base_url}...")
+        count_js = "return document.querySelectorAll(arguments[0]).length;"
+        before = self.driver.execute_script(count_js, ARTICLE_LINK_SELECTOR)
+        self.rate_limiter.acquire(listing_url)
+        self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        self.driver.execute_script("""
+            const pattern = new RegExp(arguments[0], 'i');
+            const button = [...document.querySelectorAll('button, a[role="button"], div[role="button"]')]
+                .find(el => pattern.test(el.innerText || '') && el.offsetParent !== null);
+            if (button) button.click();
+        """, LOAD_MORE_PATTERN)
         
-        # 获取博客首页
-        soup = self.fetch_page(self.base_url, wait_selector='#__APP a[href*="/blog/"]')
-        if not soup:
-            print("无法获取博客首页")
-            return []
+        until = time.time() + wait
+        while time.time() < until:
+            time.sleep(0.5)
+            if self.driver.execute_script(count_js, ARTICLE_LINK_SELECTOR) > before:
+                time.sleep(1)  # 等这一批渲染完
+                return BeautifulSoup(self.driver.page_source, 'lxml')
         
-        # 提取文章列表
-        articles = self.extract_article_list(soup)
-        print(f"找到 {len(articles)} 篇文章")
+        # 没有无限滚动，尝试分页
+        next_link = self.driver.execute_script("""
+            const el = document.querySelector('a[rel="next"], a[aria-label*="next" i], li.next a');
+            return el ? el.href : null;
+        """)
+        if next_link:
+            return self.fetch_page(next_link, wait_selector=ARTICLE_LINK_SELECTOR)
+        return None
+    
+    def iter_listing(self, watermark: datetime = None, known_links: Set[str] = None,
+                     max_batches: int = 50) -> Iterator[Dict]:
+        """
+        逐批遍历博客首页与分类页（无限滚动/分页），只在需要下一批时才加载
         
-        # 限制文章数量
-        articles = articles[:max_articles]
+        一批中最后一篇有日期的文章早于水位线（已经翻过上次爬取的位置）或整批都是已有文章时，
+        处理完这一批就停止：日常运行通常只需加载一批，冷启动回填（watermark=None）可以一直翻到 max_batches。
+        置顶的旧文章排在批首，只跳过它，不据此停止翻页
         
-        # 获取每篇文章的详细内容
-        if fetch_content:
-            for i, article in enumerate(articles, 1):
-                print(f"正在处理第 {i}/{len(articles)} 篇文章: {article['title'][:50]}...")
-                content_info = self.extract_article_content(article['link'])
-                article.update(content_info)
-                
-                # 避免请求过快
-                time.sleep(1)
+        Args:
+            watermark: 文章库中最新文章的发布时间，None 表示不提前停止
+            known_links: 已有的文章链接，不再产出
+            max_batches: 每个列表页最多加载的批数
+            
+        Yields:
+            文章信息（尚未获取详细内容），按列表页顺序
+        """
+        known_links = known_links or set()
+        seen = set()
+        for listing_url in [self.base_url] + self.category_urls:
+            print(f"开始爬取 {listing_url}...")
+            soup = self.fetch_page(listing_url, wait_selector=ARTICLE_LINK_SELECTOR)
+            if not soup:
+                print(f"无法获取列表页 {listing_url}")
+                continue
+            
+            batch = 0
+            while soup:
+                batch += 1
+                new = [a for a in self.extract_article_list(soup) if a['link'] not in seen]
+                if not new:
+                    break
+                skipped = 0
+                last_date = None
+                for article in new:
+                    seen.add(article['link'])
+                    date = article.updated_at
+                    if date:
+                        last_date = date
+                    if article['link'] in known_links:
+                        skipped += 1
+                        continue
+                    if watermark and date and date < watermark:
+                        continue
+                    yield article
+                # 列表按时间倒序，批尾的日期决定是否已翻过水位线；日期都无法解析时看是否整批都是已有文章
+                reached = bool(watermark) and ((last_date is not None and last_date < watermark)
+                                               or skipped == len(new))
+                print(f"第 {batch} 批: {len(new)} 篇，其中 {skipped} 篇已有")
+                if reached:
+                    print("已到达上次爬取的位置，停止翻页")
+                    break
+                if batch >= max_batches:
+                    print(f"已加载 {max_batches} 批，停止翻页")
+                    break
+                if self.deadline and not self.deadline.can_fetch():
+                    break
+                soup = self._load_more(listing_url)
+    
+    def discover(self, max_articles: int = 20, skip_links: Set[str] = None,
+                 known_lastmod: Dict[str, str] = None, watermark: datetime = None) -> List[Dict]:
+        """
+        获取待爬取的文章（按 self.discovery 遍历列表页或解析 sitemap）
         
-        self.articles = articles
+        Args:
+            max_articles: 最大文章数量
+            skip_links: 已有的文章链接，跳过且不计入数量
+            known_lastmod: 已有文章的链接 -> 上次的 sitemap lastmod，sitemap 模式下 lastmod 更新的文章重新抓取
+            watermark: 水位线，遍历到更早的文章即停止
+            
+        Returns:
+            文章列表（尚未获取详细内容）
+        """
+        if self.discovery == 'sitemap':
+            print(f"从 sitemap 发现文章: {self.sitemap_url}")
+            known = dict.fromkeys(skip_links or (), '')
+            known.update(known_lastmod or {})
+            # sitemap 中包含所有语言的文章，只取 base_url 所在语言的
+            pattern = f'/{re.escape(self.locale)}{sitemap.BLOG_POST_PATTERN}' if self.locale else sitemap.BLOG_POST_PATTERN
+            return sitemap.discover(pattern, self.sitemap_url, child_pattern='blog',
+                                    known=known, since=watermark, max_articles=max_articles)
+        # 翻页过程中一直停留在同一个列表页上，整个遍历期间占用共享浏览器
+        with self.browser.lock:
+            articles = list(islice(self.iter_listing(watermark, skip_links), max_articles))
+        print(f"找到 {len(articles)} 篇新文章")
         return articles
+
+    def crawl_blog(self, max_articles: int = 20, fetch_content: bool = True) -> List[Dict]:
+        """
+        爬取博客文章（同 crawl）
+        
+        Args:
+            max_articles: 最大爬取文章数量
+            fetch_content: 是否获取文章详细内容
+            
+        Returns:
+            文章列表
+        """
+        return self.crawl(max_articles, fetch_content)
+
+    def warm_cache(self, sample_articles: int = 3):
+        """
+        预热浏览器缓存：打开博客首页和几篇文章，让静态资源进入持久化磁盘缓存
+        
+        Args:
+            sample_articles: 额外打开的文章数量
+        """
+        print(f"预热浏览器缓存: {self.base_url}")
+        with self.browser.lock:
+            soup = self.fetch_page(self.base_url, wait_selector=ARTICLE_LINK_SELECTOR)
+            for article in self.extract_article_list(soup)[:sample_articles] if soup else []:
+                print(f"  预热: {article['link'][:80]}")
+                self.rate_limiter.acquire(article['link'])
+                self.driver.get(article['link'])
+                time.sleep(3)
     
     def save_articles_to_file(self, filename: str = 'articles.json'):
         """
@@ -333,28 +662,20 @@ class BinanceBlogCrawler:
         """
         import json
         with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(self.articles, f, ensure_ascii=False, indent=2)
+            json.dump([article.to_dict() for article in self.articles], f, ensure_ascii=False, indent=2)
         print(f"文章已保存到 {filename}")
 
-    def close(self):
-        """关闭浏览器"""
-        if hasattr(self, 'driver'):
-            try:
-                self.driver.quit()
-            except:
-                pass
-
-    def __del__(self):
-        """清理浏览器资源"""
-        self.close()
-
 
 if __name__ == '__main__':
     # 测试代码
+    from common.runtime import close_runtime
     crawler = BinanceBlogCrawler()
-    articles = crawler.crawl_blog(max_articles=5, fetch_content=True)
-    print(f"\n成功爬取 {len(articles)} 篇文章")
-    for article in articles:
-        print(f"\n标题: {article['title']}")
-        print(f"链接: {article['link']}")
-        print(f"日期: {article['date']}")
\ No newline at end of file
+    try:
+        articles = crawler.crawl_blog(max_articles=5, fetch_content=True)
+        print(f"\n成功爬取 {len(articles)} 篇文章")
+        for article in articles:
+            print(f"\n标题: {article['title']}")
+            print(f"链接: {article['link']}")
+            print(f"日期: {article['date']}")
+    finally:
+        close_runtime()
@@ -4,8 +4,168 @@
 """
 import os
 import sys
-from crawler import BinanceBlogCrawler
-from rss_generator import RSSGenerator
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import startup
+from common.driver_cache import check as check_environment
+from common.rate_limiter import HostBudget, configure as configure_rate_limits
+from common.deadline import CrawlDeadline
+from common import runner
+from common.locales import localize
+from common.runtime import close_runtime
+
+# 配置参数
+BLOG_URL = "https://www.binance.com/en/blog"
+# 要发布的语言，第一个为主语言（沿用原来的 feed 路径），其余语言的 feed 加语言后缀，如 binance_blog_feed_zh-CN.xml；
+# 多个语言时各语言分别发现文章，同一篇文章（content ID 相同）归为一组，正文在同一个浏览器里统一抓取
+LOCALES = ['en']
+MAX_ARTICLES = 30  # 单次运行最多爬取的新文章数量
+FEED_SIZE = 30  # feed 中的文章数量（取文章库中最新的）
+# 更早的文章按 RFC 5005 写进归档页（<feed>-archive-<页码>.xml），每页的文章数；写满的页不再变化，None 表示不归档
+ARCHIVE_PAGE_SIZE = 50
+BACKFILL_MAX_ARTICLES = 500  # --backfill 回填历史时最多爬取的文章数量
+CATEGORY_URLS = []  # 首页之后额外遍历的分类列表页
+DISCOVERY = 'dom'  # 文章发现方式：'dom' 渲染列表页，'sitemap' 流式解析站点地图并按 lastmod 只抓新增/更新的文章
+FETCH_CONTENT = True  # 是否获取文章详细内容
+TABS = 1  # 同一浏览器内并发的标签页数量（1 为单驱动串行模式）
+LOCALE_TABS = 3  # LOCALES 有多个语言时抓取正文的标签页数（各语言的文章共用一个标签页池并发抓取）
+CAPTURE_API = False  # 优先从页面 JSON 接口响应提取文章（仅串行模式），失败回退 DOM
+USE_PIPELINE = False  # 使用 asyncio 流水线（发现/抓取/解析重叠执行）
+RESUME = True  # 从断点日志续爬，跳过上次中断前已完成的文章
+# 单次运行的时间预算（秒，可用环境变量 CRAWL_TIME_BUDGET 覆盖），来不及时提前停止抓取
+TIME_BUDGET = float(os.environ.get('CRAWL_TIME_BUDGET', 25 * 60))
+FEED_RESERVE = 60  # 为生成 feed 预留的秒数
+REVALIDATE_BUDGET = 5  # 每次运行最多复查的旧文章数（新文章复查得勤，旧文章间隔按年龄指数增长）
+# 子 feed：名称 -> 标签（命中任一即收录），标签为 ticker:<代币>、category:<分类>、topic:<话题>
+SUB_FEEDS = {
+    'ecosystem': ['category:ecosystem'],
+    'markets': ['category:markets'],
+    'security': ['category:security'],
+}
+SUB_FEED_SIZE = 30  # 每个子 feed 的文章数量
+TOPICS = None  # 话题关键词（话题名 -> 正则），None 使用 common.feed_index.DEFAULT_TOPICS
+# 按主机的限速预算（请求/秒），响应正常时在上下限之间自动提速，遇到拦截自动降速
+RATE_LIMITS = {
+    'www.binance.com': HostBudget(rate=1.0, min_rate=0.1, max_rate=3.0),
+}
+# 导入时配置一次：限速器在各来源、各语言间共享，创建爬虫时不再重复配置（否则会清掉学到的速率与冷却）
+configure_rate_limits(RATE_LIMITS)
+INTERVAL = 2 * 3600  # 守护进程中两次运行的间隔（秒）
+# 根据脚本位置动态计算输出路径
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+OUTPUT_FILE = os.path.normpath(os.path.join(SCRIPT_DIR, "feeds", "binance_blog_feed.xml"))
+# 断点日志：每完成一篇文章追加一条记录（二进制，见 common.checkpoint），feed 成功生成后清空
+CHECKPOINT_FILE = os.path.join(SCRIPT_DIR, ".state", "blog_checkpoint.journal")
+# 文章库：保存历次爬到的文章，feed 取其中最新的 FEED_SIZE 篇
+SUB_FEED_DIR = os.path.join(os.path.dirname(OUTPUT_FILE), "blog_tags")
+STORE_FILE = os.path.join(SCRIPT_DIR, ".state", "blog_articles.json")
+# 正文存储：正文按内容哈希 zstd 压缩单独存放，文章库只记录哈希（None 表示正文直接写在文章库里）
+BODY_DIR = os.path.join(SCRIPT_DIR, ".state", "blog_bodies")
+BODY_RETENTION = 1000  # 只保留最新的这么多篇文章的正文，更早的只保留记录
+# feed 发布后的地址（如 https://<用户>.github.io/<仓库>/），用于 feed 的自引用链接与 WebSub 通知
+FEED_BASE_URL = os.environ.get('FEED_BASE_URL', '')
+# WebSub hub：有新条目的 feed 发布后通知它，由它推送给订阅者（与 FEED_BASE_URL 都配置时才启用）
+WEBSUB_HUB = os.environ.get('WEBSUB_HUB', '')
+
+
+CONFIG = runner.SourceConfig(
+    name='blog',
+    output_file=OUTPUT_FILE,
+    checkpoint_file=CHECKPOINT_FILE,
+    store_file=STORE_FILE,
+    feed_title="Binance Blog",
+    feed_description="Latest articles from Binance Blog",
+    feed_link=BLOG_URL,
+    default_author="Binance",
+    generator="Binance Blog RSS Generator",
+    max_articles=MAX_ARTICLES,
+    feed_size=FEED_SIZE,
+    archive_page_size=ARCHIVE_PAGE_SIZE,
+    backfill_max_articles=BACKFILL_MAX_ARTICLES,
+    fetch_content=FETCH_CONTENT,
+    use_pipeline=USE_PIPELINE,
+    resume=RESUME,
+    time_budget=TIME_BUDGET,
+    feed_reserve=FEED_RESERVE,
+    revalidate_budget=REVALIDATE_BUDGET,
+    sub_feeds=SUB_FEEDS,
+    sub_feed_dir=SUB_FEED_DIR,
+    sub_feed_size=SUB_FEED_SIZE,
+    topics=TOPICS,
+    body_dir=BODY_DIR,
+    body_retention=BODY_RETENTION,
+    feed_base_url=FEED_BASE_URL,
+    websub_hub=WEBSUB_HUB,
+    language=LOCALES[0],
+    locale_tabs=LOCALE_TABS,
+)
+
+
+def generate_feed(articles, output_file: str = OUTPUT_FILE, feed_title: str = None) -> str:
+    """
+    生成RSS feed（同时写出 Atom 与 JSON Feed）
+    
+    Args:
+        articles: 文章列表
+        output_file: 输出文件路径
+        feed_title: feed 标题，默认 "Binance Blog"
+        
+    Returns:
+        输出文件路径
+    """
+    return runner.generate_feed(CONFIG, articles, output_file, feed_title)
+
+
+def create_crawler(deadline: CrawlDeadline = None, locale: str = None):
+    """
+    按配置创建爬虫（浏览器来自共享运行时，第一次加载页面时启动）
+    
+    Args:
+        deadline: 运行时间预算
+        locale: 语言，None 表示 BLOG_URL 中的语言
+        
+    Returns:
+        BinanceBlogCrawler 实例
+    """
+    # 重量级依赖延迟到确定要爬取时再导入（作为包导入时用相对导入，避免与 binance_detail 的同名模块冲突）
+    if __package__:
+        from .crawler import BinanceBlogCrawler
+    else:
+        from crawler import BinanceBlogCrawler
+    startup.mark('imports')
+    base_url, category_urls = BLOG_URL, CATEGORY_URLS
+    if locale:
+        base_url = localize(BLOG_URL, locale)
+        category_urls = [localize(url, locale) for url in CATEGORY_URLS]
+    return BinanceBlogCrawler(base_url=base_url, tabs=TABS, capture_api=CAPTURE_API,
+                              category_urls=category_urls, discovery=DISCOVERY, deadline=deadline)
+
+
+def publish_partial() -> bool:
+    """
+    不爬取，直接用文章库加上断点日志中已完成的文章发布 feed
+    
+    Returns:
+        是否生成了 feed
+    """
+    return runner.publish_partial(CONFIG)
+
+
+def run(crawler=None, backfill: bool = False, time_budget: float = None) -> bool:
+    """
+    爬取一次并生成 feed（LOCALES 有多个语言时每个语言各生成一个 feed）
+    
+    Args:
+        crawler: 已创建的爬虫（守护进程中跨轮次复用，只用于单语言），None 表示新建
+        backfill: 忽略水位线，一直翻页回填历史文章
+        time_budget: 本次运行的时间预算（秒），默认 TIME_BUDGET
+        
+    Returns:
+        是否生成了 feed
+    """
+    if len(LOCALES) > 1:
+        return runner.run_locales(CONFIG, LOCALES, create_crawler, backfill=backfill, time_budget=time_budget)
+    return runner.run_source(CONFIG, create_crawler, crawler, backfill=backfill, time_budget=time_budget)
 
 
 def main():
@@ -16,50 +176,27 @@ def main():
     print("币安博客RSS Feed生成器")
     print("=" * 60)
     
-    # 配置参数
-    blog_url = "https://www.binance.com/en/blog"
-    max_articles = 30  # 爬取的文章数量
-    fetch_content = True  # 是否获取文章详细内容
-    # 根据脚本位置动态计算输出路径
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    output_file = os.path.join(script_dir, "feeds", "binance_blog_feed.xml")
-    output_file = os.path.normpath(output_file)
+    if '--check' in sys.argv:
+        # 自检：只确认依赖可导入与驱动缓存有效，不导入 selenium/bs4
+        print("\n环境自检:")
+        sys.exit(0 if check_environment() else 1)
+    
+    if '--locales' in sys.argv:
+        # 临时指定语言：--locales en,zh-CN
+        global LOCALES
+        LOCALES = sys.argv[sys.argv.index('--locales') + 1].split(',')
+    
+    if '--publish-partial' in sys.argv:
+        sys.exit(0 if publish_partial() else 1)
     
     try:
-        # 1. 创建爬虫实例并爬取文章
-        print("\n[步骤 1/3] 开始爬取博客文章...")
-        crawler = BinanceBlogCrawler(base_url=blog_url)
-        articles = crawler.crawl_blog(
-            max_articles=max_articles,
-            fetch_content=fetch_content
-        )
-        
-        if not articles:
-            print("错误: 未能爬取到任何文章")
+        if '--warm' in sys.argv:
+            # 只预热浏览器缓存，不爬取
+            create_crawler().warm_cache()
+            print("[OK] 浏览器缓存预热完成")
             return
         
-        print(f"[OK] 成功爬取 {len(articles)} 篇文章")
-        
-        # 2. 生成RSS feed
-        print("\n[步骤 2/3] 生成RSS feed...")
-        generator = RSSGenerator(
-            feed_title="Binance Blog",
-            feed_description="Latest articles from Binance Blog",
-            feed_link=blog_url,
-            feed_language="en"
-        )
-        
-        output_path = generator.generate_rss(articles, output_file)
-        print(f"[OK] RSS feed已生成")
-        
-        # 3. 显示结果
-        print("\n[步骤 3/3] 完成!")
-        print(f"\nRSS Feed文件位置: {os.path.abspath(output_path)}")
-        print(f"\n文章列表:")
-        for i, article in enumerate(articles[:5], 1):  # 只显示前5篇
-            print(f"  {i}. {article['title'][:60]}...")
-        if len(articles) > 5:
-            print(f"  ... 还有 {len(articles) - 5} 篇文章")
+        run(backfill='--backfill' in sys.argv)
         
         print("\n" + "=" * 60)
         print("提示: 如果RSS feed格式不正确，请检查网站HTML结构")
@@ -75,10 +212,9 @@ def main():
         traceback.print_exc()
         sys.exit(1)
     finally:
-        if 'crawler' in locals():
-            crawler.close()
+        close_runtime()
+        startup.report()
 
 
 if __name__ == '__main__':
     main()
-
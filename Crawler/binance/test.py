@@ -1,4 +1,5 @@
 from crawler import BinanceBlogCrawler
+from common.runtime import close_runtime
 
 # 测试爬取少量文章
 crawler = BinanceBlogCrawler()
@@ -13,4 +14,4 @@ try:
         print(f"  日期: {article.get('date', 'N/A')}")
         print()
 finally:
-    crawler.close()
\ No newline at end of file
+    close_runtime()
\ No newline at end of file
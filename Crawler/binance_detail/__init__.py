@@ -0,0 +1,4 @@
+"""
+Binance Square 详情爬虫
+既可以直接运行 main.py，也可以作为包导入（守护进程中调用 binance_detail.main.run）
+"""
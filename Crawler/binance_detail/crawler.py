@@ -2,44 +2,109 @@
 Binance Square RSS 详情爬虫
 从现有 RSS 读取文章列表，爬取每篇文章的详细内容
 """
-import requests
+import os
+import sys
 import xml.etree.ElementTree as ET
 import time
 import re
-from typing import List, Dict
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+from datetime import datetime
+from typing import List, Dict, Set
 from bs4 import BeautifulSoup
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import startup
+from common.fetch_result import FetchResult, FetchStatus, fetch_with_policy
+from common import sitemap
+from common.deadline import CrawlDeadline
+from common.runtime import Runtime
+from common.source import Source
+from common.article import Article
+from common.feed_formats import sanitize
 
-class BinanceSquareCrawler:
-    def __init__(self, rss_url: str = "https://rss.app/feeds/yRmgWoblxWMXGv0F.xml"):
+# 判断正文是否已渲染的选择器（只检查不等待）
+CONTENT_READY_SELECTOR = 'div[class*="richtext"], article, div[class*="post-content"], div[class*="article-content"]'
+
+
+def parse_article_soup(soup: BeautifulSoup) -> str:
+    """
+    从已渲染的文章页面中解析正文
+    
+    Args:
+        soup: 解析后的HTML
+        
+    Returns:
+        文章正文 HTML，找不到时返回空字符串
+    """
+    # 尝试多种选择器找到正文内容
+    content = ''
+    
+    # Binance Square 文章正文可能的选择器
+    selectors = [
+        'div[class*="richtext"]',
+        'div[class*="content"]',
+        'article',
+        'div[class*="post-content"]',
+        'div[class*="article-content"]',
+    ]
+    
+    for selector in selectors:
+        content_elem = soup.select_one(selector)
+        if content_elem:
+            # 移除脚本和样式
+            for tag in content_elem.find_all(['script', 'style', 'nav', 'footer', 'header']):
+                tag.decompose()
+            content = content_elem.decode_contents()
+            if len(content) > 100:  # 确保内容有意义
+                break
+    
+    if not content:
+        # 如果找不到正文，使用 description
+        print(f"  未找到正文内容，使用描述")
+    
+    return content
+
+
+def parse_article_html(html: str) -> Dict:
+    """
+    解析渲染后的文章页面（在解析进程池中运行，只返回紧凑的详情字段）
+    
+    Args:
+        html: 页面 HTML
+        
+    Returns:
+        与接口数据相同形式的 content, author, pub_date（页面中只取正文，作者与时间为空，沿用 RSS 中的）
+    """
+    return {'content': sanitize(parse_article_soup(BeautifulSoup(html, 'lxml'))), 'author': '', 'pub_date': ''}
+
+
+class BinanceSquareCrawler(Source):
+    name = 'square'
+    parse_html = staticmethod(parse_article_html)
+
+    def __init__(self, rss_url: str = "https://rss.app/feeds/yRmgWoblxWMXGv0F.xml", tabs: int = 1,
+                 capture_api: bool = False, runtime: Runtime = None,
+                 rate_limiter=None, circuit_breaker=None,
+                 discovery: str = 'rss', sitemap_url: str = sitemap.SITEMAP_INDEX_URL,
+                 deadline: CrawlDeadline = None):
         """
         初始化爬虫
         
         Args:
             rss_url: RSS feed 的 URL
+            tabs: 详情页并发标签页数量，1 表示单驱动串行抓取
+            capture_api: 是否优先从页面自身的 JSON 接口响应中提取正文（失败时回退到 DOM 解析）
+            runtime: 共享运行时（浏览器、限速器、熔断器），默认使用进程内共享实例
+            rate_limiter: 按主机限速器，默认使用运行时的
+            circuit_breaker: 按主机熔断器，默认使用运行时的
+            discovery: 文章发现方式，'rss' 读取 RSS，'sitemap' 流式解析站点地图并按 lastmod 只抓新增/更新的文章
+            sitemap_url: discovery='sitemap' 时使用的 sitemap 索引
+            deadline: 运行时间预算，剩余时间不够再抓一篇时停止抓取正文
         """
+        super().__init__(runtime=runtime, tabs=tabs, capture_api=capture_api, rate_limiter=rate_limiter,
+                         circuit_breaker=circuit_breaker, deadline=deadline)
         self.rss_url = rss_url
-        self.driver = None
-        self.articles = []
-    
-    def _init_driver(self):
-        """初始化 Selenium WebDriver"""
-        if self.driver is None:
-            chrome_options = Options()
-            chrome_options.add_argument('--headless')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-            self.driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
-            self.driver.implicitly_wait(10)
+        self.discovery = discovery
+        self.sitemap_url = sitemap_url
     
     def fetch_rss(self) -> List[Dict]:
         """
@@ -50,7 +115,8 @@ class BinanceSquareCrawler:
         """
         print(f"正在获取 RSS: {self.rss_url}")
         
-        response = requests.get(self.rss_url, timeout=30)
+        startup.mark('first_request')
+        response = self.runtime.http.get(self.rss_url, timeout=30)
         response.raise_for_status()
         
         # 解析 XML
@@ -83,90 +149,177 @@ class BinanceSquareCrawler:
                 continue
             
             if title and link:
-                articles.append({
-                    'title': title,
-                    'link': link,
-                    'date': pub_date,
-                    'description': description,
-                    'author': creator or 'Binance Square',
-                    'guid': guid,
-                    'content': ''  # 稍后填充
-                })
+                articles.append(Article(
+                    title=title,
+                    link=link,
+                    date=pub_date,
+                    description=description,
+                    author=creator or 'Binance Square',
+                    guid=guid,
+                    content=''  # 稍后填充
+                ))
         
         print(f"从 RSS 解析出 {len(articles)} 篇文章")
         return articles
     
-    def fetch_article_content(self, article_url: str) -> str:
+    def fetch_article_result(self, article_url: str, parse: bool = True) -> FetchResult:
         """
-        爬取单篇文章的详细内容
+        爬取单篇文章，对结果分类（ok/empty/not_found/blocked/timeout/driver_dead）并按类别重试
         
         Args:
             article_url: 文章 URL
+            parse: 是否立即解析正文（流水线模式下解析放到单独的阶段）
             
         Returns:
-            文章正文 HTML
+            FetchResult，data 为正文 HTML（失败或未解析时为空字符串）
         """
-        try:
-            self._init_driver()
-            
-            self.driver.get(article_url)
-            time.sleep(3)
-            
-            # 滚动页面触发懒加载
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)
+        def load(reload: bool):
+            if reload:
+                self.driver.get(article_url)
+                time.sleep(3)
+                
+                # 滚动页面触发懒加载
+                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                time.sleep(2)
             
             # 获取页面源码
-            html = self.driver.page_source
-            soup = BeautifulSoup(html, 'lxml')
-            
-            # 尝试多种选择器找到正文内容
-            content = ''
-            
-            # Binance Square 文章正文可能的选择器
-            selectors = [
-                'div[class*="richtext"]',
-                'div[class*="content"]',
-                'article',
-                'div[class*="post-content"]',
-                'div[class*="article-content"]',
-            ]
-            
-            for selector in selectors:
-                content_elem = soup.select_one(selector)
-                if content_elem:
-                    # 移除脚本和样式
-                    for tag in content_elem.find_all(['script', 'style', 'nav', 'footer', 'header']):
-                        tag.decompose()
-                    content = content_elem.decode_contents()
-                    if len(content) > 100:  # 确保内容有意义
-                        break
+            found = self.driver.execute_script(
+                "return document.querySelector(arguments[0]) !== null;", CONTENT_READY_SELECTOR
+            )
+            return self.driver.page_source, bool(found), self.driver.current_url
+        
+        with self.browser.lock:
+            result = fetch_with_policy(article_url, load,
+                                       restart=self._restart_driver,
+                                       rate_limiter=self.rate_limiter,
+                                       circuit_breaker=self.circuit_breaker)
+        result.data = self.content_from_result(result) if parse else ''
+        return result
+
+    def fetch_detail(self, article: Dict) -> FetchResult:
+        """
+        获取单篇文章的原始结果（不解析）
+        
+        启用 capture_api 时优先使用接口数据（放在 data 中），否则返回渲染后的页面
+        """
+        if self.capture_api:
+            api_info = self.fetch_article_from_api(article['link'])
+            if api_info:
+                return FetchResult(article['link'], FetchStatus.OK, data=api_info)
+            print("  未捕获到文章接口数据，回退到 DOM 解析")
+        return self.fetch_article_result(article['link'], parse=False)
+
+    def extract(self, article: Dict, result: FetchResult) -> Dict:
+        """把抓取结果解析进文章（获取不到正文时使用 description）"""
+        content = ''
+        if isinstance(result.data, dict):
+            content = result.data['content']
+            # 接口给出的作者与发布时间比 RSS 中的更准确
+            article['author'] = result.data['author'] or article.get('author', '')
+            article['date'] = result.data['pub_date'] or article.get('date', '')
+        else:
+            content = self.content_from_result(result)
+        article['content'] = content or article.get('description', '')
+        return article
+
+    def content_from_result(self, result: FetchResult) -> str:
+        """
+        从抓取结果中解析正文
+        
+        Args:
+            result: fetch_article_result 的返回值
             
-            if not content:
-                # 如果找不到正文，使用 description
-                print(f"  未找到正文内容，使用描述")
+        Returns:
+            正文 HTML，失败时返回空字符串
+        """
+        if result is None or result.status not in (FetchStatus.OK, FetchStatus.EMPTY) or not result.html:
+            return ''
+        try:
+            return parse_article_html(result.html)['content']
+        except Exception as e:
+            print(f"  解析文章内容失败: {e}")
+            return ''
+    
+    def fetch_article_content(self, article_url: str) -> str:
+        """
+        爬取单篇文章的详细内容
+        
+        Args:
+            article_url: 文章 URL
             
-            return content
+        Returns:
+            文章正文 HTML
+        """
+        return self.fetch_article_result(article_url).data
+
+    def fetch_article_from_api(self, article_url: str) -> Dict:
+        """
+        打开文章页并从其 JSON 接口响应中直接构造文章字段
+        
+        Args:
+            article_url: 文章 URL
             
+        Returns:
+            包含 title, content, author, pub_date 的字典，未捕获到正文时返回 None
+        """
+        try:
+            with self.browser.lock:
+                self.driver  # 确保浏览器已启动（network_capture 随浏览器创建）
+                self.network_capture.reset()
+                self.rate_limiter.acquire(article_url)
+                self.driver.get(article_url)
+                info = self.network_capture.wait_for_article(timeout=10)
         except Exception as e:
-            print(f"  获取文章内容失败: {e}")
-            return ''
+            print(f"  接口拦截失败: {e}")
+            self.rate_limiter.failure(article_url)
+            return None
+        if not info or not info['content']:
+            return None
+        self.rate_limiter.success(article_url)
+        return info
+
+    def parse_article_content(self, soup: BeautifulSoup) -> str:
+        """
+        从已渲染的文章页面中解析正文
+        
+        Args:
+            soup: 解析后的HTML
+            
+        Returns:
+            文章正文 HTML，找不到时返回空字符串
+        """
+        return parse_article_soup(soup)
     
-    def crawl(self, max_articles: int = 20, fetch_content: bool = True) -> List[Dict]:
+    def discover(self, max_articles: int = 20, skip_links: Set[str] = None,
+                 known_lastmod: Dict[str, str] = None, watermark: datetime = None) -> List[Dict]:
         """
-        爬取文章
+        获取待爬取的文章列表（按 self.discovery 读取 RSS 或解析 sitemap）
         
         Args:
-            max_articles: 最大爬取文章数量
-            fetch_content: 是否获取文章详细内容
+            max_articles: 最大文章数量
+            skip_links: 已完成（如断点日志中）的链接，跳过不再爬取
+            known_lastmod: 已有文章的链接 -> 上次的 sitemap lastmod，sitemap 模式下 lastmod 更新的文章重新抓取
+            watermark: 不使用（RSS 只有最新的一页）
             
         Returns:
-            文章列表
+            文章列表（尚未获取正文）
         """
         print("=" * 60)
         print("开始爬取 Binance Square RSS")
         print("=" * 60)
         
+        if self.discovery == 'sitemap':
+            print(f"从 sitemap 发现文章: {self.sitemap_url}")
+            known = dict.fromkeys(skip_links or (), '')
+            known.update(known_lastmod or {})
+            articles = sitemap.discover(sitemap.SQUARE_POST_PATTERN, self.sitemap_url, child_pattern='square',
+                                        known=known, max_articles=max_articles)
+            for article in articles:
+                # sitemap 中没有标题与作者，标题取自链接
+                article.update(title=sitemap.title_from_link(article['link']), date=article['lastmod'],
+                               author='Binance Square', guid='', content='')
+            return articles
+        
         # 1. 获取 RSS 文章列表
         articles = self.fetch_rss()
         
@@ -176,37 +329,15 @@ class BinanceSquareCrawler:
         
         # 限制数量
         articles = articles[:max_articles]
-        
-        # 2. 获取每篇文章的详细内容
-        if fetch_content:
-            for i, article in enumerate(articles, 1):
-                print(f"[{i}/{len(articles)}] 获取详情: {article['title'][:50]}...")
-                content = self.fetch_article_content(article['link'])
-                if content:
-                    article['content'] = content
-                else:
-                    # 如果获取不到正文，使用 description
-                    article['content'] = article.get('description', '')
-                
-                time.sleep(1)  # 避免请求过快
-        
-        self.articles = articles
+        if skip_links:
+            remaining = [a for a in articles if a['link'] not in skip_links]
+            print(f"断点续爬: 跳过 {len(articles) - len(remaining)} 篇已完成的文章")
+            articles = remaining
         return articles
-    
-    def close(self):
-        """关闭浏览器"""
-        if self.driver:
-            try:
-                self.driver.quit()
-            except:
-                pass
-            self.driver = None
-    
-    def __del__(self):
-        self.close()
 
 
 if __name__ == '__main__':
+    from common.runtime import close_runtime
     crawler = BinanceSquareCrawler()
     try:
         articles = crawler.crawl(max_articles=3, fetch_content=True)
@@ -216,4 +347,4 @@ if __name__ == '__main__':
             print(f"链接: {article['link'][:80]}")
             print(f"内容长度: {len(article.get('content', ''))}")
     finally:
-        crawler.close()
\ No newline at end of file
+        close_runtime()
\ No newline at end of file
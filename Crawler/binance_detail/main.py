@@ -3,8 +3,128 @@
 """
 import os
 import sys
-from crawler import BinanceSquareCrawler
-from rss_generator import RSSGenerator
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import startup
+from common.driver_cache import check as check_environment
+from common.rate_limiter import HostBudget, configure as configure_rate_limits
+from common.deadline import CrawlDeadline
+from common import runner
+from common.runtime import close_runtime
+
+# 配置
+RSS_URL = "https://rss.app/feeds/yRmgWoblxWMXGv0F.xml"
+MAX_ARTICLES = 50
+FEED_SIZE = 50  # feed 中的文章数量（取文章库中最新的）
+# 更早的文章按 RFC 5005 写进归档页（<feed>-archive-<页码>.xml），每页的文章数；写满的页不再变化，None 表示不归档
+ARCHIVE_PAGE_SIZE = 50
+FETCH_CONTENT = True
+DISCOVERY = 'rss'  # 文章发现方式：'rss' 读取 RSS，'sitemap' 流式解析站点地图并按 lastmod 只抓新增/更新的文章
+TABS = 1  # 同一浏览器内并发的标签页数量（1 为单驱动串行模式）
+CAPTURE_API = False  # 优先从页面 JSON 接口响应提取正文（仅串行模式），失败回退 DOM
+USE_PIPELINE = False  # 使用 asyncio 流水线（发现/抓取/解析重叠执行）
+RESUME = True  # 从断点日志续爬，跳过上次中断前已完成的文章
+# 单次运行的时间预算（秒，可用环境变量 CRAWL_TIME_BUDGET 覆盖），来不及时提前停止抓取
+TIME_BUDGET = float(os.environ.get('CRAWL_TIME_BUDGET', 25 * 60))
+FEED_RESERVE = 60  # 为生成 feed 预留的秒数
+REVALIDATE_BUDGET = 5  # 每次运行最多复查的旧文章数（新文章复查得勤，旧文章间隔按年龄指数增长）
+# 子 feed：名称 -> 标签（命中任一即收录），标签为 ticker:<代币>、category:<分类>、topic:<话题>
+SUB_FEEDS = {
+    'btc': ['ticker:BTC'],
+    'eth': ['ticker:ETH'],
+    'sol': ['ticker:SOL'],
+    'delisting': ['topic:delisting'],
+    'listing': ['topic:listing'],
+}
+SUB_FEED_SIZE = 30  # 每个子 feed 的文章数量
+TOPICS = None  # 话题关键词（话题名 -> 正则），None 使用 common.feed_index.DEFAULT_TOPICS
+# 按主机的限速预算（请求/秒），响应正常时在上下限之间自动提速，遇到拦截自动降速
+RATE_LIMITS = {
+    'www.binance.com': HostBudget(rate=1.0, min_rate=0.1, max_rate=3.0),
+}
+# 导入时配置一次：限速器在各来源、各语言间共享，创建爬虫时不再重复配置（否则会清掉学到的速率与冷却）
+configure_rate_limits(RATE_LIMITS)
+INTERVAL = 2 * 3600  # 守护进程中两次运行的间隔（秒）
+
+# 输出路径（动态计算）
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+OUTPUT_FILE = os.path.normpath(os.path.join(SCRIPT_DIR, "feeds", "binance_square_feed.xml"))
+# 断点日志：每完成一篇文章追加一条记录（二进制，见 common.checkpoint），feed 成功生成后清空
+CHECKPOINT_FILE = os.path.join(SCRIPT_DIR, ".state", "square_checkpoint.journal")
+# 文章库：保存历次爬到的文章，已有正文的不再重复抓取，feed 取其中最新的 FEED_SIZE 篇
+SUB_FEED_DIR = os.path.join(os.path.dirname(OUTPUT_FILE), "square_tags")
+STORE_FILE = os.path.join(SCRIPT_DIR, ".state", "square_articles.json")
+# 正文存储：正文按内容哈希 zstd 压缩单独存放，文章库只记录哈希（None 表示正文直接写在文章库里）
+BODY_DIR = os.path.join(SCRIPT_DIR, ".state", "square_bodies")
+BODY_RETENTION = 1000  # 只保留最新的这么多篇文章的正文，更早的只保留记录
+# feed 发布后的地址（如 https://<用户>.github.io/<仓库>/），用于 feed 的自引用链接与 WebSub 通知
+FEED_BASE_URL = os.environ.get('FEED_BASE_URL', '')
+# WebSub hub：有新条目的 feed 发布后通知它，由它推送给订阅者（与 FEED_BASE_URL 都配置时才启用）
+WEBSUB_HUB = os.environ.get('WEBSUB_HUB', '')
+
+
+CONFIG = runner.SourceConfig(
+    name='square',
+    output_file=OUTPUT_FILE,
+    checkpoint_file=CHECKPOINT_FILE,
+    store_file=STORE_FILE,
+    feed_title="Binance Square News",
+    feed_description="Latest news from Binance Square with full content",
+    feed_link="https://www.binance.com/en/square",
+    default_author="Binance Square",
+    generator="Binance Square RSS Generator",
+    max_articles=MAX_ARTICLES,
+    feed_size=FEED_SIZE,
+    archive_page_size=ARCHIVE_PAGE_SIZE,
+    fetch_content=FETCH_CONTENT,
+    use_pipeline=USE_PIPELINE,
+    resume=RESUME,
+    time_budget=TIME_BUDGET,
+    feed_reserve=FEED_RESERVE,
+    revalidate_budget=REVALIDATE_BUDGET,
+    sub_feeds=SUB_FEEDS,
+    sub_feed_dir=SUB_FEED_DIR,
+    sub_feed_size=SUB_FEED_SIZE,
+    topics=TOPICS,
+    body_dir=BODY_DIR,
+    body_retention=BODY_RETENTION,
+    feed_base_url=FEED_BASE_URL,
+    websub_hub=WEBSUB_HUB,
+)
+
+
+def generate_feed(articles, output_file: str = OUTPUT_FILE, feed_title: str = None) -> str:
+    """生成 RSS feed（同时写出 Atom 与 JSON Feed）"""
+    return runner.generate_feed(CONFIG, articles, output_file, feed_title)
+
+
+def create_crawler(deadline: CrawlDeadline = None):
+    """按配置创建爬虫（浏览器来自共享运行时，第一次加载页面时启动）"""
+    # 重量级依赖延迟到确定要爬取时再导入（作为包导入时用相对导入，避免与 binance 的同名模块冲突）
+    if __package__:
+        from .crawler import BinanceSquareCrawler
+    else:
+        from crawler import BinanceSquareCrawler
+    startup.mark('imports')
+    return BinanceSquareCrawler(rss_url=RSS_URL, tabs=TABS, capture_api=CAPTURE_API,
+                                discovery=DISCOVERY, deadline=deadline)
+
+
+def publish_partial() -> bool:
+    """不爬取，直接用文章库加上断点日志中已完成的文章发布 feed"""
+    return runner.publish_partial(CONFIG)
+
+
+def run(crawler=None, backfill: bool = False, time_budget: float = None) -> bool:
+    """
+    爬取一次并生成 feed
+    
+    Args:
+        crawler: 已创建的爬虫（守护进程中跨轮次复用），None 表示新建
+        backfill: 不使用（RSS 只有最新的一页）
+        time_budget: 本次运行的时间预算（秒），默认 TIME_BUDGET
+    """
+    return runner.run_source(CONFIG, create_crawler, crawler, backfill=backfill, time_budget=time_budget)
 
 
 def main():
@@ -12,47 +132,23 @@ def main():
     print("Binance Square RSS 详情爬虫")
     print("=" * 60)
     
-    # 配置
-    rss_url = "https://rss.app/feeds/yRmgWoblxWMXGv0F.xml"
-    max_articles = 50
-    fetch_content = True
+    if '--check' in sys.argv:
+        # 自检：只确认依赖可导入与驱动缓存有效，不导入 selenium/bs4
+        print("\n环境自检:")
+        sys.exit(0 if check_environment() else 1)
     
-    # 输出路径（动态计算）
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    output_file = os.path.join(script_dir, "feeds", "binance_square_feed.xml")
-    output_file = os.path.normpath(output_file)
+    if '--publish-partial' in sys.argv:
+        sys.exit(0 if publish_partial() else 1)
     
-    crawler = None
+    from common import http_client
     try:
-        # 1. 爬取文章
-        print("\n[步骤 1/2] 爬取文章...")
-        crawler = BinanceSquareCrawler(rss_url=rss_url)
-        articles = crawler.crawl(max_articles=max_articles, fetch_content=fetch_content)
-        
-        if not articles:
-            print("错误: 未获取到任何文章")
+        if '--warm' in sys.argv:
+            # 只预热浏览器缓存，不爬取
+            create_crawler().warm_cache()
+            print("[OK] 浏览器缓存预热完成")
             return
         
-        print(f"[OK] 成功爬取 {len(articles)} 篇文章")
-        
-        # 2. 生成 RSS
-        print("\n[步骤 2/2] 生成 RSS feed...")
-        generator = RSSGenerator(
-            feed_title="Binance Square News",
-            feed_description="Latest news from Binance Square with full content",
-            feed_link="https://www.binance.com/en/square",
-            feed_language="en"
-        )
-        
-        generator.generate_rss(articles, output_file)
-        print(f"[OK] RSS feed 已生成: {output_file}")
-        
-        # 显示结果
-        print("\n文章列表:")
-        for i, article in enumerate(articles[:5], 1):
-            print(f"  {i}. {article['title'][:60]}...")
-        if len(articles) > 5:
-            print(f"  ... 还有 {len(articles) - 5} 篇文章")
+        run()
         
     except KeyboardInterrupt:
         print("\n用户中断")
@@ -63,9 +159,10 @@ def main():
         traceback.print_exc()
         sys.exit(1)
     finally:
-        if crawler:
-            crawler.close()
+        close_runtime()
+        startup.report()
+        http_client.report()
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
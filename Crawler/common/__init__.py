@@ -0,0 +1,4 @@
+"""
+爬虫公共组件
+Blog 爬虫（binance）与 Square 爬虫（binance_detail）共享的基础设施
+"""
@@ -0,0 +1,376 @@
+"""
+文章记录
+各来源、文章库、断点日志与 feed 生成器共用的文章类型：
+    固定字段放在 __slots__ 里（不再每篇一个 dict），来源特有的字段（标签、归档序号……）放在 extra 中；
+    发布时间、规范化链接、GUID 在第一次使用时解析并缓存，原始字段改变后重新解析，
+    不必到处写 article.get('date') or article.get('pub_date')；
+    to_bytes/from_bytes 是紧凑的二进制格式（断点日志使用），正文在第一次读取时才解码，
+    正文与摘要相同时（Square 取不到正文时用摘要）只存一份
+
+仍然支持 dict 的读写方式（article['link']、article.get('date')、'tags' in article……），
+未迁移的代码与 JSON 文章库不受影响；文章库的 JSON 格式不变（to_dict/from_dict）
+"""
+import hashlib
+import json
+import re
+import struct
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# 常见的日期格式（来源、文章库、feed 生成器共用）
+DATE_FORMATS = [
+    '%a, %d %b %Y %H:%M:%S %z',  # RSS 标准格式
+    '%a, %d %b %Y %H:%M:%S GMT',
+    '%Y-%m-%d',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%dT%H:%M:%SZ',
+    '%Y-%m-%dT%H:%M:%S+00:00',
+    '%B %d, %Y',
+    '%b %d, %Y',
+    '%d %B %Y',
+    '%m/%d/%Y',
+]
+
+_ISO_DATETIME = re.compile(r'(\d{4}-\d{2}-\d{2}[T\s]\d{2}:\d{2}:\d{2})')
+
+# 链接中不影响内容的跟踪参数
+_TRACKING_PARAM = re.compile(r'^(utm_\w+|ref|from)$', re.IGNORECASE)
+
+# 放在 __slots__ 里的字符串字段（顺序即二进制格式中的位序，只能在末尾追加）
+FIELDS = ('link', 'title', 'description', 'author', 'category', 'date', 'pub_date', 'published', 'updated',
+          'guid', 'lastmod', 'body', 'fingerprint', 'checked_at', 'locale', 'content_id', 'image_url',
+          'archived_at', 'tags_key')
+_FIELD_SET = frozenset(FIELDS)
+
+# 二进制格式：版本号 + 字段位图，之后依次为各字段（4 字节长度 + UTF-8）
+_VERSION = 1
+_HEADER = struct.Struct('<BI')
+_LENGTH = struct.Struct('<I')
+_CONTENT_BIT = 1 << 29
+_CONTENT_IS_DESCRIPTION_BIT = 1 << 30
+_EXTRA_BIT = 1 << 31
+
+
+def parse_date(date_str: str) -> Optional[datetime]:
+    """
+    解析日期字符串
+
+    Args:
+        date_str: 日期字符串
+
+    Returns:
+        带时区的 datetime（没有时区的按 UTC），无法解析时返回 None
+    """
+    if not date_str:
+        return None
+    iso_match = _ISO_DATETIME.search(date_str)
+    if iso_match:
+        date_str = iso_match.group(1).replace('T', ' ')
+    date_str = date_str.strip()
+    for fmt in DATE_FORMATS:
+        try:
+            dt = datetime.strptime(date_str, fmt)
+        except ValueError:
+            continue
+        return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+    return None
+
+
+def canonical_url(url: str) -> str:
+    """
+    规范化的链接：协议与主机小写，去掉片段、跟踪参数与末尾的斜杠（用于判断两个链接是否指向同一篇文章）
+
+    Args:
+        url: 链接
+    """
+    if not url:
+        return ''
+    parts = urlsplit(url.strip())
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not _TRACKING_PARAM.match(k)]
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip('/') or '/',
+                       urlencode(query), ''))
+
+
+class Article:
+    __slots__ = FIELDS + ('_content', 'extra', '_updated_at', '_published_at', '_canonical')
+
+    def __init__(self, content: Optional[str] = None, **fields):
+        """
+        一篇文章
+
+        Args:
+            content: 正文 HTML，None 表示没有（与空字符串不同：合并时不覆盖旧正文由调用方按是否为空判断）
+            **fields: FIELDS 中的字段为字符串，其他字段放进 extra
+        """
+        for name in FIELDS:
+            setattr(self, name, None)
+        # 正文：str，或 from_bytes 得到的尚未解码的 bytes
+        self._content = content
+        self.extra: Optional[Dict[str, Any]] = None
+        # (原始值, 解析结果) 缓存，原始值改变后重新解析
+        self._updated_at: Optional[Tuple[str, Optional[datetime]]] = None
+        self._published_at: Optional[Tuple[str, Optional[datetime]]] = None
+        self._canonical: Optional[Tuple[str, str]] = None
+        for key, value in fields.items():
+            self[key] = value
+
+    # ---- 规范化字段 ----
+
+    @property
+    def content(self) -> Optional[str]:
+        """正文（二进制格式读出的正文在第一次访问时解码）"""
+        value = self._content
+        if isinstance(value, bytes):
+            value = self._content = value.decode('utf-8')
+        return value
+
+    @content.setter
+    def content(self, value: Optional[str]):
+        self._content = value
+
+    @property
+    def updated_at(self) -> Optional[datetime]:
+        """发布时间（正文修改过的文章为修改时间）：date，没有时为 pub_date；无法解析时为 None"""
+        raw = self.date or self.pub_date or ''
+        cached = self._updated_at
+        if cached is None or cached[0] != raw:
+            cached = self._updated_at = (raw, parse_date(raw))
+        return cached[1]
+
+    @property
+    def published_at(self) -> Optional[datetime]:
+        """最初的发布时间：published（正文修改后保存的原发布时间），没有时同 updated_at"""
+        raw = self.published or ''
+        cached = self._published_at
+        if cached is None or cached[0] != raw:
+            cached = self._published_at = (raw, parse_date(raw))
+        return cached[1] or self.updated_at
+
+    @property
+    def canonical_link(self) -> str:
+        """规范化的链接（见 canonical_url）"""
+        raw = self.link or ''
+        cached = self._canonical
+        if cached is None or cached[0] != raw:
+            cached = self._canonical = (raw, canonical_url(raw))
+        return cached[1]
+
+    @property
+    def item_guid(self) -> str:
+        """feed 条目的 GUID：来源提供的优先，否则为链接（没有链接时为标题）的 md5"""
+        if self.guid:
+            return self.guid
+        return hashlib.md5((self.link or self.title or '').encode('utf-8')).hexdigest()
+
+    # ---- dict 兼容 ----
+
+    def __getitem__(self, key: str):
+        if key in _FIELD_SET:
+            value = getattr(self, key)
+        elif key == 'content':
+            value = self.content
+        else:
+            if not self.extra or key not in self.extra:
+                raise KeyError(key)
+            return self.extra[key]
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: str, default=None):
+        if key in _FIELD_SET:
+            value = getattr(self, key)
+        elif key == 'content':
+            value = self.content
+        else:
+            return self.extra.get(key, default) if self.extra else default
+        return default if value is None else value
+
+    def __setitem__(self, key: str, value):
+        if key in _FIELD_SET:
+            setattr(self, key, value)
+        elif key == 'content':
+            self._content = value
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __delitem__(self, key: str):
+        if key not in self:
+            raise KeyError(key)
+        if key in _FIELD_SET:
+            setattr(self, key, None)
+        elif key == 'content':
+            self._content = None
+        else:
+            del self.extra[key]
+
+    def __contains__(self, key: str) -> bool:
+        if key in _FIELD_SET:
+            return getattr(self, key) is not None
+        if key == 'content':
+            return self._content is not None
+        return bool(self.extra) and key in self.extra
+
+    def keys(self) -> Iterator[str]:
+        for name in FIELDS:
+            if getattr(self, name) is not None:
+                yield name
+        if self._content is not None:
+            yield 'content'
+        if self.extra:
+            yield from self.extra
+
+    __iter__ = keys
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.keys())
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        for key in self.keys():
+            yield key, self[key]
+
+    def values(self) -> Iterator[Any]:
+        for key in self.keys():
+            yield self[key]
+
+    def update(self, other: Mapping = (), **fields):
+        items = other.items() if hasattr(other, 'items') else other
+        for key, value in items:
+            self[key] = value
+        for key, value in fields.items():
+            self[key] = value
+
+    def pop(self, key: str, *default):
+        if key in self:
+            value = self[key]
+            del self[key]
+            return value
+        if default:
+            return default[0]
+        raise KeyError(key)
+
+    def setdefault(self, key: str, default=None):
+        if key not in self:
+            self[key] = default
+        return self.get(key)
+
+    def __repr__(self) -> str:
+        return f'Article({self.link!r}, title={(self.title or "")[:40]!r})'
+
+    # ---- 转换 ----
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> 'Article':
+        """由 dict（JSON 文章库、接口数据……）构造"""
+        article = cls()
+        for key, value in data.items():
+            article[key] = value
+        return article
+
+    @classmethod
+    def coerce(cls, article) -> 'Article':
+        """Article 原样返回，dict 转换为 Article（新对象，对它的修改不会写回原 dict）"""
+        return article if isinstance(article, cls) else cls.from_dict(article)
+
+    def to_dict(self, content: bool = True) -> Dict[str, Any]:
+        """
+        转为 dict（写 JSON 用）
+
+        Args:
+            content: 是否包含正文
+        """
+        data = {name: getattr(self, name) for name in FIELDS if getattr(self, name) is not None}
+        if content and self._content is not None:
+            data['content'] = self.content
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def copy(self) -> 'Article':
+        article = Article(self._content)
+        for name in FIELDS:
+            setattr(article, name, getattr(self, name))
+        article.extra = dict(self.extra) if self.extra else None
+        return article
+
+    def to_bytes(self) -> bytes:
+        """紧凑的二进制格式（比 JSON 小、读写快，正文与摘要相同时只存一份）"""
+        mask = 0
+        chunks = []
+        extra = dict(self.extra) if self.extra else {}
+        for bit, name in enumerate(FIELDS):
+            value = getattr(self, name)
+            if value is None:
+                continue
+            if not isinstance(value, str):
+                # 固定字段被写成了非字符串，按原样放进 JSON 部分
+                extra[name] = value
+                continue
+            mask |= 1 << bit
+            data = value.encode('utf-8')
+            chunks.append(_LENGTH.pack(len(data)))
+            chunks.append(data)
+        content = self._content
+        if content is not None:
+            if content == self.description and content:
+                mask |= _CONTENT_IS_DESCRIPTION_BIT
+            else:
+                mask |= _CONTENT_BIT
+                data = content if isinstance(content, bytes) else content.encode('utf-8')
+                chunks.append(_LENGTH.pack(len(data)))
+                chunks.append(data)
+        if extra:
+            mask |= _EXTRA_BIT
+            data = json.dumps(extra, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            chunks.append(_LENGTH.pack(len(data)))
+            chunks.append(data)
+        return _HEADER.pack(_VERSION, mask) + b''.join(chunks)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Article':
+        """
+        读取 to_bytes 的结果（正文保持为 bytes，第一次访问时才解码）
+
+        Raises:
+            ValueError: 数据不完整或版本不支持
+        """
+        view = memoryview(data)
+        if len(view) < _HEADER.size:
+            raise ValueError('文章记录不完整')
+        version, mask = _HEADER.unpack_from(view)
+        if version != _VERSION:
+            raise ValueError(f'不支持的文章记录版本: {version}')
+        offset = _HEADER.size
+
+        def chunk() -> bytes:
+            nonlocal offset
+            if offset + _LENGTH.size > len(view):
+                raise ValueError('文章记录不完整')
+            (length,) = _LENGTH.unpack_from(view, offset)
+            offset += _LENGTH.size
+            if offset + length > len(view):
+                raise ValueError('文章记录不完整')
+            value = bytes(view[offset:offset + length])
+            offset += length
+            return value
+
+        article = cls()
+        for bit, name in enumerate(FIELDS):
+            if mask & (1 << bit):
+                setattr(article, name, chunk().decode('utf-8'))
+        if mask & _CONTENT_BIT:
+            article._content = chunk()
+        elif mask & _CONTENT_IS_DESCRIPTION_BIT:
+            article._content = article.description
+        if mask & _EXTRA_BIT:
+            for key, value in json.loads(chunk().decode('utf-8')).items():
+                article[key] = value
+        return article
+
+    def __reduce__(self):
+        # pickle（如在进程间传递）同样使用二进制格式
+        return Article.from_bytes, (self.to_bytes(),)
@@ -0,0 +1,148 @@
+"""
+文章库
+按链接保存历次爬到的文章，feed 取库中最新的 N 篇生成；
+库中最新文章的发布时间作为水位线，列表页遍历到比它更早的文章即可停止
+"""
+import json
+import os
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Set
+
+from common.article import Article, parse_date
+
+
+def article_date(article: Dict) -> Optional[datetime]:
+    """文章的发布时间（date 或 pub_date 字段）"""
+    if isinstance(article, Article):
+        return article.updated_at
+    return parse_date(article.get('date') or article.get('pub_date', ''))
+
+
+def has_content(article: Dict) -> bool:
+    """文章是否已拿到正文（正文在内存中，或已存入正文存储）"""
+    return bool(article.get('content') or article.get('body'))
+
+
+def published_date(article: Dict) -> Optional[datetime]:
+    """文章最初的发布时间（正文修改后被顶到前面的文章，原发布时间保存在 published）"""
+    if isinstance(article, Article):
+        return article.published_at
+    return parse_date(article.get('published', '')) or article_date(article)
+
+
+class ArticleStore:
+    def __init__(self, path: str, bodies=None, body_retention: int = None):
+        """
+        初始化文章库
+
+        Args:
+            path: JSON 文件路径（不存在时为空库）
+            bodies: 正文存储（common.body_store.BodyStore），None 表示正文直接写在 JSON 里；
+                使用时 JSON 中的文章只记录正文哈希（body 字段），正文用 content() 读取
+            body_retention: 只保留最新的这么多篇文章的正文，更早的文章保留记录（不会重新抓取）但删除正文，
+                None 表示全部保留
+        """
+        self.path = path
+        self.bodies = bodies
+        self.body_retention = body_retention
+        self.articles: Dict[str, Article] = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.articles = {link: Article.from_dict(record) for link, record in json.load(f).items()}
+            except ValueError as e:
+                print(f"文章库损坏，重新开始: {path} ({e})")
+
+    def __len__(self) -> int:
+        return len(self.articles)
+
+    def __contains__(self, link: str) -> bool:
+        return link in self.articles
+
+    def get(self, link: str) -> Optional[Article]:
+        return self.articles.get(link)
+
+    def content(self, article: Article) -> str:
+        """文章的正文（本次运行爬到的在内存中，之前的从正文存储中读取）"""
+        if article.get('content') or self.bodies is None:
+            return article.get('content', '')
+        return self.bodies.get(article.get('body', ''))
+
+    def upsert(self, articles: Iterable[Dict]) -> int:
+        """
+        写入文章（同一链接合并，新结果没拿到正文时保留旧正文；库中保存的是副本）
+
+        Args:
+            articles: Article（或 dict）
+
+        Returns:
+            新增的文章数
+        """
+        added = 0
+        for article in articles:
+            link = article.get('link')
+            if not link:
+                continue
+            old = self.articles.get(link)
+            if old is None:
+                added += 1
+                self.articles[link] = article.copy() if isinstance(article, Article) else Article.from_dict(article)
+                continue
+            merged = old.copy()
+            merged.update((k, v) for k, v in article.items() if v or k not in old)
+            self.articles[link] = merged
+        return added
+
+    def completed_links(self) -> Set[str]:
+        """已拿到正文的文章链接"""
+        return {link for link, article in self.articles.items() if has_content(article)}
+
+    def lastmods(self) -> Dict[str, str]:
+        """已拿到正文的文章链接 -> sitemap lastmod（没有记录时为空字符串）"""
+        return {link: article.get('lastmod', '') for link, article in self.articles.items() if has_content(article)}
+
+    def watermark(self) -> Optional[datetime]:
+        """已拿到正文的文章中最新的发布时间，空库或日期都无法解析时为 None"""
+        dates = [published_date(a) for a in self.articles.values() if has_content(a)]
+        dates = [d for d in dates if d]
+        return max(dates) if dates else None
+
+    def newest(self, limit: int = None) -> List[Article]:
+        """
+        按发布时间从新到旧排列的文章
+
+        Args:
+            limit: 最多返回的篇数，None 表示全部
+        """
+        oldest = datetime.min.replace(tzinfo=timezone.utc)
+        articles = sorted(self.articles.values(), key=lambda a: a.updated_at or oldest, reverse=True)
+        return articles[:limit] if limit else articles
+
+    def _records(self) -> Dict[str, Dict]:
+        """要写入 JSON 的记录：有正文存储时正文存进去，记录里只留哈希（内存中的正文保留到本次运行结束）"""
+        if self.bodies is None:
+            return {link: article.to_dict() for link, article in self.articles.items()}
+        records = {}
+        for link, article in self.articles.items():
+            if article.get('content'):
+                article.body = self.bodies.put(article.content)
+            records[link] = article.to_dict(content=False)
+        return records
+
+    def save(self):
+        """原子写入（先写临时文件再替换），之后清理不再引用的正文"""
+        records = self._records()
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(records, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        if self.bodies is not None:
+            # 替换完成后再删除，中途失败时旧的 JSON 引用的正文都还在
+            live = {a['body'] for a in self.newest(self.body_retention) if a.get('body')}
+            removed = self.bodies.gc(live)
+            if removed:
+                print(f"已清理 {removed} 篇不再引用的正文")
+            self.bodies.ensure_dictionary()
@@ -0,0 +1,214 @@
+"""
+正文存储
+文章正文按内容哈希（sha256）存成单独的压缩文件，文章库只记录哈希：
+同一正文（多次运行、Square 转载的重复文章）只存一份；
+压缩用 zstd（可选用在已有正文上训练的字典，Binance 富文本的标签与 class 重复度很高，小文件压缩率明显提升），
+没有安装 zstandard 时退回标准库 zlib；
+生成 feed 时逐篇从这里读出正文，不必把所有正文放在内存里；
+保存文章库时清理不再引用（被新版本替换、超出保留数量）的正文，磁盘占用不随历史增长
+（清理按所属文章库的引用进行，每个文章库使用自己的目录）
+
+目录结构:
+    <root>/objects/ab/abcdef....zst     正文（zlib 时为 .zz）
+    <root>/dicts/<字典 id>.dict         训练过的字典（旧字典保留，用它压缩的正文仍可读）
+    <root>/dicts/current                当前使用的字典 id
+"""
+import hashlib
+import os
+import zlib
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# 训练字典至少需要的正文数量与字典大小
+MIN_TRAINING_SAMPLES = 100
+DICTIONARY_SIZE = 64 * 1024
+
+
+def body_hash(content: str) -> str:
+    """正文的内容哈希"""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def _write_atomic(path: str, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class BodyStore:
+    def __init__(self, root: str, level: int = 10, use_dictionary: bool = True):
+        """
+        初始化正文存储
+
+        Args:
+            root: 存储目录（不存在时创建）
+            level: zstd 压缩级别
+            use_dictionary: 使用 <root>/dicts/current 指定的字典压缩新正文（没有字典时不使用）
+        """
+        self.root = root
+        self.level = level
+        self.objects_dir = os.path.join(root, 'objects')
+        self.dicts_dir = os.path.join(root, 'dicts')
+        self.extension = '.zst' if zstandard is not None else '.zz'
+        # 字典 id -> zstandard.ZstdCompressionDict
+        self._dicts: Dict[int, object] = {}
+        self._compressor = None
+        self.use_dictionary = use_dictionary and zstandard is not None
+        self.dict_id = self._current_dict_id() if self.use_dictionary else 0
+
+    # ---- 字典 ----
+
+    def _current_dict_id(self) -> int:
+        try:
+            with open(os.path.join(self.dicts_dir, 'current'), 'r', encoding='utf-8') as f:
+                return int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    def _dictionary(self, dict_id: int):
+        if dict_id not in self._dicts:
+            with open(os.path.join(self.dicts_dir, f'{dict_id}.dict'), 'rb') as f:
+                self._dicts[dict_id] = zstandard.ZstdCompressionDict(f.read())
+        return self._dicts[dict_id]
+
+    def train_dictionary(self, samples: Iterable[str], size: int = DICTIONARY_SIZE) -> int:
+        """
+        用已有正文训练字典，之后新写入的正文用它压缩（已有正文不重写）
+
+        Args:
+            samples: 正文样本
+            size: 字典大小（字节）
+
+        Returns:
+            字典 id，zstandard 未安装或样本不足时返回 0
+        """
+        if zstandard is None:
+            return 0
+        data = [s.encode('utf-8') for s in samples if s]
+        if len(data) < MIN_TRAINING_SAMPLES:
+            return 0
+        dictionary = zstandard.train_dictionary(size, data)
+        dict_id = dictionary.dict_id()
+        _write_atomic(os.path.join(self.dicts_dir, f'{dict_id}.dict'), dictionary.as_bytes())
+        _write_atomic(os.path.join(self.dicts_dir, 'current'), str(dict_id).encode('utf-8'))
+        self._dicts[dict_id] = dictionary
+        self.dict_id = dict_id
+        self._compressor = None
+        print(f"正文字典已训练: id={dict_id}，{len(data)} 篇样本，{len(dictionary.as_bytes()) // 1024} KB")
+        return dict_id
+
+    def ensure_dictionary(self) -> int:
+        """还没有字典且已存了足够多的正文时训练一个（use_dictionary=False 时不训练）"""
+        if not self.use_dictionary or self.dict_id:
+            return self.dict_id
+        if sum(1 for _ in self.digests()) < MIN_TRAINING_SAMPLES:
+            return 0
+        return self.train_dictionary(self.sample())
+
+    # ---- 读写 ----
+
+    def _path(self, digest: str, extension: str = None) -> str:
+        return os.path.join(self.objects_dir, digest[:2], digest + (extension or self.extension))
+
+    def _compress(self, data: bytes) -> bytes:
+        if zstandard is None:
+            return zlib.compress(data, 9)
+        if self._compressor is None:
+            options = {'dict_data': self._dictionary(self.dict_id)} if self.dict_id else {}
+            self._compressor = zstandard.ZstdCompressor(level=self.level, **options)
+        return self._compressor.compress(data)
+
+    def _decompress(self, path: str, data: bytes) -> bytes:
+        if path.endswith('.zz'):
+            return zlib.decompress(data)
+        if zstandard is None:
+            raise RuntimeError(f"读取 {path} 需要 zstandard")
+        # 帧头里记录了压缩时使用的字典
+        dict_id = zstandard.get_frame_parameters(data).dict_id
+        options = {'dict_data': self._dictionary(dict_id)} if dict_id else {}
+        return zstandard.ZstdDecompressor(**options).decompress(data)
+
+    def _find(self, digest: str) -> Optional[str]:
+        for extension in ('.zst', '.zz'):
+            path = self._path(digest, extension)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def __contains__(self, digest: str) -> bool:
+        return self._find(digest) is not None
+
+    def put(self, content: str) -> str:
+        """
+        写入正文（已存在时不重复写）
+
+        Returns:
+            内容哈希
+        """
+        digest = body_hash(content)
+        if self._find(digest) is None:
+            _write_atomic(self._path(digest), self._compress(content.encode('utf-8')))
+        return digest
+
+    def get(self, digest: str) -> str:
+        """读出正文，不存在（已被清理）时返回空字符串"""
+        path = self._find(digest) if digest else None
+        if path is None:
+            return ''
+        with open(path, 'rb') as f:
+            return self._decompress(path, f.read()).decode('utf-8')
+
+    def digests(self) -> Iterator[str]:
+        """已存储的所有内容哈希"""
+        if not os.path.isdir(self.objects_dir):
+            return
+        for prefix in os.listdir(self.objects_dir):
+            for name in os.listdir(os.path.join(self.objects_dir, prefix)):
+                digest, extension = os.path.splitext(name)
+                if extension in ('.zst', '.zz'):
+                    yield digest
+
+    def gc(self, live: Set[str]) -> int:
+        """
+        删除不在 live 中的正文
+
+        Args:
+            live: 仍被引用的内容哈希
+
+        Returns:
+            删除的篇数
+        """
+        removed = 0
+        for digest in list(self.digests()):
+            if digest in live:
+                continue
+            path = self._find(digest)
+            if path:
+                os.remove(path)
+                removed += 1
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        """篇数与占用的字节数"""
+        count = size = 0
+        for digest in self.digests():
+            path = self._find(digest)
+            if path:
+                count += 1
+                size += os.path.getsize(path)
+        return {'bodies': count, 'bytes': size}
+
+    def sample(self, limit: int = 500) -> List[str]:
+        """取一部分已存储的正文（训练字典用）"""
+        samples = []
+        for digest in self.digests():
+            samples.append(self.get(digest))
+            if len(samples) >= limit:
+                break
+        return samples
@@ -0,0 +1,112 @@
+"""
+持久化浏览器配置目录与磁盘缓存
+让 Chrome 在多次运行之间复用同一个 user-data-dir 和磁盘缓存，
+Binance 的 JS bundle、字体和静态资源不必每次重新下载、重新编译
+"""
+import os
+from typing import Optional
+
+# 缓存根目录，设置环境变量 BINANCE_CRAWLER_CACHE 即启用持久化（GitHub Actions 中配合 actions/cache 使用）
+CACHE_ROOT_ENV = 'BINANCE_CRAWLER_CACHE'
+
+# Chrome 在配置目录中留下的进程锁，从缓存恢复的目录里若残留这些文件会导致 Chrome 拒绝启动
+_SINGLETON_FILES = ('SingletonLock', 'SingletonSocket', 'SingletonCookie')
+
+# 可以安全清理的缓存子目录（HTTP 缓存、V8 编译缓存、GPU 缓存）
+_CACHE_DIR_NAMES = ('Cache', 'Cache_Data', 'Code Cache', 'GPUCache', 'disk-cache')
+
+
+def cache_root() -> Optional[str]:
+    """返回缓存根目录，未配置时返回 None"""
+    root = os.environ.get(CACHE_ROOT_ENV, '').strip()
+    return os.path.abspath(os.path.expanduser(root)) if root else None
+
+
+def default_profile_dir(name: str) -> Optional[str]:
+    """
+    获取持久化配置目录（同一目录只能由一个 Chrome 使用；各来源共用的浏览器使用 'shared'）
+
+    Args:
+        name: 配置名称，如 'shared'
+
+    Returns:
+        配置目录路径，未启用持久化时返回 None
+    """
+    root = cache_root()
+    return os.path.join(root, 'chrome-profile', name) if root else None
+
+
+def apply_profile(chrome_options, profile_dir: str, cache_size_mb: int = 200):
+    """
+    为 ChromeOptions 配置持久化的 user-data-dir 和带上限的磁盘缓存
+
+    Args:
+        chrome_options: selenium ChromeOptions
+        profile_dir: 配置目录
+        cache_size_mb: 磁盘缓存上限（MB）
+    """
+    profile_dir = os.path.abspath(profile_dir)
+    disk_cache_dir = os.path.join(profile_dir, 'disk-cache')
+    os.makedirs(disk_cache_dir, exist_ok=True)
+
+    for name in _SINGLETON_FILES:
+        path = os.path.join(profile_dir, name)
+        if os.path.lexists(path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    chrome_options.add_argument(f'--user-data-dir={profile_dir}')
+    chrome_options.add_argument(f'--disk-cache-dir={disk_cache_dir}')
+    chrome_options.add_argument(f'--disk-cache-size={cache_size_mb * 1024 * 1024}')
+
+
+def _cache_files(profile_dir: str):
+    """列出配置目录中所有缓存文件 (mtime, size, path)"""
+    files = []
+    for dirpath, dirnames, filenames in os.walk(profile_dir):
+        if not any(part in _CACHE_DIR_NAMES for part in os.path.relpath(dirpath, profile_dir).split(os.sep)):
+            continue
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, path))
+    return files
+
+
+def prune_profile(profile_dir: str, cache_size_mb: int = 200) -> int:
+    """
+    把缓存总量裁剪到上限以内（按修改时间删除最旧的文件），浏览器关闭后调用
+
+    Chrome 的 --disk-cache-size 只限制 HTTP 缓存，V8 的 Code Cache 需要在这里一起限制
+
+    Args:
+        profile_dir: 配置目录
+        cache_size_mb: 缓存上限（MB）
+
+    Returns:
+        删除的字节数
+    """
+    if not profile_dir or not os.path.isdir(profile_dir):
+        return 0
+    files = _cache_files(profile_dir)
+    total = sum(size for _, size, _ in files)
+    limit = cache_size_mb * 1024 * 1024
+    removed = 0
+    if total <= limit:
+        return 0
+
+    for _, size, path in sorted(files):
+        if total - removed <= limit:
+            break
+        try:
+            os.remove(path)
+            removed += size
+        except OSError:
+            continue
+    print(f"浏览器缓存已裁剪 {removed / 1024 / 1024:.1f} MB（上限 {cache_size_mb} MB）")
+    return removed
@@ -0,0 +1,108 @@
+"""
+爬取断点日志
+每爬完一篇文章就追加一条记录并落盘，进程中途崩溃也不会丢失已完成的文章；
+重启时跳过日志中已完成的链接继续爬取，也可以直接用日志中的文章发布部分 feed
+
+记录为 4 字节长度 + Article.to_bytes()（比 JSON 小，读取时正文不解码）；
+崩溃时写了一半的记录在读取时截掉，之后追加的记录接在最后一条完整记录后面；
+旧版本写的 JSONL 日志（同名 .jsonl 文件）仍然读取，清空日志时一并删除
+"""
+import json
+import os
+import struct
+from typing import Dict, List, Set
+
+from common.article import Article
+
+_LENGTH = struct.Struct('<I')
+
+
+class CheckpointJournal:
+    def __init__(self, path: str):
+        """
+        初始化断点日志
+
+        Args:
+            path: 日志文件路径
+        """
+        self.path = path
+        self.legacy_path = os.path.splitext(path)[0] + '.jsonl'
+        # 本进程是否已检查过日志末尾（第一次追加前截掉崩溃时写了一半的记录）
+        self._checked = False
+
+    def append(self, article: Dict):
+        """
+        追加一篇已完成的文章（写入后立即 fsync）
+
+        Args:
+            article: 文章（Article 或 dict）
+        """
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        if not self._checked:
+            self.load()
+        record = Article.coerce(article).to_bytes()
+        with open(self.path, 'ab') as f:
+            f.write(_LENGTH.pack(len(record)) + record)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _load_legacy(self, articles: Dict[str, Article]):
+        if self.legacy_path == self.path or not os.path.exists(self.legacy_path):
+            return
+        with open(self.legacy_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    article = Article.from_dict(json.loads(line))
+                except ValueError:
+                    continue
+                articles[article.get('link', '')] = article
+
+    def load(self) -> List[Article]:
+        """
+        读取日志中的文章（同一链接以最后一次为准）；末尾有崩溃时写了一半的记录时把文件截断到最后一条完整记录，
+        否则之后追加的记录都接在这段残缺数据后面，下次读取时全部丢失
+
+        Returns:
+            文章列表，按首次写入顺序
+        """
+        articles: Dict[str, Article] = {}
+        self._load_legacy(articles)
+        self._checked = True
+        if not os.path.exists(self.path):
+            return list(articles.values())
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        good = 0
+        while good + _LENGTH.size <= len(data):
+            (length,) = _LENGTH.unpack_from(data, good)
+            start = good + _LENGTH.size
+            if start + length > len(data):
+                break
+            try:
+                article = Article.from_bytes(data[start:start + length])
+            except ValueError:
+                break
+            good = start + length
+            articles[article.get('link', '')] = article
+        if good < len(data):
+            print(f"断点日志末尾有 {len(data) - good} 字节不完整的记录，已截断: {self.path}")
+            with open(self.path, 'r+b') as f:
+                f.truncate(good)
+                f.flush()
+                os.fsync(f.fileno())
+        return list(articles.values())
+
+    def completed_links(self) -> Set[str]:
+        """已完成文章的链接集合"""
+        return {article.get('link', '') for article in self.load()}
+
+    def clear(self):
+        """feed 成功发布后清空日志"""
+        for path in (self.path, self.legacy_path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,80 @@
+"""
+运行时间预算
+给整次运行一个墙钟时间上限，按观测到的单页耗时估计再抓一篇要多久，
+预留生成 feed 的时间，来不及时提前停止抓取，保证每次运行都能发布 feed
+"""
+import time
+from datetime import datetime, timezone
+from typing import Dict, List
+
+from common.article_store import article_date
+
+
+class CrawlDeadline:
+    def __init__(self, budget: float, reserve: float = 60.0, initial_estimate: float = 15.0,
+                 smoothing: float = 0.3, safety: float = 1.5):
+        """
+        初始化时间预算（从创建时开始计时）
+
+        Args:
+            budget: 整次运行的总秒数
+            reserve: 为生成 feed 等收尾工作预留的秒数
+            initial_estimate: 还没有观测数据时假定的单页耗时
+            smoothing: 单页耗时指数移动平均的权重
+            safety: 估计值的放大系数（页面耗时波动较大）
+        """
+        self.budget = budget
+        self.reserve = reserve
+        self.estimate = initial_estimate
+        self.smoothing = smoothing
+        self.safety = safety
+        self.started = time.time()
+        self.pages = 0
+        self.stopped = False
+
+    def elapsed(self) -> float:
+        return time.time() - self.started
+
+    def remaining(self) -> float:
+        """距离截止还剩的秒数（不含预留时间）"""
+        return self.budget - self.reserve - self.elapsed()
+
+    def observe(self, seconds: float):
+        """记录一次详情页抓取的耗时"""
+        self.pages += 1
+        if self.pages == 1:
+            self.estimate = seconds
+        else:
+            self.estimate = self.smoothing * seconds + (1 - self.smoothing) * self.estimate
+
+    def can_fetch(self) -> bool:
+        """剩余时间是否还够再抓一篇（第一次判断为否后打印一次提示）"""
+        if self.remaining() >= self.estimate * self.safety:
+            return True
+        if not self.stopped:
+            self.stopped = True
+            print(f"[时间预算] 已用 {self.elapsed():.0f}s / {self.budget:.0f}s，"
+                  f"单页约 {self.estimate:.1f}s，停止抓取，预留 {self.reserve:.0f}s 生成 feed")
+        return False
+
+    def pages_left(self) -> int:
+        """按当前估计还能抓取的篇数"""
+        return max(0, int(self.remaining() // (self.estimate * self.safety)))
+
+    def report(self):
+        print(f"时间预算: 已用 {self.elapsed():.0f}s / {self.budget:.0f}s，"
+              f"抓取 {self.pages} 页，单页约 {self.estimate:.1f}s")
+
+
+def newest_first(articles: List[Dict]) -> List[Dict]:
+    """
+    按发布时间从新到旧排序（日期无法解析的排在最后，相同日期保持原顺序）
+
+    Args:
+        articles: 文章列表
+
+    Returns:
+        排序后的新列表
+    """
+    oldest = datetime.min.replace(tzinfo=timezone.utc)
+    return sorted(articles, key=lambda a: article_date(a) or oldest, reverse=True)
@@ -0,0 +1,169 @@
+"""
+ChromeDriver 解析结果缓存
+ChromeDriverManager().install() 每次都要解析版本、可能访问网络。
+这里把解析出的驱动路径和浏览器路径固定记录到本地 manifest，
+下次启动只做文件存在性/大小/修改时间的廉价校验，校验失败时才重新解析
+"""
+import importlib.util
+import json
+import os
+import shutil
+import time
+from typing import Dict, Optional, Tuple
+
+from common import startup
+from common.browser_profile import cache_root
+
+MANIFEST_NAME = 'driver_manifest.json'
+# manifest 的最长有效期，过期后重新解析以便跟进新版本
+MANIFEST_MAX_AGE = 7 * 24 * 3600
+
+BROWSER_CANDIDATES = ('google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome')
+
+# --check 时只确认这些依赖可导入，不真正导入
+REQUIRED_MODULES = ('selenium', 'webdriver_manager', 'bs4', 'lxml', 'requests')
+
+
+def manifest_path() -> str:
+    root = cache_root() or os.path.join(os.path.expanduser('~'), '.cache', 'binance-crawler')
+    return os.path.join(root, MANIFEST_NAME)
+
+
+def _file_signature(path: str) -> Optional[Dict]:
+    try:
+        st = os.stat(path)
+    except (OSError, TypeError):
+        return None
+    return {'size': st.st_size, 'mtime': int(st.st_mtime)}
+
+
+def find_browser() -> Optional[str]:
+    """在 PATH 中查找 Chrome/Chromium 可执行文件"""
+    for name in BROWSER_CANDIDATES:
+        path = shutil.which(name)
+        if path:
+            return os.path.realpath(path)
+    return None
+
+
+def load_manifest() -> Optional[Dict]:
+    """读取并校验 manifest，无效时返回 None"""
+    path = manifest_path()
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if time.time() - manifest.get('resolved_at', 0) > MANIFEST_MAX_AGE:
+        return None
+    driver_path = manifest.get('driver_path')
+    if not driver_path or not os.access(driver_path, os.X_OK):
+        return None
+    if _file_signature(driver_path) != manifest.get('driver'):
+        return None
+    # 浏览器升级后驱动版本可能不再匹配
+    browser_path = manifest.get('browser_path')
+    if browser_path and _file_signature(browser_path) != manifest.get('browser'):
+        return None
+    return manifest
+
+
+def invalidate():
+    """删除 manifest（驱动启动失败时调用）"""
+    try:
+        os.remove(manifest_path())
+    except OSError:
+        pass
+
+
+def resolve_chrome(force: bool = False) -> Tuple[str, Optional[str], bool]:
+    """
+    获取 ChromeDriver 路径和浏览器路径
+
+    Args:
+        force: 忽略 manifest，强制重新解析
+
+    Returns:
+        (driver_path, browser_path, 是否来自缓存)
+    """
+    manifest = None if force else load_manifest()
+    if manifest:
+        startup.mark('driver_resolved')
+        return manifest['driver_path'], manifest.get('browser_path'), True
+
+    from webdriver_manager.chrome import ChromeDriverManager
+    driver_path = ChromeDriverManager().install()
+    browser_path = find_browser()
+
+    manifest = {
+        'driver_path': driver_path,
+        'driver': _file_signature(driver_path),
+        'browser_path': browser_path,
+        'browser': _file_signature(browser_path),
+        'resolved_at': int(time.time()),
+    }
+    path = manifest_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"警告: 无法写入驱动缓存 {path}: {e}")
+    startup.mark('driver_resolved')
+    return driver_path, browser_path, False
+
+
+def create_chrome_driver(chrome_options):
+    """
+    使用缓存的驱动路径创建 Chrome WebDriver，缓存失效导致启动失败时重新解析一次
+
+    Args:
+        chrome_options: selenium ChromeOptions
+
+    Returns:
+        WebDriver 实例
+    """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+
+    driver_path, browser_path, cached = resolve_chrome()
+    if browser_path and not chrome_options.binary_location:
+        chrome_options.binary_location = browser_path
+    try:
+        driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+    except Exception as e:
+        if not cached:
+            raise
+        print(f"缓存的驱动启动失败，重新解析: {e}")
+        invalidate()
+        driver_path, _, _ = resolve_chrome(force=True)
+        driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+    startup.mark('driver_ready')
+    return driver
+
+
+def check() -> bool:
+    """
+    启动前自检：确认依赖可导入、驱动缓存有效（不导入 selenium 等重量级模块）
+
+    Returns:
+        是否全部通过
+    """
+    ok = True
+    for module in REQUIRED_MODULES:
+        found = importlib.util.find_spec(module) is not None
+        print(f"  {'[OK]' if found else '[缺失]'} {module}")
+        ok = ok and found
+
+    manifest = load_manifest()
+    if manifest:
+        print(f"  [OK] 驱动缓存: {manifest['driver_path']}")
+        print(f"       浏览器: {manifest.get('browser_path') or '(由 Selenium 自动查找)'}")
+    else:
+        browser_path = find_browser()
+        print(f"  [无缓存] 驱动将在首次运行时解析（{manifest_path()}）")
+        print(f"       浏览器: {browser_path or '(未在 PATH 中找到)'}")
+    return ok
@@ -0,0 +1,102 @@
+"""
+正文解析进程池
+BeautifulSoup(html, 'lxml') 解析整个渲染后的页面、再逐个 decompose 清理是纯 CPU 的工作，
+在驱动浏览器的线程里做时浏览器只能空等；这里把原始页面 HTML 发给进程池，
+由子进程解析、提取、清洗，只把紧凑的详情字段（正文、作者、时间……）传回来，
+主线程同时去加载下一篇，结果按提交顺序取回
+
+解析函数必须是模块级函数（子进程按模块名导入），如 binance.crawler.parse_article_html；
+进程用 spawn 方式启动，不继承父进程里浏览器、HTTP 连接池等线程的状态
+"""
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Deque, Dict, Iterator, Optional
+
+# 解析进程数（可用环境变量 CRAWLER_PARSE_WORKERS 覆盖，0 表示在调用线程里解析）：留一个核给浏览器；
+# 单核机器上解析进程与浏览器、抓取线程抢同一个核，吞吐没有提升还多了进程间传页面的开销，默认不用进程池
+DEFAULT_WORKERS = int(os.environ.get('CRAWLER_PARSE_WORKERS', max(0, (os.cpu_count() or 1) - 1)))
+
+
+class ExtractionExecutor:
+    def __init__(self, workers: int = DEFAULT_WORKERS):
+        """
+        解析进程池（第一次提交时启动）
+
+        Args:
+            workers: 进程数，0 表示不用进程池，在调用线程里直接解析
+        """
+        self.workers = max(0, workers)
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def window(self) -> int:
+        """同时在解析中的页面数上限（超过时等待最早的一篇，限制内存中的原始页面数）"""
+        return max(1, self.workers * 2)
+
+    def submit(self, parse: Callable[[str], Dict], html: str) -> Future:
+        """
+        提交一个页面
+
+        Args:
+            parse: 解析函数 (html) -> 详情字段（模块级函数）
+            html: 页面 HTML
+
+        Returns:
+            解析结果的 Future
+        """
+        if self.workers == 0:
+            future = Future()
+            try:
+                future.set_result(parse(html))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                             mp_context=multiprocessing.get_context('spawn'))
+        return self._pool.submit(parse, html)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+
+class PendingExtraction:
+    __slots__ = ('future', 'finish')
+
+    def __init__(self, finish: Callable[[], Dict], future: Future = None):
+        """
+        一篇已提交解析的文章
+
+        Args:
+            finish: 取回解析结果并写进文章的函数，返回文章
+            future: 解析的 Future，None 表示不需要解析（接口数据、抓取失败）
+        """
+        self.finish = finish
+        self.future = future
+
+    def done(self) -> bool:
+        return self.future is None or self.future.done()
+
+    def result(self) -> Dict:
+        return self.finish()
+
+
+def take_ready(pending: Deque[PendingExtraction], window: int) -> Iterator[Dict]:
+    """
+    按提交顺序取出已经解析完的文章（排在最前面的没解析完时停下，超过 window 篇时等它）
+
+    Args:
+        pending: 按提交顺序排列的待取回文章
+        window: 最多同时在解析的篇数
+    """
+    while pending and (pending[0].done() or len(pending) > window):
+        yield pending.popleft().result()
+
+
+def take_all(pending: Deque[PendingExtraction]) -> Iterator[Dict]:
+    """按提交顺序等待并取出剩下的全部文章"""
+    while pending:
+        yield pending.popleft().result()
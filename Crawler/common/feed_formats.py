@@ -0,0 +1,306 @@
+"""
+多格式 feed 输出
+按同一个已排序的条目序列一次遍历，同时写出 RSS 2.0、Atom 与 JSON Feed 1.1：
+每篇文章的正文只清理一次，三种格式写的是同一个字符串；
+三个文件先写到临时文件，全部成功后再依次替换，发布步骤不会拿到新旧混合或写了一半的文件
+"""
+import html
+import json
+import os
+import re
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Dict, IO, Iterable, List, Optional
+from xml.sax.saxutils import escape, quoteattr
+
+FORMATS = ('rss', 'atom', 'json')
+
+# 各格式相对 RSS 文件名的后缀：feeds/binance_blog_feed.xml -> .atom / .json
+EXTENSIONS = {'rss': '.xml', 'atom': '.atom', 'json': '.json'}
+
+NS_CONTENT = 'http://purl.org/rss/1.0/modules/content/'
+NS_DC = 'http://purl.org/dc/elements/1.1/'
+NS_ATOM = 'http://www.w3.org/2005/Atom'
+# RFC 5005 Feed Paging and Archiving
+NS_FH = 'http://purl.org/syndication/history/1.0'
+
+# XML 1.0 不允许的控制字符
+_INVALID_XML_CHARS = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+
+
+def sanitize(text: str) -> str:
+    """去掉 XML 中不合法的控制字符"""
+    return _INVALID_XML_CHARS.sub('', text or '')
+
+
+def content_html(content: str) -> str:
+    """正文转为可放进 content:encoded / content_html 的 HTML，纯文本按行转成段落"""
+    content = sanitize(content).strip()
+    if content and not content.startswith('<'):
+        content = '<p>' + html.escape(content).replace('\n', '</p><p>') + '</p>'
+    return content
+
+
+def output_paths(output_file: str, formats: Iterable[str] = FORMATS) -> Dict[str, str]:
+    """
+    各格式的输出路径（与 RSS 文件放在同一目录）
+
+    Args:
+        output_file: RSS 文件路径
+        formats: 要输出的格式
+    """
+    base = output_file[:-4] if output_file.endswith('.xml') else output_file
+    return {fmt: base + EXTENSIONS[fmt] for fmt in formats}
+
+
+class FeedEntry:
+    __slots__ = ('id', 'title', 'link', 'date', 'updated', 'description', 'content', 'author', 'category')
+
+    def __init__(self, id: str, title: str, link: str, date: datetime, description: str = '',
+                 content: str = '', author: str = '', category: str = '', updated: datetime = None):
+        """
+        一个已清理好的条目，三种格式共用
+
+        Args:
+            id: 唯一标识（RSS guid）
+            title: 标题
+            link: 链接
+            date: 发布时间（带时区）
+            description: 摘要
+            content: 正文 HTML（已清理）
+            author: 作者
+            category: 分类
+            updated: 修改时间，默认与发布时间相同
+        """
+        self.id = id
+        self.title = sanitize(title)
+        self.link = link
+        self.date = date
+        self.updated = updated or date
+        self.description = sanitize(description)
+        self.content = content
+        self.author = sanitize(author)
+        self.category = sanitize(category)
+
+
+class FeedMeta:
+    def __init__(self, title: str, description: str, link: str, language: str = 'en',
+                 generator: str = '', feed_url: Optional[str] = None,
+                 links: Dict[str, str] = None, archive: bool = False, hub: Optional[str] = None):
+        """
+        feed 本身的信息
+
+        Args:
+            title: 标题
+            description: 描述
+            link: 网站地址
+            language: 语言
+            generator: 生成器名称
+            feed_url: feed 发布后的地址（不含扩展名），Atom/JSON Feed 中的自引用链接，None 表示不写
+            links: RFC 5005 分页链接，rel（current/prev-archive/next-archive）-> 地址（不含扩展名，
+                各格式加上自己的扩展名，指向同一格式的文件；可以是相对 feed 文件的相对地址）
+            archive: 是否为归档页（RFC 5005 的 fh:archive，内容不再变化）
+            hub: WebSub hub 地址（rel="hub"，订阅者向它订阅推送），None 表示不写
+        """
+        self.title = title
+        self.description = description
+        self.link = link
+        self.language = language
+        self.generator = generator
+        self.feed_url = feed_url
+        self.links = links or {}
+        self.archive = archive
+        self.hub = hub
+
+
+def _rfc3339(dt: datetime) -> str:
+    return dt.astimezone(timezone.utc).isoformat(timespec='seconds').replace('+00:00', 'Z')
+
+
+def _text(tag: str, value: str, indent: str = '      ') -> str:
+    return f'{indent}<{tag}>{escape(value)}</{tag}>\n'
+
+
+class _RSSWriter:
+    def __init__(self, out: IO[str], meta: FeedMeta, built: datetime):
+        self.out = out
+        out.write("<?xml version='1.0' encoding='utf-8'?>\n")
+        # 分页、自引用与 hub 链接用的 atom/fh 命名空间只在需要时声明，普通 feed 的输出保持不变
+        paging = ''
+        if meta.links or meta.feed_url or meta.hub:
+            paging += f' xmlns:atom="{NS_ATOM}"'
+        if meta.archive:
+            paging += f' xmlns:fh="{NS_FH}"'
+        out.write(f'<rss xmlns:content="{NS_CONTENT}" xmlns:dc="{NS_DC}"{paging} version="2.0">\n  <channel>\n')
+        out.write(_text('title', meta.title, '    '))
+        out.write(_text('link', meta.link, '    '))
+        out.write(_text('description', meta.description, '    '))
+        out.write('    <docs>http://www.rssboard.org/rss-specification</docs>\n')
+        if meta.generator:
+            out.write(_text('generator', meta.generator, '    '))
+        out.write(_text('language', meta.language, '    '))
+        out.write(_text('lastBuildDate', format_datetime(built), '    '))
+        if meta.feed_url:
+            out.write(f'    <atom:link href={quoteattr(meta.feed_url + EXTENSIONS["rss"])} rel="self" '
+                      f'type="application/rss+xml"/>\n')
+        if meta.hub:
+            out.write(f'    <atom:link href={quoteattr(meta.hub)} rel="hub"/>\n')
+        for rel, href in meta.links.items():
+            out.write(f'    <atom:link href={quoteattr(href + EXTENSIONS["rss"])} rel={quoteattr(rel)}/>\n')
+        if meta.archive:
+            out.write('    <fh:archive/>\n')
+
+    def entry(self, e: FeedEntry):
+        out = self.out
+        out.write('    <item>\n')
+        out.write(_text('title', e.title))
+        out.write(_text('link', e.link))
+        out.write(_text('description', e.description))
+        out.write(f'      <guid isPermaLink="false">{escape(e.id)}</guid>\n')
+        if e.category:
+            out.write(_text('category', e.category))
+        # 正文修改过的文章以修改时间作为 pubDate，阅读器里重新排到前面
+        out.write(_text('pubDate', format_datetime(e.updated)))
+        out.write(_text('dc:identifier', e.link))
+        out.write(_text('dc:creator', e.author))
+        out.write('      <content:encoded>')
+        out.write(escape(e.content))
+        out.write('</content:encoded>\n    </item>\n')
+
+    def close(self):
+        self.out.write('  </channel>\n</rss>\n')
+
+
+class _AtomWriter:
+    def __init__(self, out: IO[str], meta: FeedMeta, built: datetime):
+        self.out = out
+        out.write("<?xml version='1.0' encoding='utf-8'?>\n")
+        out.write(f'<feed xmlns="http://www.w3.org/2005/Atom" xml:lang={quoteattr(meta.language)}>\n')
+        out.write(_text('id', meta.feed_url + EXTENSIONS['atom'] if meta.feed_url else meta.link, '  '))
+        out.write(_text('title', meta.title, '  '))
+        out.write(_text('subtitle', meta.description, '  '))
+        out.write(f'  <link href={quoteattr(meta.link)} rel="alternate"/>\n')
+        if meta.feed_url:
+            out.write(f'  <link href={quoteattr(meta.feed_url + EXTENSIONS["atom"])} rel="self"/>\n')
+        if meta.hub:
+            out.write(f'  <link href={quoteattr(meta.hub)} rel="hub"/>\n')
+        out.write(_text('updated', _rfc3339(built), '  '))
+        if meta.generator:
+            out.write(_text('generator', meta.generator, '  '))
+        for rel, href in meta.links.items():
+            out.write(f'  <link href={quoteattr(href + EXTENSIONS["atom"])} rel={quoteattr(rel)}/>\n')
+        if meta.archive:
+            out.write(f'  <fh:archive xmlns:fh="{NS_FH}"/>\n')
+
+    def entry(self, e: FeedEntry):
+        out = self.out
+        out.write('  <entry>\n')
+        out.write(_text('id', e.link or f'urn:md5:{e.id}', '    '))
+        out.write(_text('title', e.title, '    '))
+        out.write(f'    <link href={quoteattr(e.link)} rel="alternate"/>\n')
+        out.write(_text('published', _rfc3339(e.date), '    '))
+        out.write(_text('updated', _rfc3339(e.updated), '    '))
+        out.write(f'    <author>\n{_text("name", e.author)}    </author>\n')
+        if e.category:
+            out.write(f'    <category term={quoteattr(e.category)}/>\n')
+        out.write(f'    <summary type="html">{escape(e.description)}</summary>\n')
+        out.write('    <content type="html">')
+        out.write(escape(e.content))
+        out.write('</content>\n  </entry>\n')
+
+    def close(self):
+        self.out.write('</feed>\n')
+
+
+class _JSONFeedWriter:
+    def __init__(self, out: IO[str], meta: FeedMeta, built: datetime):
+        self.out = out
+        self.first = True
+        header = {
+            'version': 'https://jsonfeed.org/version/1.1',
+            'title': meta.title,
+            'home_page_url': meta.link,
+            'description': meta.description,
+            'language': meta.language,
+        }
+        if meta.feed_url:
+            header['feed_url'] = meta.feed_url + EXTENSIONS['json']
+        if meta.hub:
+            header['hubs'] = [{'type': 'WebSub', 'url': meta.hub}]
+        if 'prev-archive' in meta.links:
+            # JSON Feed 的 next_url 指向更早的条目
+            header['next_url'] = meta.links['prev-archive'] + EXTENSIONS['json']
+        if meta.links or meta.archive:
+            # JSON Feed 没有归档的约定，按扩展字段（下划线开头）记录 RFC 5005 的链接
+            header['_rfc5005'] = dict({rel: href + EXTENSIONS['json'] for rel, href in meta.links.items()},
+                                      archive=meta.archive)
+        # 逐条写出 items，不在内存中拼出整个 JSON
+        out.write(json.dumps(header, ensure_ascii=False)[:-1] + ', "items": [\n')
+
+    def entry(self, e: FeedEntry):
+        item = {
+            'id': e.id,
+            'url': e.link,
+            'title': e.title,
+            'content_html': e.content,
+            'summary': e.description,
+            'date_published': _rfc3339(e.date),
+            'date_modified': _rfc3339(e.updated),
+            'authors': [{'name': e.author}],
+        }
+        if e.category:
+            item['tags'] = [e.category]
+        if not self.first:
+            self.out.write(',\n')
+        self.first = False
+        self.out.write(json.dumps(item, ensure_ascii=False))
+
+    def close(self):
+        self.out.write('\n]}\n')
+
+
+WRITERS = {'rss': _RSSWriter, 'atom': _AtomWriter, 'json': _JSONFeedWriter}
+
+
+def write_feeds(meta: FeedMeta, entries: Iterable[FeedEntry], paths: Dict[str, str],
+                built: datetime = None) -> Dict[str, str]:
+    """
+    一次遍历条目，同时写出多种格式
+
+    Args:
+        meta: feed 信息
+        entries: 已排序的条目
+        paths: 格式 -> 输出路径（见 output_paths）
+        built: 生成时间，默认当前时间
+
+    Returns:
+        格式 -> 输出路径
+    """
+    built = built or datetime.now(timezone.utc)
+    files: List[IO[str]] = []
+    writers = []
+    try:
+        for fmt, path in paths.items():
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            f = open(path + '.tmp', 'w', encoding='utf-8', newline='\n')
+            files.append(f)
+            writers.append(WRITERS[fmt](f, meta, built))
+        for entry in entries:
+            for writer in writers:
+                writer.entry(entry)
+        for writer in writers:
+            writer.close()
+        for f in files:
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        for f in files:
+            f.close()
+            os.remove(f.name)
+        raise
+    for f in files:
+        f.close()
+    # 全部写完后再替换，三个文件要么都是新的，要么都是旧的（除非替换过程中进程被杀）
+    for path in paths.values():
+        os.replace(path + '.tmp', path)
+    return dict(paths)
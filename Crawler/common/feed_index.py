@@ -0,0 +1,152 @@
+"""
+标签索引与子 feed
+每篇文章只提取一次标签（正文里的交易对链接/$代币、分类、标题关键词话题），结果缓存在文章上；
+建立 标签 -> 文章 的倒排索引后，任意多个子 feed 都只遍历各自命中的文章，
+生成开销与命中的条目数成正比，而不是 子 feed 数 × 文章数
+"""
+import hashlib
+import heapq
+import os
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+# 正文中的交易对链接：/en/trade/ACA_USDT?contentId=... 记为 ticker:ACA
+TRADE_LINK = re.compile(r'/trade/([A-Z0-9]{2,15})_[A-Z0-9]{2,15}\b')
+# 正文中的 $BTC 形式的代币
+CASHTAG = re.compile(r'(?<![\w$])\$([A-Z][A-Z0-9]{1,14})\b')
+
+# 话题关键词（匹配标题与摘要）：话题名 -> 正则
+DEFAULT_TOPICS = {
+    'delisting': r'\bdelist',
+    'listing': r'\bwill list\b|\bnew listing|\blists?\b.*\bspot\b',
+    'futures': r'\bfutures\b|\bperpetual',
+    'launchpool': r'\blaunch(?:pool|pad)\b',
+    'airdrop': r'\bairdrop',
+}
+
+
+def slugify(value: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', value.lower()).strip('-')
+
+
+class Tagger:
+    def __init__(self, topics: Dict[str, str] = None):
+        """
+        初始化标签提取
+
+        Args:
+            topics: 话题名 -> 关键词正则（不区分大小写），默认 DEFAULT_TOPICS
+        """
+        topics = DEFAULT_TOPICS if topics is None else topics
+        self.topics = {name: re.compile(pattern, re.IGNORECASE) for name, pattern in topics.items()}
+        # 话题配置变化时缓存的标签失效
+        self.version = hashlib.sha1(repr(sorted(topics.items())).encode('utf-8')).hexdigest()[:8]
+
+    def extract(self, article: Dict, content: str = None) -> List[str]:
+        """
+        提取一篇文章的标签：ticker:SOL、category:ecosystem、topic:delisting
+
+        Args:
+            article: 文章
+            content: 正文，None 表示取 article['content']
+        """
+        tags = set()
+        content = (article.get('content', '') if content is None else content) or ''
+        for match in TRADE_LINK.finditer(content):
+            tags.add('ticker:' + match.group(1))
+        for match in CASHTAG.finditer(content):
+            tags.add('ticker:' + match.group(1))
+        if article.get('category'):
+            tags.add('category:' + slugify(article['category']))
+        text = f"{article.get('title', '')}\n{article.get('description', '')}"
+        for name, pattern in self.topics.items():
+            if pattern.search(text):
+                tags.add('topic:' + name)
+        return sorted(tags)
+
+    def tags(self, article: Dict, load_content: Callable[[Dict], str] = None) -> List[str]:
+        """
+        文章的标签，正文指纹与话题配置都没变时直接用缓存（写回 article 的 tags/tags_key）
+
+        Args:
+            article: 文章
+            load_content: 读取正文的函数（正文在正文存储中时），只在缓存失效时调用
+        """
+        key = f"{self.version}:{article.get('fingerprint') or article.get('body') or hashlib.sha1((article.get('content') or '').encode('utf-8')).hexdigest()}"
+        if article.get('tags_key') != key or 'tags' not in article:
+            article['tags'] = self.extract(article, load_content(article) if load_content else None)
+            article['tags_key'] = key
+        return article['tags']
+
+
+class TagIndex:
+    def __init__(self, articles: Sequence[Dict], tagger: Tagger = None,
+                 load_content: Callable[[Dict], str] = None):
+        """
+        建立倒排索引（一次遍历）
+
+        Args:
+            articles: 按发布时间从新到旧排列的文章
+            tagger: 标签提取，默认使用 DEFAULT_TOPICS
+            load_content: 读取正文的函数（如 ArticleStore.content），None 表示取 article['content']
+        """
+        self.articles = articles
+        self.tagger = tagger or Tagger()
+        # 标签 -> 文章下标（递增，即从新到旧）
+        self.postings: Dict[str, List[int]] = {}
+        for i, article in enumerate(articles):
+            for tag in self.tagger.tags(article, load_content):
+                self.postings.setdefault(tag, []).append(i)
+
+    def counts(self) -> Dict[str, int]:
+        """各标签的文章数"""
+        return {tag: len(ids) for tag, ids in self.postings.items()}
+
+    def select(self, tags: Iterable[str], limit: Optional[int] = None) -> List[Dict]:
+        """
+        命中任一标签的文章，从新到旧
+
+        Args:
+            tags: 标签（多个时取并集）
+            limit: 最多返回的篇数
+        """
+        lists = [self.postings.get(tag, []) for tag in tags]
+        result = []
+        last = -1
+        # 各倒排表都是有序的，归并时只会访问到命中的文章
+        for i in heapq.merge(*lists):
+            if i == last:
+                continue
+            last = i
+            result.append(self.articles[i])
+            if limit and len(result) >= limit:
+                break
+        return result
+
+
+def write_sub_feeds(index: TagIndex, sub_feeds: Dict[str, Sequence[str]], output_dir: str,
+                    generate: Callable[[List[Dict], str, str], object], limit: int = 50) -> Dict[str, str]:
+    """
+    按配置生成子 feed
+
+    Args:
+        index: 标签索引
+        sub_feeds: 子 feed 名 -> 标签列表，如 {'sol': ['ticker:SOL'], 'delisting': ['topic:delisting']}
+        output_dir: 输出目录（每个子 feed 为 <名>.xml 及对应的 .atom/.json）
+        generate: 生成 feed 的函数，参数为 (文章, 输出文件, 子 feed 名)
+        limit: 每个子 feed 的最多条目数
+
+    Returns:
+        子 feed 名 -> RSS 文件路径（没有命中文章的子 feed 不生成）
+    """
+    written = {}
+    for name, tags in sub_feeds.items():
+        articles = index.select(tags, limit)
+        if not articles:
+            continue
+        output_file = os.path.join(output_dir, f'{slugify(name)}.xml')
+        generate(articles, output_file, name)
+        written[name] = output_file
+    if written:
+        print(f"已生成 {len(written)} 个子 feed: {', '.join(written)}")
+    return written
@@ -0,0 +1,299 @@
+"""
+本地 feed 服务
+从内存提供生成好的 feed：强 ETag 由条目摘要计算（只重新生成、条目没变时 ETag 不变，客户端拿到 304），
+gzip/brotli 压缩版本在每次重新生成后只构建一次，并支持 limit/since 查询参数只返回部分条目
+"""
+import gzip
+import hashlib
+import os
+import threading
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from common.article_store import parse_date
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# 重新序列化部分条目时保持原来的命名空间前缀
+NAMESPACES = {
+    'atom': 'http://www.w3.org/2005/Atom',
+    'content': 'http://purl.org/rss/1.0/modules/content/',
+    'dc': 'http://purl.org/dc/elements/1.1/',
+    'media': 'http://search.yahoo.com/mrss/',
+    'fh': 'http://purl.org/syndication/history/1.0',
+}
+for _prefix, _uri in NAMESPACES.items():
+    ET.register_namespace(_prefix, _uri)
+
+
+def _item_date(item: ET.Element) -> Optional[datetime]:
+    text = (item.findtext('pubDate') or '').strip()
+    if not text:
+        return None
+    try:
+        dt = parsedate_to_datetime(text)
+    except (TypeError, ValueError):
+        return parse_date(text)
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def parse_since(value: str) -> Optional[datetime]:
+    """since 参数：ISO 日期/时间或 Unix 时间戳"""
+    value = (value or '').strip()
+    if not value:
+        return None
+    if value.isdigit():
+        return datetime.fromtimestamp(int(value), timezone.utc)
+    return parse_date(value)
+
+
+class Representation:
+    def __init__(self, body: bytes, etag: str):
+        """
+        一份 feed 内容及其压缩版本
+
+        Args:
+            body: 未压缩的 XML
+            etag: 条目摘要（不含引号）
+        """
+        self.etag = etag
+        self.variants = {'identity': body, 'gzip': gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            self.variants['br'] = brotli.compress(body, quality=11)
+
+    def select(self, accept_encoding: str) -> Tuple[str, bytes, str]:
+        """
+        按 Accept-Encoding 选择编码，优先 br，其次 gzip
+
+        Returns:
+            (编码, 内容, 带引号的强 ETag)；不同编码的 ETag 不同
+        """
+        accepted = {}
+        for part in (accept_encoding or '').split(','):
+            name, _, params = part.strip().partition(';')
+            q = 1.0
+            if params.strip().startswith('q='):
+                try:
+                    q = float(params.strip()[2:])
+                except ValueError:
+                    q = 0.0
+            if name:
+                accepted[name.strip().lower()] = q
+        for encoding in ('br', 'gzip'):
+            if encoding in self.variants and accepted.get(encoding, accepted.get('*', 0)) > 0:
+                return encoding, self.variants[encoding], f'"{self.etag}-{encoding}"'
+        return 'identity', self.variants['identity'], f'"{self.etag}"'
+
+
+class FeedFile:
+    def __init__(self, path: str, cache_size: int = 32):
+        """
+        磁盘上的一个 feed 文件，文件修改后（重新生成）下一次请求时重新加载
+
+        Args:
+            path: feed 文件路径
+            cache_size: 缓存的 limit/since 组合数量
+        """
+        self.path = path
+        self.cache_size = cache_size
+        self.mtime = None
+        self.last_modified = ''
+        self.full: Optional[Representation] = None
+        self._body = b''
+        self._items: List[Tuple[str, Optional[datetime]]] = []
+        self._partial: 'OrderedDict[Tuple, Representation]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def refresh(self) -> bool:
+        """
+        文件有变化时重新加载
+
+        Returns:
+            当前是否有可用的 feed
+        """
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return self.full is not None
+        with self._lock:
+            if mtime == self.mtime:
+                return True
+            with open(self.path, 'rb') as f:
+                body = f.read()
+            try:
+                root = ET.fromstring(body)
+            except ET.ParseError as e:
+                # 正在写入的半截文件，继续提供旧版本
+                print(f"feed 解析失败，继续使用旧版本 {self.path}: {e}")
+                return self.full is not None
+            channel = root.find('channel')
+            items = channel.findall('item') if channel is not None else []
+            self._items = [(hashlib.sha1(ET.tostring(item)).hexdigest(), _item_date(item)) for item in items]
+            self._body = body
+            self.full = Representation(body, self._digest(self._items))
+            self._partial.clear()
+            self.mtime = mtime
+            self.last_modified = formatdate(mtime / 1e9, usegmt=True)
+            return True
+
+    @staticmethod
+    def _digest(items) -> str:
+        return hashlib.sha1(''.join(digest for digest, _ in items).encode('ascii')).hexdigest()[:32]
+
+    def get(self, limit: Optional[int] = None, since: Optional[datetime] = None) -> Representation:
+        """
+        取 feed 内容，limit/since 只保留最新的 limit 条、发布时间晚于 since 的条目
+
+        Args:
+            limit: 最多条目数
+            since: 只要该时间之后发布的条目
+        """
+        if limit is None and since is None:
+            return self.full
+        with self._lock:
+            keep = [i for i, (_, date) in enumerate(self._items)
+                    if since is None or (date is not None and date > since)]
+            if limit is not None:
+                keep = keep[:limit]
+            key = tuple(keep)
+            cached = self._partial.get(key)
+            if cached is not None:
+                self._partial.move_to_end(key)
+                return cached
+            if len(keep) == len(self._items):
+                return self.full
+            root = ET.fromstring(self._body)
+            channel = root.find('channel')
+            kept = set(keep)
+            for i, item in enumerate(channel.findall('item')):
+                if i not in kept:
+                    channel.remove(item)
+            body = ET.tostring(root, encoding='utf-8', xml_declaration=True)
+            representation = Representation(body, self._digest([self._items[i] for i in keep]))
+            self._partial[key] = representation
+            if len(self._partial) > self.cache_size:
+                self._partial.popitem(last=False)
+            return representation
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == '*':
+        return True
+    bare = etag.strip('"').split('-')[0]
+    for candidate in header.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        # 同一内容的任意编码版本都算匹配
+        if candidate.strip('"').split('-')[0] == bare:
+            return True
+    return False
+
+
+class FeedServer:
+    def __init__(self, feeds: Dict[str, str], host: str = '127.0.0.1', port: int = 8080, max_age: int = 300):
+        """
+        初始化 feed 服务
+
+        Args:
+            feeds: URL 中的文件名 -> feed 文件路径
+            host: 监听地址
+            port: 监听端口
+            max_age: Cache-Control 的 max-age（秒）
+        """
+        self.feeds = {name: FeedFile(path) for name, path in feeds.items()}
+        self.max_age = max_age
+        self.server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self.server.server_address[1]
+
+    def refresh(self):
+        """重新加载有变化的 feed（爬虫生成 feed 后调用，首个请求就不用再加载）"""
+        for feed in self.feeds.values():
+            feed.refresh()
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _error(self, code: int, message: str):
+                data = message.encode('utf-8')
+                self.send_response(code)
+                self.send_header('Content-Type', 'text/plain; charset=utf-8')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                if self.command != 'HEAD':
+                    self.wfile.write(data)
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                name = url.path.rsplit('/', 1)[-1]
+                feed = server.feeds.get(name)
+                if feed is None or not feed.refresh():
+                    self._error(404, 'feed not found')
+                    return
+                query = parse_qs(url.query)
+                try:
+                    limit = int(query['limit'][0]) if 'limit' in query else None
+                    if limit is not None and limit < 0:
+                        raise ValueError(limit)
+                except ValueError:
+                    self._error(400, 'invalid limit')
+                    return
+                since = None
+                if 'since' in query:
+                    since = parse_since(query['since'][0])
+                    if since is None:
+                        self._error(400, 'invalid since')
+                        return
+
+                encoding, body, etag = feed.get(limit, since).select(self.headers.get('Accept-Encoding', ''))
+                not_modified = _etag_matches(self.headers.get('If-None-Match', ''), etag) \
+                    if self.headers.get('If-None-Match') else False
+                self.send_response(304 if not_modified else 200)
+                self.send_header('ETag', etag)
+                self.send_header('Last-Modified', feed.last_modified)
+                self.send_header('Cache-Control', f'public, max-age={server.max_age}')
+                self.send_header('Vary', 'Accept-Encoding')
+                if not_modified:
+                    self.end_headers()
+                    return
+                self.send_header('Content-Type', 'application/rss+xml; charset=utf-8')
+                if encoding != 'identity':
+                    self.send_header('Content-Encoding', encoding)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if self.command != 'HEAD':
+                    self.wfile.write(body)
+
+            do_HEAD = do_GET
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        """在后台线程中提供服务"""
+        self.refresh()
+        self._thread = threading.Thread(target=self.server.serve_forever, name='feed-server', daemon=True)
+        self._thread.start()
+
+    def serve_forever(self):
+        self.refresh()
+        self.server.serve_forever()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,246 @@
+"""
+抓取结果分类、重试策略与熔断器
+把一次抓取的结果归为 ok / empty / not_found / blocked / timeout / driver_dead，
+按类别决定是否重试、如何重试；同一主机连续被拦截时熔断，本次运行内不再请求
+"""
+import re
+import threading
+import time
+from enum import Enum
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from common.rate_limiter import host_of, is_block_page
+
+
+class FetchStatus(Enum):
+    OK = 'ok'
+    EMPTY = 'empty'              # 页面打开了但没有等到正文（选择器不存在/渲染未完成）
+    NOT_FOUND = 'not_found'      # 404 或文章已删除
+    BLOCKED = 'blocked'          # 429/403/验证码/拦截页
+    TIMEOUT = 'timeout'          # 超时或其他临时性错误
+    DRIVER_DEAD = 'driver_dead'  # 浏览器/驱动会话已失效
+
+
+class RetryPolicy:
+    def __init__(self, retries: int = 0, reload: bool = True, delay: float = 0.0, restart_driver: bool = False):
+        """
+        单个结果类别的重试策略
+
+        Args:
+            retries: 最多重试次数
+            reload: 重试时是否重新打开页面（False 表示只在当前页面上再等一会儿）
+            delay: 重试前额外等待的秒数
+            restart_driver: 重试前是否重启浏览器
+        """
+        self.retries = retries
+        self.reload = reload
+        self.delay = delay
+        self.restart_driver = restart_driver
+
+
+RETRY_POLICIES: Dict[FetchStatus, RetryPolicy] = {
+    FetchStatus.OK: RetryPolicy(retries=0),
+    # 多半是渲染慢，不必重新加载整页，再等几秒重新读取即可
+    FetchStatus.EMPTY: RetryPolicy(retries=1, reload=False, delay=3.0),
+    # 重试也不会变好，直接放弃
+    FetchStatus.NOT_FOUND: RetryPolicy(retries=0),
+    FetchStatus.BLOCKED: RetryPolicy(retries=0),
+    # 重试间隔交给限速器（失败后已降速）
+    FetchStatus.TIMEOUT: RetryPolicy(retries=2),
+    FetchStatus.DRIVER_DEAD: RetryPolicy(retries=1, restart_driver=True),
+}
+
+
+class FetchResult:
+    def __init__(self, url: str, status: FetchStatus, html: str = None,
+                 error: str = '', elapsed: float = 0.0, attempts: int = 1, data: Any = None):
+        """
+        一次抓取的结果
+
+        Args:
+            url: 请求的 URL
+            status: 结果类别
+            html: 页面源码（失败时可能为 None）
+            error: 错误描述
+            elapsed: 总耗时（秒）
+            attempts: 实际尝试次数
+            data: 解析后的数据（如文章正文）
+        """
+        self.url = url
+        self.status = status
+        self.html = html
+        self.error = error
+        self.elapsed = elapsed
+        self.attempts = attempts
+        self.data = data
+
+    @property
+    def ok(self) -> bool:
+        return self.status == FetchStatus.OK
+
+    def __repr__(self):
+        return f"FetchResult({self.status.value}, {self.url!r}, attempts={self.attempts}, elapsed={self.elapsed:.1f}s)"
+
+
+_NOT_FOUND_TITLE = re.compile(r'\b404\b|page not found|页面不存在', re.I)
+_DRIVER_DEAD_MESSAGES = ('invalid session id', 'chrome not reachable', 'session deleted',
+                         'disconnected', 'no such window', 'target window already closed',
+                         'connection refused', 'max retries exceeded')
+
+
+def classify_exception(exc: BaseException) -> FetchStatus:
+    """
+    根据异常判断结果类别（按类名和消息判断，不依赖导入 selenium）
+    """
+    name = type(exc).__name__
+    message = str(exc).lower()
+    if name in ('InvalidSessionIdException', 'NoSuchWindowException') or any(m in message for m in _DRIVER_DEAD_MESSAGES):
+        return FetchStatus.DRIVER_DEAD
+    return FetchStatus.TIMEOUT
+
+
+def classify_page(html: Optional[str], current_url: str = '', has_content: bool = True) -> FetchStatus:
+    """
+    根据页面内容判断结果类别
+
+    Args:
+        html: 页面源码
+        current_url: 浏览器当前 URL（重定向到 404 页时可据此判断）
+        has_content: 是否找到了正文/等待的选择器
+
+    Returns:
+        结果类别
+    """
+    if not html:
+        return FetchStatus.EMPTY
+    if is_block_page(html):
+        return FetchStatus.BLOCKED
+    title = re.search(r'<title[^>]*>(.*?)</title>', html[:5000], re.I | re.S)
+    if (title and _NOT_FOUND_TITLE.search(title.group(1))) or re.search(r'/(404|not-found)(/|$|\?)', current_url or ''):
+        return FetchStatus.NOT_FOUND
+    return FetchStatus.OK if has_content else FetchStatus.EMPTY
+
+
+class CircuitBreaker:
+    def __init__(self, threshold: int = 3):
+        """
+        按主机的熔断器：连续 threshold 次被拦截后熔断，本次运行内快速失败
+
+        Args:
+            threshold: 触发熔断的连续拦截次数
+        """
+        self.threshold = threshold
+        self._blocked: Dict[str, int] = {}
+        self._open: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def allow(self, url: str) -> bool:
+        """该主机是否仍允许请求"""
+        with self._lock:
+            return host_of(url) not in self._open
+
+    def record(self, url: str, status: FetchStatus):
+        """记录一次结果"""
+        host = host_of(url)
+        with self._lock:
+            if host in self._open:
+                return
+            if status == FetchStatus.BLOCKED:
+                self._blocked[host] = self._blocked.get(host, 0) + 1
+                if self._blocked[host] >= self.threshold:
+                    self._open[host] = time.time()
+                    print(f"  [熔断] {host} 连续 {self.threshold} 次被拦截，本次运行不再请求该主机")
+            elif status != FetchStatus.DRIVER_DEAD:
+                self._blocked[host] = 0
+
+    def is_open(self, url: str) -> bool:
+        return not self.allow(url)
+
+    def reset(self):
+        """清除所有主机的熔断状态（守护进程中每一轮开始时调用）"""
+        with self._lock:
+            self._blocked.clear()
+            self._open.clear()
+
+
+def fetch_with_policy(url: str,
+                      load: Callable[[bool], Tuple[Optional[str], bool, str]],
+                      restart: Callable[[], None] = None,
+                      rate_limiter=None,
+                      circuit_breaker: CircuitBreaker = None,
+                      max_attempts: int = 3,
+                      policies: Dict[FetchStatus, RetryPolicy] = None) -> FetchResult:
+    """
+    按结果类别执行抓取与重试
+
+    Args:
+        url: 要抓取的 URL
+        load: 执行一次加载的函数，参数为是否重新打开页面，返回 (html, 是否找到正文, 当前 URL)
+        restart: 重启浏览器的函数（driver_dead 时调用）
+        rate_limiter: 限速器，重新打开页面前取令牌并反馈结果
+        circuit_breaker: 熔断器
+        max_attempts: 总尝试次数上限
+        policies: 各类别的重试策略，默认 RETRY_POLICIES
+
+    Returns:
+        FetchResult
+    """
+    policies = policies or RETRY_POLICIES
+    start = time.time()
+    tries: Dict[FetchStatus, int] = {}
+    attempts = 0
+    reload = True
+
+    while True:
+        if circuit_breaker and not circuit_breaker.allow(url):
+            return FetchResult(url, FetchStatus.BLOCKED, error='主机已熔断',
+                               elapsed=time.time() - start, attempts=attempts)
+        attempts += 1
+        html, error = None, ''
+        try:
+            if reload and rate_limiter:
+                rate_limiter.acquire(url)
+            html, has_content, current_url = load(reload)
+            status = classify_page(html, current_url, has_content)
+        except Exception as e:
+            status = classify_exception(e)
+            error = str(e).split('\n')[0]
+
+        if circuit_breaker:
+            circuit_breaker.record(url, status)
+        if rate_limiter:
+            if status == FetchStatus.BLOCKED:
+                rate_limiter.throttled(url)
+            elif status in (FetchStatus.TIMEOUT, FetchStatus.DRIVER_DEAD):
+                rate_limiter.failure(url)
+            else:
+                rate_limiter.success(url)
+
+        tries[status] = tries.get(status, 0) + 1
+        policy = policies[status]
+        if status == FetchStatus.OK or tries[status] > policy.retries or attempts >= max_attempts:
+            result = FetchResult(url, status, html=html, error=error,
+                                 elapsed=time.time() - start, attempts=attempts)
+            if not result.ok:
+                print(f"  [{status.value}] {url[:80]} (尝试 {attempts} 次) {error[:120]}")
+            return result
+
+        print(f"  [{status.value}] 重试 {url[:80]} {error[:120]}")
+        if policy.restart_driver and restart:
+            restart()
+        if policy.delay:
+            time.sleep(policy.delay)
+        reload = policy.reload
+
+
+_breaker: Optional[CircuitBreaker] = None
+_breaker_lock = threading.Lock()
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """获取进程内共享的熔断器"""
+    global _breaker
+    with _breaker_lock:
+        if _breaker is None:
+            _breaker = CircuitBreaker()
+        return _breaker
@@ -0,0 +1,276 @@
+"""
+共享 HTTP 客户端
+所有非浏览器请求（rss.app、binance.com 接口/站点地图等）共用一个带连接池的会话：
+keep-alive 连接复用、可选 HTTP/2、按主机限制并发连接数、
+带抖动的指数退避重试（遵守 Retry-After），并统计连接池命中情况
+"""
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from common.rate_limiter import RateLimiter, get_rate_limiter
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept-Encoding': 'gzip, deflate',
+}
+
+# 需要重试的状态码
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# 共享客户端是否使用 HTTP/2（环境变量 CRAWLER_HTTP2=1 开启，需要安装 httpx[http2]）
+HTTP2 = os.environ.get('CRAWLER_HTTP2', '').lower() in ('1', 'true', 'yes')
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    解析 Retry-After 头（秒数或 HTTP 日期）
+
+    Returns:
+        需要等待的秒数，无法解析时返回 None
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        dt = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return max(0.0, (dt - datetime.now(timezone.utc)).total_seconds())
+
+
+class HttpClient:
+    def __init__(self,
+                 per_host_connections: int = 4,
+                 max_retries: int = 3,
+                 backoff_base: float = 0.5,
+                 backoff_max: float = 30.0,
+                 retry_after_max: float = 120.0,
+                 timeout: float = 30.0,
+                 http2: bool = False,
+                 headers: Dict[str, str] = None,
+                 rate_limiter: RateLimiter = None):
+        """
+        初始化 HTTP 客户端
+
+        Args:
+            per_host_connections: 每个主机的最大并发连接数（连接池大小）
+            max_retries: 最大重试次数
+            backoff_base: 指数退避的基础秒数
+            backoff_max: 单次退避的最长秒数
+            retry_after_max: 服务器 Retry-After 的最长遵守秒数
+            timeout: 默认请求超时
+            http2: 是否使用 HTTP/2（需要安装 httpx[http2]，否则回退到 requests）
+            headers: 默认请求头
+            rate_limiter: 按主机限速器，None 表示不限速
+        """
+        self.per_host_connections = per_host_connections
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_after_max = retry_after_max
+        self.timeout = timeout
+        self.headers = dict(DEFAULT_HEADERS, **(headers or {}))
+        self.rate_limiter = rate_limiter
+
+        self._lock = threading.Lock()
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._stats = {'requests': 0, 'retries': 0, 'errors': 0, 'http2_responses': 0}
+
+        self.http2 = False
+        self._httpx = None
+        if http2:
+            try:
+                import httpx
+                # 未安装 h2 时 httpx 在这里抛出 ImportError
+                self._httpx = httpx.Client(
+                    http2=True,
+                    headers=self.headers,
+                    timeout=timeout,
+                    follow_redirects=True,
+                    limits=httpx.Limits(max_keepalive_connections=per_host_connections * 4),
+                )
+                self.http2 = True
+            except ImportError:
+                print("警告: 未安装 httpx[http2]，回退到 HTTP/1.1 连接池")
+
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=per_host_connections, pool_block=True)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def _slot(self, url: str) -> threading.BoundedSemaphore:
+        """按主机限制并发请求数"""
+        host = urlsplit(url).netloc
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(self.per_host_connections)
+            return slot
+
+    def _backoff(self, attempt: int) -> float:
+        """带抖动的指数退避（full jitter）"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _count(self, key: str):
+        with self._lock:
+            self._stats[key] += 1
+
+    def _send(self, method: str, url: str, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        if self._httpx is not None and not kwargs.get('stream'):
+            response = self._httpx.request(method, url, **kwargs)
+            # 服务器不支持时 httpx 会协商回 HTTP/1.1，只统计真正走 HTTP/2 的响应
+            if response.http_version == 'HTTP/2':
+                self._count('http2_responses')
+            return response
+        return self.session.request(method, url, **kwargs)
+
+    def request(self, method: str, url: str, **kwargs):
+        """
+        发送请求，网络错误和 429/5xx 会按退避策略重试
+
+        Returns:
+            响应对象（requests.Response 或 httpx.Response），最后一次重试仍失败时抛出异常
+        """
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter:
+                self.rate_limiter.acquire(url)
+            self._count('requests')
+            try:
+                with self._slot(url):
+                    response = self._send(method, url, **kwargs)
+            except Exception as e:
+                self._count('errors')
+                if self.rate_limiter:
+                    self.rate_limiter.failure(url)
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                print(f"  请求失败，{delay:.1f}s 后重试 ({attempt + 1}/{self.max_retries}) {url[:80]}: {e}")
+                self._count('retries')
+                time.sleep(delay)
+                continue
+
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if retry_after is not None:
+                retry_after = min(retry_after, self.retry_after_max)
+            if self.rate_limiter:
+                self.rate_limiter.record_status(url, response.status_code, retry_after)
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                if self.rate_limiter and response.status_code == 429:
+                    # 限速器已按 Retry-After 暂停该主机，下次 acquire 时等待
+                    delay = 0.0
+                elif retry_after is not None:
+                    delay = retry_after
+                else:
+                    delay = self._backoff(attempt)
+                print(f"  HTTP {response.status_code}，{delay:.1f}s 后重试 ({attempt + 1}/{self.max_retries}) {url[:80]}")
+                self._count('retries')
+                response.close()
+                time.sleep(delay)
+                continue
+            return response
+
+    def get(self, url: str, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def get_stream(self, url: str, **kwargs):
+        """
+        流式 GET（总是走 requests 连接池），response.raw 为已按 Content-Encoding 解压的文件对象，
+        调用方读完后需要 close
+
+        Returns:
+            requests.Response，非 2xx 时抛出异常
+        """
+        response = self.request('GET', url, stream=True, **kwargs)
+        try:
+            response.raise_for_status()
+        except Exception:
+            response.close()
+            raise
+        response.raw.decode_content = True
+        return response
+
+    def stats(self) -> Dict:
+        """
+        连接池统计
+
+        Returns:
+            requests/retries/errors、http2（是否启用了 HTTP/2 客户端）、http2_responses（实际以 HTTP/2 返回的响应数）
+            以及按主机的 connections（新建连接数）、pool_hits（复用已有连接的请求数）；
+            HTTP/2 模式下只统计走 requests 连接池的流式请求
+        """
+        with self._lock:
+            result = dict(self._stats)
+        result['http2'] = self.http2
+        hosts = {}
+        pool_manager = self.session.get_adapter('https://').poolmanager
+        for key in list(pool_manager.pools.keys()):
+            pool = pool_manager.pools.get(key)
+            if pool is None:
+                continue
+            host = hosts.setdefault(pool.host, {'connections': 0, 'requests': 0})
+            host['connections'] += pool.num_connections
+            host['requests'] += pool.num_requests
+        for host in hosts.values():
+            host['pool_hits'] = max(0, host['requests'] - host['connections'])
+        result['hosts'] = hosts
+        return result
+
+    def report(self):
+        """打印连接池统计"""
+        stats = self.stats()
+        if not stats['requests']:
+            return
+        print(f"\nHTTP 统计: 请求 {stats['requests']} 次，重试 {stats['retries']} 次，错误 {stats['errors']} 次")
+        if stats['http2']:
+            print(f"  HTTP/2 已启用，{stats['http2_responses']} 个响应实际使用 HTTP/2")
+        elif HTTP2:
+            print("  HTTP/2 未生效（CRAWLER_HTTP2=1 但未安装 httpx[http2]），使用 HTTP/1.1 连接池")
+        for host, info in stats['hosts'].items():
+            print(f"  {host}: 新建连接 {info['connections']}，复用 {info['pool_hits']}")
+
+    def close(self):
+        if self._httpx is not None:
+            self._httpx.close()
+        self.session.close()
+
+
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client(**kwargs) -> HttpClient:
+    """
+    获取进程内共享的 HTTP 客户端（首次调用时按参数创建，默认使用共享限速器，HTTP/2 由 CRAWLER_HTTP2 决定）
+
+    Returns:
+        HttpClient 实例
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            kwargs.setdefault('rate_limiter', get_rate_limiter())
+            kwargs.setdefault('http2', HTTP2)
+            _client = HttpClient(**kwargs)
+        return _client
+
+
+def report():
+    """打印共享客户端的统计（未使用时不输出）"""
+    if _client is not None:
+        _client.report()
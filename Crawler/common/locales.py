@@ -0,0 +1,121 @@
+"""
+多语言站点
+Binance 的同一篇文章在各语言下的链接只差语言段，末尾的数字 id 相同：
+    /en/blog/ecosystem/some-title-421499824684903463
+    /zh-CN/blog/ecosystem/标题-421499824684903463
+按这个 id（content ID）把各语言版本归为一组：组内共享发布时间、分类等元数据，
+多个语言的列表页指向同一个链接时正文只抓一次；并按语言统计发现、抓取、生成 feed 的耗时
+"""
+import re
+from typing import Dict, Iterable, List, Optional
+
+from common.article import Article
+
+# https://www.binance.com/<语言>/... 中的语言段：en、zh-CN、pt-BR、es-LA……
+_LOCALE_SEGMENT = re.compile(r'^(https?://[^/]+)/([a-z]{2}(?:-[A-Za-z]{2,4})?)(?=/)')
+# 链接最后一段末尾的数字 id
+_CONTENT_ID = re.compile(r'-(\d{6,})/?(?:[?#]|$)')
+
+# 同组文章之间可以共享的字段（翻译版本缺失或无法解析时用其他语言版本的值补全）
+SHARED_FIELDS = ('date', 'pub_date', 'lastmod', 'category', 'image_url')
+
+
+def locale_of(url: str) -> Optional[str]:
+    """链接中的语言段，没有时返回 None"""
+    match = _LOCALE_SEGMENT.match(url)
+    return match.group(2) if match else None
+
+
+def localize(url: str, locale: str) -> str:
+    """把链接中的语言段替换为 locale（没有语言段的链接原样返回）"""
+    return _LOCALE_SEGMENT.sub(lambda m: f'{m.group(1)}/{locale}', url, count=1)
+
+
+def content_id(link: str) -> str:
+    """
+    文章的跨语言标识：链接末尾的数字 id，没有 id 时为去掉语言段后的链接
+
+    Args:
+        link: 文章链接
+    """
+    match = _CONTENT_ID.search(link)
+    if match:
+        return match.group(1)
+    return _LOCALE_SEGMENT.sub(r'\1', link, count=1).rstrip('/')
+
+
+def group_by_content(articles_by_locale: Dict[str, List[Dict]]) -> Dict[str, Dict[str, Article]]:
+    """
+    按 content ID 把各语言发现的文章分组（转为 Article，同时写入文章的 locale 与 content_id 字段）
+
+    Args:
+        articles_by_locale: 语言 -> 该语言发现的文章，第一个语言为主语言
+
+    Returns:
+        content ID -> {语言: 文章}，按第一次出现的顺序
+    """
+    groups: Dict[str, Dict[str, Article]] = {}
+    for locale, articles in articles_by_locale.items():
+        for article in map(Article.coerce, articles):
+            article['locale'] = locale
+            article['content_id'] = content_id(article['link'])
+            groups.setdefault(article['content_id'], {}).setdefault(locale, article)
+    return groups
+
+
+def share_metadata(group: Dict[str, Dict], fields: Iterable[str] = SHARED_FIELDS):
+    """
+    组内互相补全缺失的元数据（按语言顺序，先出现的语言优先）
+
+    Args:
+        group: {语言: 文章}
+        fields: 要补全的字段
+    """
+    members = list(group.values())
+    for field in fields:
+        value = next((a[field] for a in members if a.get(field)), None)
+        if value is None:
+            continue
+        for article in members:
+            if not article.get(field):
+                article[field] = value
+
+
+class LocaleCost:
+    def __init__(self, locale: str):
+        """
+        单个语言在一次多语言运行中的开销
+
+        Args:
+            locale: 语言
+        """
+        self.locale = locale
+        self.discovered = 0
+        self.fetched = 0
+        self.failed = 0
+        # 链接与其他语言相同、直接复用正文的篇数
+        self.shared = 0
+        self.discover_seconds = 0.0
+        self.fetch_seconds = 0.0
+        self.feed_seconds = 0.0
+
+    def add_fetch(self, seconds: float, ok: bool):
+        self.fetched += 1
+        self.fetch_seconds += seconds
+        if not ok:
+            self.failed += 1
+
+    @property
+    def total_seconds(self) -> float:
+        return self.discover_seconds + self.fetch_seconds + self.feed_seconds
+
+
+def report_costs(costs: Iterable[LocaleCost]):
+    """打印各语言的开销"""
+    costs = list(costs)
+    print(f"\n{'语言':<8}{'发现':>6}{'抓取':>6}{'失败':>6}{'复用':>6}"
+          f"{'发现(s)':>10}{'抓取(s)':>10}{'feed(s)':>10}{'合计(s)':>10}")
+    for cost in costs:
+        print(f"{cost.locale:<8}{cost.discovered:>6}{cost.fetched:>6}{cost.failed:>6}{cost.shared:>6}"
+              f"{cost.discover_seconds:>10.1f}{cost.fetch_seconds:>10.1f}"
+              f"{cost.feed_seconds:>10.1f}{cost.total_seconds:>10.1f}")
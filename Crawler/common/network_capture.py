@@ -0,0 +1,182 @@
+"""
+DevTools 网络拦截
+通过 Chrome performance 日志记录页面自身的 JSON 接口响应（Binance 的 /bapi/ XHR），
+直接从结构化数据构造文章字段，省去渲染等待、DOM 解析和日期字符串解析
+"""
+import json
+import re
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional
+
+# Binance 前端数据接口
+API_URL_PATTERN = re.compile(r'binance\.com/bapi/')
+
+TITLE_KEYS = ('title', 'subject')
+BODY_KEYS = ('body', 'content', 'contentHtml', 'bodyHtml', 'htmlContent')
+AUTHOR_KEYS = ('authorName', 'author', 'nickName', 'creatorName', 'displayName')
+TIME_KEYS = ('publishTime', 'releaseDate', 'publishDate', 'postTime', 'createTime', 'date')
+
+
+def enable_performance_log(chrome_options):
+    """
+    打开 Chrome 的 performance 日志（包含 Network.* 事件）
+
+    Args:
+        chrome_options: selenium ChromeOptions
+    """
+    chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+
+def _iter_dicts(data) -> Iterator[Dict]:
+    """深度优先遍历 JSON 中的所有对象"""
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            yield node
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+
+
+def _first_value(record: Dict, keys) -> object:
+    for key in keys:
+        value = record.get(key)
+        if value not in (None, '', [], {}):
+            return value
+    return None
+
+
+def _format_timestamp(value) -> str:
+    """把接口中的毫秒/秒时间戳转成 ISO 字符串，字符串原样返回"""
+    if isinstance(value, (int, float)) or (isinstance(value, str) and value.isdigit()):
+        ts = float(value)
+        if ts > 1e11:  # 毫秒
+            ts /= 1000
+        return datetime.fromtimestamp(ts, tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    return str(value) if value else ''
+
+
+def _format_author(value) -> str:
+    if isinstance(value, dict):
+        value = _first_value(value, ('nickName', 'name', 'displayName', 'authorName'))
+    return str(value).strip() if value else ''
+
+
+def find_article_record(payloads: List[object]) -> Optional[Dict]:
+    """
+    在若干 JSON 响应中找出最像“文章详情”的对象
+
+    同时带有标题与正文字段的对象中，取正文最长的那个
+
+    Args:
+        payloads: 已解析的 JSON 响应列表
+
+    Returns:
+        文章对象，找不到返回 None
+    """
+    best = None
+    best_len = 0
+    for payload in payloads:
+        for record in _iter_dicts(payload):
+            title = _first_value(record, TITLE_KEYS)
+            body = _first_value(record, BODY_KEYS)
+            if not isinstance(title, str) or not isinstance(body, str):
+                continue
+            if len(body) > best_len:
+                best, best_len = record, len(body)
+    return best
+
+
+def article_from_record(record: Dict) -> Dict:
+    """
+    将接口中的文章对象转换为爬虫使用的文章字段
+
+    Returns:
+        包含 title, content, author, pub_date 的字典
+    """
+    return {
+        'title': str(_first_value(record, TITLE_KEYS) or '').strip(),
+        'content': str(_first_value(record, BODY_KEYS) or ''),
+        'author': _format_author(_first_value(record, AUTHOR_KEYS)),
+        'pub_date': _format_timestamp(_first_value(record, TIME_KEYS)),
+    }
+
+
+class NetworkCapture:
+    def __init__(self, driver, url_pattern=API_URL_PATTERN):
+        """
+        初始化网络拦截器（driver 需已通过 enable_performance_log 打开日志）
+
+        Args:
+            driver: Selenium WebDriver
+            url_pattern: 需要记录的接口 URL 正则
+        """
+        self.driver = driver
+        self.url_pattern = url_pattern
+        self._pending = {}  # requestId -> url
+        self.payloads = []
+
+    def reset(self):
+        """清空之前的日志与已记录的响应（导航到新页面前调用）"""
+        try:
+            self.driver.get_log('performance')
+        except Exception:
+            pass
+        self._pending = {}
+        self.payloads = []
+
+    def collect(self) -> int:
+        """
+        读取新的 performance 日志，取回已加载完成的 JSON 响应体
+
+        Returns:
+            本次新记录的响应数量
+        """
+        added = 0
+        for entry in self.driver.get_log('performance'):
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, ValueError):
+                continue
+            method = message.get('method')
+            params = message.get('params', {})
+
+            if method == 'Network.responseReceived':
+                response = params.get('response', {})
+                url = response.get('url', '')
+                if 'json' in response.get('mimeType', '') and self.url_pattern.search(url):
+                    self._pending[params.get('requestId')] = url
+            elif method == 'Network.loadingFinished' and params.get('requestId') in self._pending:
+                request_id = params['requestId']
+                self._pending.pop(request_id)
+                try:
+                    body = self.driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+                    self.payloads.append(json.loads(body.get('body', '')))
+                    added += 1
+                except Exception:
+                    # 响应体可能已被浏览器回收，或不是合法 JSON
+                    continue
+        return added
+
+    def wait_for_article(self, timeout: float = 10.0, poll_interval: float = 0.3) -> Optional[Dict]:
+        """
+        轮询日志，直到拿到文章详情 JSON
+
+        Args:
+            timeout: 最长等待秒数
+            poll_interval: 轮询间隔
+
+        Returns:
+            文章字段字典（title, content, author, pub_date），超时返回 None
+        """
+        deadline = time.time() + timeout
+        while True:
+            if self.collect():
+                record = find_article_record(self.payloads)
+                if record is not None:
+                    return article_from_record(record)
+            if time.time() >= deadline:
+                return None
+            time.sleep(poll_interval)
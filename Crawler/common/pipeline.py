@@ -0,0 +1,171 @@
+"""
+asyncio 爬取流水线
+发现 -> 详情抓取 -> 解析/清洗 -> 组装，各阶段之间用有界队列连接：
+阻塞的 WebDriver 调用放进专用线程执行器，CPU 密集的解析在另一个执行器中与网络等待重叠，
+队列满时上游自动等待（背压），SIGINT 时取消所有阶段并干净退出
+"""
+import asyncio
+import signal
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List
+
+# 队列结束标记
+_DONE = object()
+
+
+class CrawlPipeline:
+    def __init__(self,
+                 discover: Callable[[], Iterable[Dict]],
+                 fetch: Callable[[Dict], Any],
+                 extract: Callable[[Dict, Any], Dict],
+                 assemble: Callable[[List[Dict]], Any] = None,
+                 on_article: Callable[[int, Dict], None] = None,
+                 should_continue: Callable[[], bool] = None,
+                 queue_size: int = 4,
+                 fetch_workers: int = 1,
+                 extract_workers: int = 2):
+        """
+        初始化流水线
+
+        Args:
+            discover: 返回待抓取文章（字典）的可迭代对象，可以是生成器，逐条产出
+            fetch: 抓取单篇文章的阻塞函数，返回原始结果（如 FetchResult）
+            extract: 把原始结果解析进文章字典的函数，返回文章
+            assemble: 全部完成后对按发现顺序排列的文章调用（如生成 RSS）
+            on_article: 每篇文章解析完成时的回调 (发现序号, 文章)
+            should_continue: 每篇文章抓取前调用，返回 False 时不再发现和抓取（如时间预算用完），已抓取的照常解析
+            queue_size: 各阶段之间的队列容量（背压上限）
+            fetch_workers: 抓取并发数（发现与抓取共用这些线程；一个 WebDriver 不是线程安全的，通常为 1）
+            extract_workers: 解析并发数
+        """
+        self.discover = discover
+        self.fetch = fetch
+        self.extract = extract
+        self.assemble = assemble
+        self.on_article = on_article
+        self.should_continue = should_continue
+        self.queue_size = queue_size
+        self.fetch_workers = max(1, fetch_workers)
+        self.extract_workers = max(1, extract_workers)
+        self.assembled = None
+
+    def _continue(self) -> bool:
+        return self.should_continue is None or self.should_continue()
+
+    async def _discover_stage(self, loop, executor, out_queue: asyncio.Queue):
+        iterator = iter(await loop.run_in_executor(executor, self.discover))
+        index = 0
+        while self._continue():
+            item = await loop.run_in_executor(executor, next, iterator, _DONE)
+            if item is _DONE:
+                break
+            await out_queue.put((index, item))
+            index += 1
+        for _ in range(self.fetch_workers):
+            await out_queue.put(_DONE)
+
+    async def _fetch_stage(self, loop, executor, in_queue: asyncio.Queue, out_queue: asyncio.Queue):
+        while True:
+            entry = await in_queue.get()
+            if entry is _DONE:
+                return
+            index, item = entry
+            if not self._continue():
+                # 丢弃已排队但来不及抓取的文章
+                continue
+            try:
+                raw = await loop.run_in_executor(executor, self.fetch, item)
+            except Exception as e:
+                print(f"  [流水线] 抓取失败 {item.get('link', '')[:80]}: {e}")
+                raw = None
+            await out_queue.put((index, item, raw))
+
+    async def _extract_stage(self, loop, executor, in_queue: asyncio.Queue, results: Dict[int, Dict]):
+        while True:
+            entry = await in_queue.get()
+            if entry is _DONE:
+                # 把结束标记传给其他解析协程
+                await in_queue.put(_DONE)
+                return
+            index, item, raw = entry
+            try:
+                article = await loop.run_in_executor(executor, self.extract, item, raw)
+            except Exception as e:
+                print(f"  [流水线] 解析失败 {item.get('link', '')[:80]}: {e}")
+                article = item
+            results[index] = article
+            if self.on_article:
+                self.on_article(index, article)
+
+    async def run(self) -> List[Dict]:
+        """
+        运行流水线
+
+        Returns:
+            按发现顺序排列的文章列表
+        """
+        loop = asyncio.get_running_loop()
+        # 发现阶段同样可能使用浏览器，与抓取共用线程，保证同一时刻只有一个线程操作 WebDriver
+        fetch_executor = ThreadPoolExecutor(max_workers=self.fetch_workers, thread_name_prefix='pipeline-fetch')
+        extract_executor = ThreadPoolExecutor(max_workers=self.extract_workers, thread_name_prefix='pipeline-extract')
+        fetch_queue = asyncio.Queue(maxsize=self.queue_size)
+        extract_queue = asyncio.Queue(maxsize=self.queue_size)
+        results: Dict[int, Dict] = {}
+
+        async def fetchers():
+            await asyncio.gather(*(
+                self._fetch_stage(loop, fetch_executor, fetch_queue, extract_queue)
+                for _ in range(self.fetch_workers)
+            ))
+            await extract_queue.put(_DONE)
+
+        tasks = [
+            asyncio.ensure_future(self._discover_stage(loop, fetch_executor, fetch_queue)),
+            asyncio.ensure_future(fetchers()),
+        ] + [
+            asyncio.ensure_future(self._extract_stage(loop, extract_executor, extract_queue, results))
+            for _ in range(self.extract_workers)
+        ]
+        try:
+            await asyncio.gather(*tasks)
+            articles = [results[i] for i in sorted(results)]
+            if self.assemble:
+                self.assembled = await loop.run_in_executor(extract_executor, self.assemble, articles)
+            return articles
+        except asyncio.CancelledError:
+            print("\n[流水线] 已取消，正在停止各阶段...")
+            raise
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            fetch_executor.shutdown(wait=False, cancel_futures=True)
+            extract_executor.shutdown(wait=False, cancel_futures=True)
+
+    def run_sync(self) -> List[Dict]:
+        """
+        在新的事件循环中运行流水线，SIGINT 时取消并抛出 KeyboardInterrupt
+
+        Returns:
+            按发现顺序排列的文章列表
+        """
+        async def main():
+            task = asyncio.ensure_future(self.run())
+            loop = asyncio.get_running_loop()
+            try:
+                loop.add_signal_handler(signal.SIGINT, task.cancel)
+            except (NotImplementedError, RuntimeError):
+                # Windows 或非主线程：交给默认的 KeyboardInterrupt 处理
+                pass
+            try:
+                return await task
+            finally:
+                try:
+                    loop.remove_signal_handler(signal.SIGINT)
+                except (NotImplementedError, RuntimeError):
+                    pass
+
+        try:
+            return asyncio.run(main())
+        except asyncio.CancelledError:
+            raise KeyboardInterrupt
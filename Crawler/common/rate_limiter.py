@@ -0,0 +1,232 @@
+"""
+按主机的自适应限速器
+令牌桶 + AIMD：响应正常时逐步提高速率，遇到 429/403/验证码等拦截信号时成倍降速并冷却一段时间。
+顺序抓取、多标签页、HTTP 连接池和 asyncio 流水线共用同一个实例，
+取代各处写死的 time.sleep(1) 与 2 ** attempt 等待
+"""
+import asyncio
+import re
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+# 拦截页的标题特征
+_BLOCK_TITLE_PATTERN = re.compile(r'access denied|attention required|just a moment|captcha|verify you are human|403 forbidden|too many requests', re.I)
+# 拦截页通常很短，只有短页面才在全文中查找 captcha 字样（正常页面的 JS 里也可能出现）
+_BLOCK_PAGE_MAX_LEN = 20000
+
+
+class HostBudget:
+    def __init__(self, rate: float = 1.0, burst: int = 1,
+                 min_rate: float = 0.1, max_rate: float = 4.0,
+                 increase: float = 0.1, decrease: float = 0.5,
+                 cooldown: float = 30.0):
+        """
+        单个主机的速率预算
+
+        Args:
+            rate: 初始速率（请求/秒）
+            burst: 令牌桶容量（允许的突发请求数）
+            min_rate: 速率下限
+            max_rate: 速率上限
+            increase: 每次成功后增加的速率（加性增）
+            decrease: 被拦截时的速率乘数（乘性减）
+            cooldown: 被拦截后暂停请求的秒数（有 Retry-After 时以其为准）
+        """
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+
+
+class _Bucket:
+    def __init__(self, budget: HostBudget):
+        self.budget = budget
+        self.rate = budget.rate
+        self.tokens = float(budget.burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def refill(self, now: float):
+        self.tokens = min(float(self.budget.burst), self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now: float) -> float:
+        """拿到一个令牌还需等待的秒数"""
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        self.refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+def is_block_page(html: Optional[str]) -> bool:
+    """
+    判断页面是否为拦截页/验证码页
+
+    Args:
+        html: 页面源码
+
+    Returns:
+        是否为拦截页
+    """
+    if not html:
+        return False
+    title = re.search(r'<title[^>]*>(.*?)</title>', html[:5000], re.I | re.S)
+    if title and _BLOCK_TITLE_PATTERN.search(title.group(1)):
+        return True
+    return len(html) < _BLOCK_PAGE_MAX_LEN and 'captcha' in html.lower()
+
+
+def host_of(url: str) -> str:
+    return urlsplit(url).netloc or url
+
+
+class RateLimiter:
+    def __init__(self, budgets: Dict[str, HostBudget] = None, default: HostBudget = None):
+        """
+        初始化限速器
+
+        Args:
+            budgets: 主机名 -> 速率预算
+            default: 未单独配置的主机使用的预算
+        """
+        self.budgets = dict(budgets or {})
+        self.default = default or HostBudget()
+        self._buckets: Dict[str, _Bucket] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, budgets: Dict[str, HostBudget]):
+        """更新主机预算（已有主机保留当前速率与冷却，速率限制在新预算的上下限之间）"""
+        with self._lock:
+            self.budgets.update(budgets)
+            for host, budget in budgets.items():
+                bucket = self._buckets.get(host)
+                if bucket is not None:
+                    bucket.budget = budget
+                    bucket.rate = min(budget.max_rate, max(budget.min_rate, bucket.rate))
+                    bucket.tokens = min(bucket.tokens, float(budget.burst))
+
+    def _bucket(self, host: str) -> _Bucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = _Bucket(self.budgets.get(host, self.default))
+        return bucket
+
+    def _reserve(self, url: str) -> float:
+        """尝试取令牌；成功返回 0，否则返回需等待的秒数"""
+        with self._lock:
+            bucket = self._bucket(host_of(url))
+            now = time.monotonic()
+            wait = bucket.wait_time(now)
+            if wait <= 0:
+                bucket.tokens -= 1
+            return wait
+
+    def try_acquire(self, url: str) -> bool:
+        """非阻塞地取令牌"""
+        return self._reserve(url) <= 0
+
+    def acquire(self, url: str) -> float:
+        """
+        阻塞直到允许向该主机发请求
+
+        Returns:
+            实际等待的秒数
+        """
+        waited = 0.0
+        while True:
+            wait = self._reserve(url)
+            if wait <= 0:
+                return waited
+            time.sleep(wait)
+            waited += wait
+
+    async def acquire_async(self, url: str) -> float:
+        """acquire 的 asyncio 版本"""
+        waited = 0.0
+        while True:
+            wait = self._reserve(url)
+            if wait <= 0:
+                return waited
+            await asyncio.sleep(wait)
+            waited += wait
+
+    def success(self, url: str):
+        """响应正常：加性提高速率"""
+        with self._lock:
+            bucket = self._bucket(host_of(url))
+            bucket.rate = min(bucket.budget.max_rate, bucket.rate + bucket.budget.increase)
+
+    def failure(self, url: str):
+        """普通失败（超时、网络错误）：小幅降速，不冷却"""
+        with self._lock:
+            bucket = self._bucket(host_of(url))
+            bucket.rate = max(bucket.budget.min_rate, bucket.rate * (1 + bucket.budget.decrease) / 2)
+
+    def throttled(self, url: str, retry_after: float = None):
+        """
+        被限流或拦截（429/403/验证码）：成倍降速并暂停一段时间
+
+        Args:
+            url: 请求的 URL
+            retry_after: 服务器要求的等待秒数
+        """
+        host = host_of(url)
+        with self._lock:
+            bucket = self._bucket(host)
+            bucket.rate = max(bucket.budget.min_rate, bucket.rate * bucket.budget.decrease)
+            bucket.tokens = 0.0
+            pause = retry_after if retry_after is not None else bucket.budget.cooldown
+            bucket.blocked_until = max(bucket.blocked_until, time.monotonic() + pause)
+        print(f"  [限速] {host} 出现拦截信号，速率降为 {bucket.rate:.2f}/s，暂停 {pause:.1f}s")
+
+    def record_status(self, url: str, status_code: int, retry_after: float = None):
+        """根据 HTTP 状态码反馈"""
+        if status_code in (403, 429):
+            self.throttled(url, retry_after)
+        elif status_code >= 500:
+            self.failure(url)
+        else:
+            self.success(url)
+
+    def record_page(self, url: str, html: Optional[str]) -> bool:
+        """
+        根据浏览器取回的页面反馈
+
+        Returns:
+            页面是否为拦截页
+        """
+        if is_block_page(html):
+            self.throttled(url)
+            return True
+        self.success(url)
+        return False
+
+    def snapshot(self) -> Dict[str, float]:
+        """各主机当前速率"""
+        with self._lock:
+            return {host: bucket.rate for host, bucket in self._buckets.items()}
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """获取进程内共享的限速器"""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter()
+        return _limiter
+
+
+def configure(budgets: Dict[str, HostBudget]):
+    """配置共享限速器的主机预算"""
+    get_rate_limiter().configure(budgets)
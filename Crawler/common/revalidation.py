@@ -0,0 +1,164 @@
+"""
+文章复查
+为库中每篇文章记录正文指纹与上次检查时间：新文章检查得勤，旧文章的检查间隔随文章年龄指数增长，
+每次运行只复查预算内最该复查的几篇；指纹变化时更新正文并把文章顶到 feed 前面
+"""
+import hashlib
+import re
+import time
+from datetime import datetime, timezone
+from html import unescape
+from typing import Callable, Dict, Iterable, List, Optional
+
+from common.article_store import ArticleStore, has_content, parse_date, published_date
+
+HOUR = 3600.0
+DAY = 24 * HOUR
+
+
+def content_fingerprint(content: str) -> str:
+    """
+    正文指纹：去掉标签、合并空白后取 sha1，页面结构/类名变化不算修改
+
+    Args:
+        content: 正文（HTML 或纯文本）
+
+    Returns:
+        十六进制指纹，正文为空时为空字符串
+    """
+    text = unescape(re.sub(r'<[^>]+>', ' ', content or ''))
+    text = ' '.join(text.split())
+    if not text:
+        return ''
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat(timespec='seconds')
+
+
+def _timestamp(value: str) -> Optional[float]:
+    dt = parse_date(value or '')
+    return dt.timestamp() if dt else None
+
+
+class Revalidator:
+    def __init__(self, base_interval: float = 6 * HOUR, growth: float = 2.0, age_step: float = 7 * DAY,
+                 max_interval: float = 30 * DAY, budget: int = 5):
+        """
+        初始化复查调度
+
+        Args:
+            base_interval: 刚发布的文章的检查间隔（秒）
+            growth: 文章每老 age_step，检查间隔乘以该倍数
+            age_step: 间隔翻倍的文章年龄步长（秒）
+            max_interval: 检查间隔上限（秒）
+            budget: 每次运行最多复查的篇数
+        """
+        self.base_interval = base_interval
+        self.growth = growth
+        self.age_step = age_step
+        self.max_interval = max_interval
+        self.budget = budget
+
+    def interval(self, article: Dict, now: float = None) -> float:
+        """文章当前的检查间隔（秒），发布时间无法解析时取上限"""
+        now = now or time.time()
+        published = published_date(article)
+        if not published:
+            return self.max_interval
+        age = max(0.0, now - published.timestamp())
+        return min(self.max_interval, self.base_interval * self.growth ** (age / self.age_step))
+
+    def due(self, articles: Iterable[Dict], now: float = None) -> List[Dict]:
+        """
+        到期需要复查的文章，按超期程度（距上次检查的时间 / 检查间隔）从高到低，最多 budget 篇
+
+        Args:
+            articles: 文章（一般为文章库中的全部文章）
+            now: 当前时间戳
+        """
+        now = now or time.time()
+        scored = []
+        for article in articles:
+            if not has_content(article):
+                continue
+            checked = _timestamp(article.get('checked_at')) or 0.0
+            score = (now - checked) / self.interval(article, now)
+            if score >= 1:
+                scored.append((score, article))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [article for _, article in scored[:self.budget]]
+
+    def stamp(self, article: Dict, previous: Dict = None, now: float = None) -> bool:
+        """
+        给刚爬到的文章记录指纹与检查时间，与库中旧版本比较
+
+        Args:
+            article: 刚爬到的文章（需包含 content）
+            previous: 库中的旧版本
+            now: 当前时间戳
+
+        Returns:
+            正文是否有变化（有变化时 date 改为当前时间，原发布时间保存在 published）
+        """
+        now = now or time.time()
+        fingerprint = content_fingerprint(article.get('content', ''))
+        if not fingerprint:
+            return False
+        article['fingerprint'] = fingerprint
+        article['checked_at'] = _iso(now)
+        if not previous:
+            return False
+        if previous.get('published'):
+            # 之前被顶过的文章保留顶起后的时间
+            article['published'] = previous['published']
+            article['date'] = previous.get('date', '')
+        if not previous.get('fingerprint') or previous['fingerprint'] == fingerprint:
+            return False
+        article['published'] = previous.get('published') or previous.get('date') or previous.get('pub_date', '')
+        article['date'] = article['updated'] = _iso(now)
+        return True
+
+    def revalidate(self, store: ArticleStore, fetch: Callable[[str], str], now: float = None,
+                   deadline=None) -> int:
+        """
+        复查到期的文章，结果写回文章库（不保存）
+
+        Args:
+            store: 文章库
+            fetch: 抓取正文的函数，参数为链接，失败时返回空字符串
+            now: 当前时间戳
+            deadline: 运行时间预算（CrawlDeadline），时间不够时停止复查
+
+        Returns:
+            正文有变化的篇数
+        """
+        now = now or time.time()
+        due = self.due(store.articles.values(), now)
+        if not due:
+            return 0
+        print(f"复查 {len(due)} 篇旧文章...")
+        changed = 0
+        for previous in due:
+            if deadline and not deadline.can_fetch():
+                break
+            link = previous['link']
+            started = time.time()
+            try:
+                content = fetch(link)
+            except Exception as e:
+                print(f"  复查失败 {link[:80]}: {e}")
+                continue
+            if deadline:
+                deadline.observe(time.time() - started)
+            if not content:
+                # 抓取失败不更新检查时间，下次运行再试
+                continue
+            article = dict(previous, content=content)
+            if self.stamp(article, previous, now):
+                changed += 1
+                print(f"  [已修改] {previous.get('title', '')[:60]}")
+            store.upsert([article])
+        print(f"复查完成: {changed}/{len(due)} 篇有修改")
+        return changed
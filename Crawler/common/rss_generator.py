@@ -0,0 +1,265 @@
+"""
+RSS Feed生成器模块
+用于将爬取的文章生成RSS格式的feed（同时输出 Atom 与 JSON Feed），各来源共用
+"""
+from typing import Callable, List, Dict, Iterable, Optional
+from datetime import datetime
+from datetime import timezone
+import copy
+import io
+import os
+from urllib.parse import urljoin
+
+from common.article import Article, parse_date
+from common.feed_formats import (FORMATS, FeedEntry, FeedMeta, content_html, output_paths,
+                                 write_feeds, WRITERS)
+
+
+def archive_path(output_file: str, page: int) -> str:
+    """
+    第 page 个归档页的 RSS 路径（与当前 feed 同目录）：binance_blog_feed.xml -> binance_blog_feed-archive-3.xml
+
+    Args:
+        output_file: 当前 feed 的 RSS 路径
+        page: 页码（从 1 开始，1 为最早的一页）
+    """
+    base, ext = os.path.splitext(output_file)
+    return f'{base}-archive-{page}{ext}'
+
+
+def _link_base(path: str) -> str:
+    """分页链接：同目录下的文件名（不含扩展名）"""
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+class RSSGenerator:
+    def __init__(self, 
+                 feed_title: str = "Binance Blog",
+                 feed_description: str = "Latest articles from Binance Blog",
+                 feed_link: str = "https://www.binance.com/en/blog",
+                 feed_language: str = "en",
+                 feed_url: Optional[str] = None,
+                 default_author: str = "Binance Blog",
+                 generator: str = "Binance Blog RSS Generator",
+                 hub: Optional[str] = None):
+        """
+        初始化RSS生成器
+        
+        Args:
+            feed_title: Feed标题
+            feed_description: Feed描述
+            feed_link: Feed链接
+            feed_language: Feed语言
+            feed_url: Feed发布地址（不含扩展名），写入 Atom/JSON Feed 的自引用链接
+            default_author: 文章没有作者时使用的作者
+            generator: 生成器名称
+            hub: WebSub hub 地址，写入各格式的 hub 链接（归档页内容不再变化，不写）
+        """
+        self.meta = FeedMeta(title=feed_title, description=feed_description, link=feed_link,
+                             language=feed_language, generator=generator, feed_url=feed_url, hub=hub)
+        self.default_author = default_author
+        self.entries: List[FeedEntry] = []
+    
+    def parse_date(self, date_str: str, fallback: datetime = None) -> datetime:
+        """
+        解析日期字符串为datetime对象
+        
+        Args:
+            date_str: 日期字符串
+            fallback: 解析失败时使用的时间，None 表示当前时间
+            
+        Returns:
+            datetime对象，如果解析失败则返回 fallback（默认当前时间）
+        """
+        dt = parse_date(date_str)
+        if dt:
+            return dt
+        if not date_str:
+            return fallback or datetime.now(timezone.utc)
+        
+        # 如果都失败了，返回当前时间
+        if fallback:
+            return fallback
+        print(f"无法解析日期: {date_str}, 使用当前时间")
+        return datetime.now(timezone.utc)
+    
+    def make_entry(self, article: Dict, load_content: Callable[[Dict], str] = None,
+                   fallback_date: datetime = None) -> FeedEntry:
+        """
+        把一篇文章转换成三种格式共用的条目（正文只清理一次）
+        
+        Args:
+            article: 文章（Article，或包含 title, link, date, description, content 等的字典）
+            load_content: 读取正文的函数（如 ArticleStore.content），None 表示取 article.content
+            fallback_date: 日期无法解析时使用的时间，None 表示当前时间
+        """
+        article = Article.coerce(article)
+        raw = (load_content(article) if load_content else article.content) or ''
+        content = content_html(raw)
+        
+        # 描述（短摘要；完整正文在 content:encoded 中）
+        description = article.description or ''
+        if not description:
+            # 若正文是 HTML，只取前 500 字符做摘要（可能含标签）
+            description = raw[:500] + '...' if len(raw) > 500 else raw
+        
+        # 发布时间；正文修改过的文章 date 为修改时间，原发布时间在 published
+        date = article.updated_at or self.parse_date(article.date or article.pub_date or '', fallback_date)
+        published = article.published_at if article.published else date
+        
+        return FeedEntry(
+            # GUID（来源提供的优先，否则与参考一致用 isPermaLink="false" 的 hash）
+            id=article.item_guid,
+            title=article.title or 'Untitled',
+            link=article.link or '',
+            date=published or fallback_date or date,
+            updated=date,
+            description=description,
+            content=content,
+            author=article.author or self.default_author,
+            category=article.category or '',
+        )
+    
+    def add_article(self, article: Dict):
+        """
+        添加一篇文章到feed
+        
+        Args:
+            article: 文章（Article 或字典）
+        """
+        self.entries.append(self.make_entry(article))
+    
+    def generate_rss(self, articles: List[Dict], output_file: str,
+                     formats: Iterable[str] = FORMATS, load_content: Callable[[Dict], str] = None,
+                     links: Dict[str, str] = None) -> str:
+        """
+        生成feed文件：RSS 写到 output_file，Atom/JSON Feed 写在同一目录（.atom/.json）
+        
+        Args:
+            articles: 文章列表
+            output_file: RSS 输出文件路径
+            formats: 要输出的格式
+            load_content: 读取正文的函数，正文在写出每个条目时才读取，写完即可释放
+            links: RFC 5005 分页链接（rel -> 不含扩展名的地址），见 generate_archived
+            
+        Returns:
+            RSS 输出文件路径
+        """
+        print(f"正在生成RSS feed，包含 {len(articles)} 篇文章...")
+        
+        # 按日期排序（最新的在前，日期无法解析的排在最前面）
+        now = datetime.now(timezone.utc)
+        sorted_articles = sorted(
+            map(Article.coerce, articles),
+            key=lambda x: x.updated_at or now,
+            reverse=True
+        )
+        
+        # RSS、Atom、JSON Feed 一次遍历写出，条目边生成边写
+        entries = (self.make_entry(article, load_content) for article in sorted_articles)
+        meta = self.meta
+        if links:
+            meta = copy.copy(self.meta)
+            meta.links = links
+        paths = write_feeds(meta, entries, output_paths(output_file, formats))
+        for path in paths.values():
+            print(f"feed已生成: {path}")
+        
+        return paths.get('rss', output_file)
+    
+    def generate_archived(self, articles: List[Dict], output_file: str, feed_size: int, page_size: int,
+                          formats: Iterable[str] = FORMATS,
+                          load_content: Callable[[Dict], str] = None) -> Dict[int, str]:
+        """
+        生成 RFC 5005 的归档 feed：output_file 只放最新的 feed_size 篇，
+        更早的文章按归档顺序每 page_size 篇一页写到 archive_path(output_file, 页码)，
+        各页之间用 prev-archive / next-archive 链接，当前 feed 的 prev-archive 指向最新的归档页
+        
+        文章离开当前 feed 时获得一个递增的归档序号（archive_seq，写回文章，需要保存文章库），
+        页码由序号决定，写满的页不再变化；已归档的文章即使复查后修改时间变新也不再回到当前 feed
+        （否则会同时出现在当前 feed 与归档页中）。每次运行只重写当前 feed 与有新文章加入的最新归档页，
+        新开一页时前一页再重写一次补上 next-archive，此外只补写缺失的页。
+        归档页的生成时间与无法解析的日期取自文章的归档时间，同样的内容重写后字节不变
+        
+        Args:
+            articles: 全部文章（一般为文章库中的全部文章，需为 Article，归档序号写回文章）
+            output_file: 当前 feed 的 RSS 路径
+            feed_size: 当前 feed 的文章数
+            page_size: 每个归档页的文章数
+            formats: 要输出的格式
+            load_content: 读取正文的函数
+            
+        Returns:
+            本次写出的归档页码 -> RSS 路径
+        """
+        oldest = datetime.min.replace(tzinfo=timezone.utc)
+        articles = [Article.coerce(a) for a in articles]
+        
+        def published(article: Article) -> datetime:
+            return article.published_at or oldest
+        
+        current = sorted((a for a in articles if not a.get('archive_seq')),
+                         key=lambda a: a.updated_at or oldest, reverse=True)[:feed_size]
+        current_links = {a.get('link') for a in current}
+        
+        # 离开当前 feed 的文章按原发布时间从旧到新编入归档
+        next_seq = max((a.get('archive_seq', 0) for a in articles), default=0) + 1
+        fresh = sorted((a for a in articles if a.get('link') not in current_links and not a.get('archive_seq')),
+                       key=published)
+        archived_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        for article in fresh:
+            article['archive_seq'] = next_seq
+            article['archived_at'] = archived_at
+            next_seq += 1
+        
+        pages: Dict[int, List[Dict]] = {}
+        for article in articles:
+            if article.get('archive_seq'):
+                pages.setdefault((article['archive_seq'] - 1) // page_size + 1, []).append(article)
+        last = max(pages, default=0)
+        
+        to_write = {(a['archive_seq'] - 1) // page_size + 1 for a in fresh}
+        missing = {page for page in pages
+                   if not all(map(os.path.exists, output_paths(archive_path(output_file, page), formats).values()))}
+        to_write |= missing
+        # 新开的页需要前一页补上 next-archive
+        to_write |= {page - 1 for page in missing if page - 1 in pages}
+        
+        written = {}
+        for page in sorted(to_write):
+            members = sorted(pages[page], key=lambda a: a['archive_seq'], reverse=True)
+            built = max(parse_date(a.archived_at or '') or oldest for a in members)
+            meta = copy.copy(self.meta)
+            meta.archive = True
+            meta.hub = None
+            if meta.feed_url:
+                # 归档页与当前 feed 同目录，自引用链接换成归档页自己的
+                meta.feed_url = urljoin(meta.feed_url, _link_base(archive_path(output_file, page)))
+            meta.links = {'current': _link_base(output_file)}
+            if page > 1:
+                meta.links['prev-archive'] = _link_base(archive_path(output_file, page - 1))
+            if page < last:
+                meta.links['next-archive'] = _link_base(archive_path(output_file, page + 1))
+            entries = (self.make_entry(article, load_content, built) for article in members)
+            paths = write_feeds(meta, entries, output_paths(archive_path(output_file, page), formats), built)
+            written[page] = paths.get('rss')
+        if written:
+            print(f"归档页已更新: {', '.join(str(page) for page in written)}（共 {last} 页）")
+        
+        links = {'prev-archive': _link_base(archive_path(output_file, last))} if last else None
+        self.generate_rss(current, output_file, formats, load_content, links)
+        return written
+    
+    def get_rss_string(self) -> str:
+        """
+        获取 add_article 添加的条目的RSS字符串（用于直接输出或通过API返回）
+        
+        Returns:
+            RSS XML字符串
+        """
+        out = io.StringIO()
+        writer = WRITERS['rss'](out, self.meta, datetime.now(timezone.utc))
+        for entry in self.entries:
+            writer.entry(entry)
+        writer.close()
+        return out.getvalue()
@@ -0,0 +1,486 @@
+"""
+来源运行流程
+各来源的 main.py 只保留配置，爬取一次的完整流程（断点续爬、文章库、复查、生成 feed 与子 feed）在这里统一实现
+"""
+import copy
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence
+
+from common.article import Article
+from common.article_store import ArticleStore
+from common.body_store import BodyStore
+from common.checkpoint import CheckpointJournal
+from common.deadline import CrawlDeadline, newest_first
+from common.feed_index import Tagger, TagIndex, write_sub_feeds
+from common.locales import LocaleCost, group_by_content, localize, report_costs, share_metadata
+from common.revalidation import Revalidator
+from common.websub import WebSubState, topic_url
+
+
+class SourceConfig:
+    def __init__(self, name: str, output_file: str, checkpoint_file: str, store_file: str,
+                 feed_title: str, feed_description: str, feed_link: str, default_author: str,
+                 generator: str = '', max_articles: int = 30, feed_size: int = 30,
+                 backfill_max_articles: int = None, fetch_content: bool = True,
+                 use_pipeline: bool = False, resume: bool = True, time_budget: float = 25 * 60,
+                 feed_reserve: float = 60, revalidate_budget: int = 5,
+                 sub_feeds: Dict[str, Sequence[str]] = None, sub_feed_dir: str = None,
+                 sub_feed_size: int = 30, topics: Dict[str, str] = None, language: str = 'en',
+                 body_dir: str = None, body_retention: int = None, body_dictionary: bool = True,
+                 archive_page_size: int = None, feed_base_url: str = None, websub_hub: str = None,
+                 websub_state_file: str = None, locale_tabs: int = 3):
+        """
+        一个来源的运行配置
+
+        Args:
+            name: 来源名
+            output_file: RSS 输出路径（Atom/JSON Feed 写在同一目录）
+            checkpoint_file: 断点日志路径
+            store_file: 文章库路径
+            feed_title: feed 标题
+            feed_description: feed 描述
+            feed_link: feed 链接
+            default_author: 文章没有作者时使用的作者
+            generator: 生成器名称
+            max_articles: 单次运行最多爬取的新文章数量
+            feed_size: feed 中的文章数量（取文章库中最新的）
+            backfill_max_articles: 回填历史时最多爬取的文章数量，默认与 max_articles 相同
+            fetch_content: 是否获取文章详细内容
+            use_pipeline: 使用 asyncio 流水线
+            resume: 从断点日志续爬
+            time_budget: 单次运行的时间预算（秒）
+            feed_reserve: 为生成 feed 预留的秒数
+            revalidate_budget: 每次运行最多复查的旧文章数
+            sub_feeds: 子 feed 名 -> 标签列表
+            sub_feed_dir: 子 feed 输出目录
+            sub_feed_size: 每个子 feed 的文章数量
+            topics: 话题关键词，None 使用默认
+            language: feed 的语言
+            body_dir: 正文存储目录（见 common.body_store），None 表示正文直接写在文章库 JSON 里
+            body_retention: 只保留最新的这么多篇文章的正文，None 表示全部保留
+            body_dictionary: 正文够多时训练 zstd 字典并用它压缩
+            archive_page_size: 每个 RFC 5005 归档页的文章数，None 表示不归档（feed 只有最新的 feed_size 篇）
+            feed_base_url: feed 发布后的地址（对应 output_file 所在目录），用于自引用链接与 WebSub 通知
+            websub_hub: WebSub hub 地址，与 feed_base_url 都配置时 feed 中写入 hub 链接并记录有变化的 feed
+            websub_state_file: 各 feed 的条目摘要与待通知地址，默认放在断点日志旁（<name>_websub.json）
+            locale_tabs: 多语言运行时抓取正文的标签页数（各语言的文章在同一个标签页池里并发抓取，
+                来源自己的 tabs 更大时以 tabs 为准）
+        """
+        self.name = name
+        self.output_file = output_file
+        self.checkpoint_file = checkpoint_file
+        self.store_file = store_file
+        self.feed_title = feed_title
+        self.feed_description = feed_description
+        self.feed_link = feed_link
+        self.default_author = default_author
+        self.generator = generator or f'{feed_title} RSS Generator'
+        self.max_articles = max_articles
+        self.feed_size = feed_size
+        self.backfill_max_articles = backfill_max_articles or max_articles
+        self.fetch_content = fetch_content
+        self.use_pipeline = use_pipeline
+        self.resume = resume
+        self.time_budget = time_budget
+        self.feed_reserve = feed_reserve
+        self.revalidate_budget = revalidate_budget
+        self.sub_feeds = sub_feeds or {}
+        self.sub_feed_dir = sub_feed_dir or os.path.join(os.path.dirname(output_file), f'{name}_tags')
+        self.sub_feed_size = sub_feed_size
+        self.topics = topics
+        self.language = language
+        self.body_dir = body_dir
+        self.body_retention = body_retention
+        self.body_dictionary = body_dictionary
+        self.archive_page_size = archive_page_size
+        self.feed_base_url = feed_base_url or None
+        self.websub_hub = websub_hub or None
+        self.locale_tabs = locale_tabs
+        self.websub_state_file = websub_state_file or os.path.join(os.path.dirname(checkpoint_file),
+                                                                   f'{name}_websub.json')
+
+    def open_store(self) -> ArticleStore:
+        """打开文章库（配置了 body_dir 时正文放在正文存储里）"""
+        bodies = BodyStore(self.body_dir, use_dictionary=self.body_dictionary) if self.body_dir else None
+        return ArticleStore(self.store_file, bodies=bodies, body_retention=self.body_retention)
+
+    def open_websub(self) -> Optional[WebSubState]:
+        """打开 WebSub 状态，没有配置 hub 或发布地址时返回 None"""
+        if not (self.websub_hub and self.feed_base_url):
+            return None
+        return WebSubState(self.websub_state_file, self.feed_base_url, os.path.dirname(self.output_file))
+
+    def feed_url(self, output_file: str) -> Optional[str]:
+        """feed 文件发布后的地址（不含扩展名），没有配置发布地址时返回 None"""
+        if not self.feed_base_url:
+            return None
+        return os.path.splitext(topic_url(self.feed_base_url, os.path.dirname(self.output_file), output_file))[0]
+
+    def for_locale(self, locale: str) -> 'SourceConfig':
+        """
+        某个语言的配置：feed、文章库、子 feed 目录加上语言后缀，链接换成该语言的
+        （与 self.language 相同的语言沿用原路径，已发布的 feed 地址不变；断点日志各语言共用）
+
+        Args:
+            locale: 语言，如 'zh-CN'
+        """
+        config = copy.copy(self)
+        if locale == self.language:
+            return config
+
+        def suffixed(path: str) -> str:
+            base, ext = os.path.splitext(path)
+            return f'{base}_{locale}{ext}'
+
+        config.name = f'{self.name}-{locale}'
+        config.language = locale
+        config.output_file = suffixed(self.output_file)
+        config.store_file = suffixed(self.store_file)
+        config.sub_feed_dir = suffixed(self.sub_feed_dir)
+        config.body_dir = self.body_dir and f'{self.body_dir}_{locale}'
+        config.websub_state_file = suffixed(self.websub_state_file)
+        config.feed_link = localize(self.feed_link, locale)
+        config.feed_title = f'{self.feed_title} ({locale})'
+        return config
+
+
+def generate_feed(config: SourceConfig, articles: List[Dict], output_file: str = None,
+                  feed_title: str = None, store: ArticleStore = None, websub: WebSubState = None) -> str:
+    """
+    生成 feed（RSS、Atom、JSON Feed）
+
+    Args:
+        config: 来源配置
+        articles: 文章列表
+        output_file: RSS 输出路径，默认 config.output_file
+        feed_title: feed 标题，默认 config.feed_title
+        store: 文章所在的文章库，正文在写出时从它的正文存储中逐篇读取
+        websub: WebSub 状态，条目有变化时记下这个 feed 待通知
+
+    Returns:
+        RSS 输出路径
+    """
+    output_file = output_file or config.output_file
+    path = _rss_generator(config, output_file, feed_title).generate_rss(
+        articles, output_file, load_content=store.content if store is not None else None)
+    if websub is not None:
+        websub.record(output_file, articles)
+    return path
+
+
+def _rss_generator(config: SourceConfig, output_file: str, feed_title: str = None):
+    from common.rss_generator import RSSGenerator
+    return RSSGenerator(
+        feed_title=feed_title or config.feed_title,
+        feed_description=config.feed_description,
+        feed_link=config.feed_link,
+        feed_language=config.language,
+        feed_url=config.feed_url(output_file),
+        default_author=config.default_author,
+        generator=config.generator,
+        hub=config.websub_hub if config.feed_base_url else None,
+    )
+
+
+def publish_store(config: SourceConfig, store: ArticleStore, websub: WebSubState = None) -> str:
+    """
+    用文章库生成主 feed：最新的 config.feed_size 篇，配置了 archive_page_size 时更早的文章写进归档页
+    （归档序号写回文章，调用后需要保存文章库）
+
+    Returns:
+        RSS 输出路径
+    """
+    if not config.archive_page_size:
+        return generate_feed(config, store.newest(config.feed_size), store=store, websub=websub)
+    _rss_generator(config, config.output_file).generate_archived(
+        store.newest(), config.output_file, config.feed_size, config.archive_page_size, load_content=store.content)
+    if websub is not None:
+        # 归档页内容不再变化，只有当前 feed 需要通知
+        websub.record(config.output_file, store.newest(config.feed_size))
+    return config.output_file
+
+
+def generate_sub_feeds(config: SourceConfig, store: ArticleStore, websub: WebSubState = None) -> Dict[str, str]:
+    """
+    按 config.sub_feeds 从文章库生成子 feed（标签缓存在文章上，调用后需要保存文章库）
+
+    Returns:
+        子 feed 名 -> RSS 文件路径
+    """
+    if not config.sub_feeds:
+        return {}
+    index = TagIndex(store.newest(), Tagger(config.topics), store.content)
+    return write_sub_feeds(index, config.sub_feeds, config.sub_feed_dir,
+                           lambda articles, path, name: generate_feed(config, articles, path,
+                                                                      f"{config.feed_title}: {name}", store, websub),
+                           limit=config.sub_feed_size)
+
+
+def publish_partial(config: SourceConfig) -> bool:
+    """
+    不爬取，直接用文章库加上断点日志中已完成的文章发布 feed
+
+    Returns:
+        是否生成了 feed
+    """
+    journal = CheckpointJournal(config.checkpoint_file)
+    store = config.open_store()
+    # 多语言运行的断点日志中各语言的文章混在一起，只取本语言的
+    partial = [a for a in journal.load() if a.get('locale', config.language) == config.language]
+    store.upsert(partial)
+    if not len(store):
+        print("断点日志为空，没有可发布的文章")
+        return False
+    websub = config.open_websub()
+    output_path = publish_store(config, store, websub)
+    if config.archive_page_size:
+        # 归档序号已经写进了归档页，要与文章库保持一致
+        store.save()
+    _save_websub(config, websub)
+    print(f"[OK] 已用断点日志中的 {len(partial)} 篇文章生成 feed: {output_path}")
+    return True
+
+
+def _save_websub(config: SourceConfig, websub: Optional[WebSubState]):
+    if websub is None:
+        return
+    websub.save()
+    if websub.pending:
+        print(f"[{config.name}] WebSub: {len(websub.pending)} 个 feed 地址待通知（发布后调用 notify_hub）")
+
+
+def notify_hub(config: SourceConfig) -> bool:
+    """
+    通知 WebSub hub 有变化的 feed（feed 已经可以从 feed_base_url 访问之后调用；失败的地址留到下次）
+
+    Returns:
+        是否全部通知成功（没有配置 hub 或没有待通知的地址时为 True）
+    """
+    websub = config.open_websub()
+    if websub is None or not websub.pending:
+        return True
+    print(f"[{config.name}] WebSub: 通知 {config.websub_hub}（{len(websub.pending)} 个地址）")
+    return websub.flush(config.websub_hub)
+
+
+def _crawl_inputs(store: ArticleStore, resumed: List[Dict], backfill: bool):
+    """
+    由文章库与断点日志得到发现阶段的参数
+
+    Returns:
+        (要跳过的链接, 已有文章的 lastmod, 水位线)
+    """
+    skip_links = {article['link'] for article in resumed} | store.completed_links()
+    # sitemap 模式下 lastmod 有更新的已有文章会重新抓取
+    known_lastmod = store.lastmods()
+    known_lastmod.update({article['link']: article.get('lastmod', '') for article in resumed})
+    # 水位线：文章库中最新文章的发布时间，列表页遍历到更早的文章即停止
+    watermark = None if backfill else store.watermark()
+    return skip_links, known_lastmod, watermark
+
+
+def _publish(config: SourceConfig, store: ArticleStore, articles: List[Dict], fetch_content: Callable,
+             deadline: CrawlDeadline, revalidate: bool = True) -> bool:
+    """
+    把本次爬到的文章写入文章库（记录指纹、复查旧文章），再生成 feed 与子 feed
+
+    Args:
+        config: 来源配置
+        store: 文章库
+        articles: 本次爬到的文章（含断点日志中恢复的）
+        fetch_content: 复查时抓取正文的函数 (链接) -> 正文
+        deadline: 时间预算
+        revalidate: 是否复查旧文章
+
+    Returns:
+        是否生成了 feed
+    """
+    tag = f"[{config.name}]"
+    # 记录正文指纹；与库中旧版本相比有修改的文章顶到 feed 前面
+    revalidator = Revalidator(budget=config.revalidate_budget)
+    for article in articles:
+        revalidator.stamp(article, store.get(article['link']))
+    added = store.upsert(articles)
+    if revalidate and config.fetch_content:
+        revalidator.revalidate(store, fetch_content, deadline=deadline)
+    store.save()
+    if not len(store):
+        print(f"{tag} 错误: 未获取到任何文章")
+        return False
+
+    print(f"{tag} [OK] 成功爬取 {len(articles)} 篇文章（新增 {added} 篇，文章库共 {len(store)} 篇）")
+    articles = store.newest(config.feed_size)
+
+    print(f"\n{tag} 生成 feed...")
+    websub = config.open_websub()
+    output_path = publish_store(config, store, websub)
+    generate_sub_feeds(config, store, websub)
+    store.save()
+    _save_websub(config, websub)
+    print(f"{tag} [OK] RSS feed 已生成: {os.path.abspath(output_path)}")
+
+    print(f"\n{tag} 文章列表:")
+    for i, article in enumerate(articles[:5], 1):  # 只显示前5篇
+        print(f"  {i}. {article['title'][:60]}...")
+    if len(articles) > 5:
+        print(f"  ... 还有 {len(articles) - 5} 篇文章")
+    return True
+
+
+def run_source(config: SourceConfig, create_source: Callable, source=None, backfill: bool = False,
+               time_budget: float = None) -> bool:
+    """
+    爬取一次并生成 feed
+
+    Args:
+        config: 来源配置
+        create_source: 创建来源的函数，参数为 deadline
+        source: 已创建的来源（守护进程中跨轮次复用），None 表示用 create_source 新建
+        backfill: 忽略水位线，一直翻页回填历史文章
+        time_budget: 本次运行的时间预算（秒），默认 config.time_budget
+
+    Returns:
+        是否生成了 feed
+    """
+    deadline = CrawlDeadline(time_budget or config.time_budget, reserve=config.feed_reserve)
+    journal = CheckpointJournal(config.checkpoint_file)
+    store = config.open_store()
+    max_articles = config.backfill_max_articles if backfill else config.max_articles
+    tag = f"[{config.name}]"
+    try:
+        # 1. 爬取文章
+        print(f"\n{tag} [步骤 1/2] 爬取文章...")
+        if source is None:
+            source = create_source(deadline)
+        else:
+            source.deadline = deadline
+
+        # 断点续爬：恢复上次已完成的文章
+        articles = journal.load() if config.resume else []
+        if not config.resume:
+            journal.clear()
+        if articles:
+            print(f"{tag} 从断点日志恢复 {len(articles)} 篇文章")
+        skip_links, known_lastmod, watermark = _crawl_inputs(store, articles, backfill)
+        if watermark:
+            print(f"{tag} 水位线: {watermark:%Y-%m-%d %H:%M}")
+
+        def checkpoint(article):
+            # 只记录拿到了正文的文章，失败的下次续爬时重试
+            if article.get('content'):
+                journal.append(article)
+
+        if config.use_pipeline and config.fetch_content:
+            articles.extend(source.crawl_pipeline(
+                max_articles=max_articles, skip_links=skip_links, on_article=checkpoint,
+                known_lastmod=known_lastmod, watermark=watermark
+            ))
+        else:
+            for article in source.iter_crawl(max_articles=max_articles, fetch_content=config.fetch_content,
+                                             skip_links=skip_links, known_lastmod=known_lastmod,
+                                             watermark=watermark):
+                checkpoint(article)
+                articles.append(article)
+
+        # 2. 生成 feed
+        print(f"\n{tag} [步骤 2/2] 更新文章库并生成 feed...")
+        if not _publish(config, store, articles, source.fetch_content, deadline):
+            return False
+        journal.clear()
+        return True
+    finally:
+        deadline.report()
+
+
+def run_locales(config: SourceConfig, locales: Sequence[str], create_source: Callable,
+                backfill: bool = False, time_budget: float = None) -> bool:
+    """
+    多语言爬取一次：每个语言各发现一次，按 content ID 分组后在同一个浏览器/标签页池里统一抓取正文，
+    每个语言生成自己的 feed（第一个语言以外的 feed、文章库带语言后缀，见 SourceConfig.for_locale）
+
+    Args:
+        config: 来源配置（config.language 的 feed 沿用原路径）
+        locales: 语言列表，如 ['en', 'zh-CN']，第一个为主语言（组内元数据优先取它的）
+        create_source: 创建来源的函数，参数为 (deadline, 语言)
+        backfill: 忽略水位线，一直翻页回填历史文章
+        time_budget: 本次运行的时间预算（秒），默认 config.time_budget
+
+    Returns:
+        是否所有语言都生成了 feed
+    """
+    deadline = CrawlDeadline(time_budget or config.time_budget, reserve=config.feed_reserve)
+    journal = CheckpointJournal(config.checkpoint_file)
+    configs = {locale: config.for_locale(locale) for locale in locales}
+    stores = {locale: configs[locale].open_store() for locale in locales}
+    costs = {locale: LocaleCost(locale) for locale in locales}
+    max_articles = config.backfill_max_articles if backfill else config.max_articles
+    tag = f"[{config.name}]"
+    try:
+        print(f"\n{tag} [步骤 1/3] 发现文章（{', '.join(locales)}）...")
+        sources = {locale: create_source(deadline, locale) for locale in locales}
+        resumed = journal.load() if config.resume else []
+        if not config.resume:
+            journal.clear()
+        if resumed:
+            print(f"{tag} 从断点日志恢复 {len(resumed)} 篇文章")
+        crawled = {locale: [a for a in resumed if a.get('locale', locales[0]) == locale] for locale in locales}
+
+        def discover(locale: str) -> List[Dict]:
+            started = time.time()
+            skip_links, known_lastmod, watermark = _crawl_inputs(stores[locale], crawled[locale], backfill)
+            found = sources[locale].discover(max_articles, skip_links, known_lastmod, watermark)
+            costs[locale].discover_seconds = time.time() - started
+            costs[locale].discovered = len(found)
+            return found
+
+        # 列表页渲染在浏览器锁内依次进行，sitemap/RSS 等 HTTP 发现可以并行
+        with ThreadPoolExecutor(max_workers=len(locales)) as executor:
+            discovered = dict(zip(locales, executor.map(discover, locales)))
+        groups = group_by_content(discovered)
+        print(f"{tag} 发现 {sum(map(len, discovered.values()))} 篇，按 content ID 分为 {len(groups)} 组")
+
+        # 2. 抓取正文：多个语言指向同一链接时只抓一次；所有语言的文章进同一个抓取队列，
+        #    在共享标签页池里并发抓取（至少 config.locale_tabs 个标签页）
+        print(f"\n{tag} [步骤 2/3] 抓取正文...")
+        by_link: Dict[str, List[Article]] = {}
+        for group in groups.values():
+            for article in group.values():
+                by_link.setdefault(article.canonical_link, []).append(article)
+        queue = newest_first([same[0] for same in by_link.values()])
+        fetcher = sources[locales[0]]
+        tabs = max(fetcher.tabs, config.locale_tabs if len(locales) > 1 else 1)
+        last = time.time()
+        for article in fetcher.iter_article_details(queue, config.fetch_content, tabs=tabs):
+            now = time.time()
+            if config.fetch_content:
+                costs[article['locale']].add_fetch(now - last, bool(article.get('content')))
+            last = now
+            same_page = by_link[article.canonical_link]
+            for other in same_page[1:]:
+                for key, value in article.items():
+                    if key not in ('locale', 'content_id'):
+                        other[key] = value
+                costs[other['locale']].shared += 1
+            for same in same_page:
+                crawled[same['locale']].append(same)
+                if same.get('content'):
+                    journal.append(same)
+        for group in groups.values():
+            share_metadata(group)
+
+        # 3. 各语言分别更新文章库并生成 feed（只复查主语言的旧文章）
+        print(f"\n{tag} [步骤 3/3] 生成各语言的 feed...")
+        ok = True
+        for locale in locales:
+            started = time.time()
+            ok = _publish(configs[locale], stores[locale], crawled[locale], fetcher.fetch_content, deadline,
+                          revalidate=locale == locales[0]) and ok
+            costs[locale].feed_seconds = time.time() - started
+        if ok:
+            journal.clear()
+        report_costs(costs.values())
+        return ok
+    finally:
+        deadline.report()
@@ -0,0 +1,144 @@
+"""
+共享运行时
+所有来源共用一个浏览器、HTTP 连接池、限速器与熔断器：
+同一进程里同时运行多个来源时只启动一个 Chrome，按主机的限速预算也是全局的；
+浏览器一次只能被一个来源操作，页面加载在锁内串行，发现、解析、生成 feed 等步骤可以与之重叠；
+页面解析放在共享的进程池里（common.extraction），不占用驱动浏览器的线程
+"""
+import threading
+from typing import Optional
+
+from common.browser_profile import apply_profile, default_profile_dir, prune_profile
+from common.fetch_result import get_circuit_breaker
+from common.http_client import get_client
+from common.rate_limiter import get_rate_limiter
+
+USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+
+
+class Browser:
+    def __init__(self, profile_dir: str = None, cache_size_mb: int = 200, capture_api: bool = False):
+        """
+        共享的无头 Chrome，第一次使用时才启动
+
+        Args:
+            profile_dir: 持久化的浏览器配置目录（含磁盘缓存），None 表示使用临时配置
+            cache_size_mb: 持久化磁盘缓存上限（MB）
+            capture_api: 是否开启性能日志以捕获页面的 JSON 接口响应（启动前设置才生效）
+        """
+        self.profile_dir = profile_dir
+        self.cache_size_mb = cache_size_mb
+        self.capture_api = capture_api
+        # 操作浏览器（打开页面、切换标签页、读取源码）前先拿到这把锁；可重入，同一来源内嵌套调用不会死锁
+        self.lock = threading.RLock()
+        self._driver = None
+        self.network_capture = None
+
+    @property
+    def started(self) -> bool:
+        return self._driver is not None
+
+    @property
+    def driver(self):
+        """浏览器驱动（未启动时启动）"""
+        with self.lock:
+            if self._driver is None:
+                self._start()
+            return self._driver
+
+    def _start(self):
+        # selenium 只在真正需要浏览器时导入
+        from selenium.webdriver.chrome.options import Options
+        from common.driver_cache import create_chrome_driver
+        from common.network_capture import NetworkCapture, enable_performance_log
+
+        chrome_options = Options()
+        chrome_options.add_argument('--headless')  # 无头模式
+        chrome_options.add_argument('--no-sandbox')
+        chrome_options.add_argument('--disable-dev-shm-usage')
+        chrome_options.add_argument('--disable-gpu')
+        chrome_options.add_argument(f'user-agent={USER_AGENT}')
+        if self.capture_api:
+            enable_performance_log(chrome_options)
+        if self.profile_dir:
+            apply_profile(chrome_options, self.profile_dir, self.cache_size_mb)
+        self._driver = create_chrome_driver(chrome_options)
+        self._driver.implicitly_wait(10)
+        self.network_capture = NetworkCapture(self._driver) if self.capture_api else None
+
+    def restart(self):
+        """浏览器会话失效时重启"""
+        print("浏览器会话已失效，正在重启...")
+        with self.lock:
+            self._quit()
+            self._start()
+
+    def _quit(self):
+        if self._driver is not None:
+            try:
+                self._driver.quit()
+            except Exception:
+                pass
+            self._driver = None
+            self.network_capture = None
+
+    def close(self):
+        """关闭浏览器（之后再使用会重新启动）"""
+        with self.lock:
+            if self._driver is None:
+                return
+            self._quit()
+        if self.profile_dir:
+            prune_profile(self.profile_dir, self.cache_size_mb)
+
+
+class Runtime:
+    def __init__(self, browser: Browser = None):
+        """
+        一个进程内所有来源共享的资源
+
+        Args:
+            browser: 共享浏览器，默认使用持久化配置目录 'shared'（设置 BINANCE_CRAWLER_CACHE 后启用）
+        """
+        self.browser = browser or Browser(profile_dir=default_profile_dir('shared'))
+        self.rate_limiter = get_rate_limiter()
+        self.circuit_breaker = get_circuit_breaker()
+        self._extractor = None
+
+    @property
+    def http(self):
+        """HTTP 连接池"""
+        return get_client()
+
+    @property
+    def extractor(self):
+        """页面解析进程池（见 common.extraction）"""
+        if self._extractor is None:
+            from common.extraction import ExtractionExecutor
+            self._extractor = ExtractionExecutor()
+        return self._extractor
+
+    def close(self):
+        self.browser.close()
+        if self._extractor is not None:
+            self._extractor.close()
+
+
+_runtime: Optional[Runtime] = None
+_runtime_lock = threading.Lock()
+
+
+def get_runtime() -> Runtime:
+    """进程内共享的运行时"""
+    global _runtime
+    with _runtime_lock:
+        if _runtime is None:
+            _runtime = Runtime()
+        return _runtime
+
+
+def close_runtime():
+    """关闭共享运行时的浏览器（进程退出前调用）"""
+    if _runtime is not None:
+        _runtime.close()
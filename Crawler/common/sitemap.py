@@ -0,0 +1,156 @@
+"""
+站点地图发现
+用 iterparse 流式解析 sitemap 索引与子 sitemap（内存占用与文件大小无关），
+按 URL 规则筛出博客/广场文章，并根据 <lastmod> 只把新增或有更新的文章交给详情抓取，
+不需要用浏览器渲染列表页
+"""
+import gzip
+import heapq
+import re
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from typing import Dict, Iterator, List, Tuple
+
+from common.article import Article, parse_date
+from common.http_client import get_client
+
+SITEMAP_INDEX_URL = 'https://www.binance.com/sitemap.xml'
+# 博客文章：/blog/<分类>/<标题-id>（排除 /blog/<分类> 这样的分类页）
+BLOG_POST_PATTERN = r'/blog/[^/?#]+/[^/?#]+'
+# 广场文章：/square/post/<id> 或 /square/news/<标题-id>
+SQUARE_POST_PATTERN = r'/square/(post/\d+|news/[^/?#]*-\d+)/?$'
+
+
+def _local(tag: str) -> str:
+    """去掉命名空间后的标签名"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def iter_sitemap(url: str, client=None) -> Iterator[Tuple[str, str, str]]:
+    """
+    流式解析一个 sitemap 文件
+
+    Args:
+        url: sitemap URL（.gz 结尾时按 gzip 解压）
+        client: HttpClient，默认使用共享客户端
+
+    Yields:
+        (类型, loc, lastmod)，类型为 'sitemap'（索引中的子 sitemap）或 'url'
+    """
+    client = client or get_client()
+    response = client.get_stream(url)
+    try:
+        stream = response.raw
+        if url.endswith('.gz'):
+            stream = gzip.GzipFile(fileobj=stream)
+        root = None
+        for event, elem in ET.iterparse(stream, events=('start', 'end')):
+            if event == 'start':
+                if root is None:
+                    root = elem
+                continue
+            kind = _local(elem.tag)
+            if kind not in ('sitemap', 'url'):
+                continue
+            loc = lastmod = ''
+            for child in elem:
+                name = _local(child.tag)
+                if name == 'loc':
+                    loc = (child.text or '').strip()
+                elif name == 'lastmod':
+                    lastmod = (child.text or '').strip()
+            # 处理完立即释放，保持常量内存
+            root.clear()
+            if loc:
+                yield kind, loc, lastmod
+    finally:
+        response.close()
+
+
+def iter_entries(index_url: str = SITEMAP_INDEX_URL, child_pattern: str = None,
+                 client=None) -> Iterator[Tuple[str, str]]:
+    """
+    遍历 sitemap 索引及其子 sitemap 中的所有页面
+
+    Args:
+        index_url: sitemap 索引（也可以直接是普通 sitemap）
+        child_pattern: 只进入 URL 匹配该正则的子 sitemap（如 'blog'），None 表示全部进入
+        client: HttpClient
+
+    Yields:
+        (loc, lastmod)
+    """
+    pending = [index_url]
+    visited = set()
+    while pending:
+        url = pending.pop(0)
+        if url in visited:
+            continue
+        visited.add(url)
+        try:
+            for kind, loc, lastmod in iter_sitemap(url, client):
+                if kind == 'sitemap':
+                    if not child_pattern or re.search(child_pattern, loc):
+                        pending.append(loc)
+                else:
+                    yield loc, lastmod
+        except Exception as e:
+            print(f"  解析 sitemap 失败 {url}: {e}")
+
+
+def discover(post_pattern: str,
+             index_url: str = SITEMAP_INDEX_URL,
+             child_pattern: str = None,
+             known: Dict[str, str] = None,
+             since: datetime = None,
+             max_articles: int = 20,
+             client=None) -> List[Dict]:
+    """
+    从 sitemap 中找出需要抓取详情的文章
+
+    Args:
+        post_pattern: 文章 URL 的正则（BLOG_POST_PATTERN / SQUARE_POST_PATTERN）
+        index_url: sitemap 索引
+        child_pattern: 只进入匹配的子 sitemap
+        known: 已有文章的链接 -> 上次记录的 lastmod；lastmod 没有变化（或没有记录）的不再抓取
+        since: 不在 known 中的文章只保留 lastmod 不早于该时间的
+        max_articles: 最多返回的篇数（取 lastmod 最新的，只保留这么多条，内存占用固定）
+        client: HttpClient
+
+    Returns:
+        文章列表（title/date 为空，由详情页补全），按 lastmod 从新到旧
+    """
+    known = known or {}
+    pattern = re.compile(post_pattern)
+    heap: List[Tuple[float, str, str]] = []
+    scanned = matched = 0
+    for loc, lastmod in iter_entries(index_url, child_pattern, client):
+        scanned += 1
+        if not pattern.search(loc):
+            continue
+        matched += 1
+        modified = parse_date(lastmod)
+        if loc in known:
+            old = parse_date(known[loc])
+            if not old or not modified or modified <= old:
+                continue
+        elif since and modified and modified < since:
+            continue
+        key = modified.timestamp() if modified else 0.0
+        item = (key, loc, lastmod)
+        if len(heap) < max_articles:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+    print(f"sitemap: 扫描 {scanned} 条，匹配文章 {matched} 篇，需要抓取 {len(heap)} 篇")
+
+    return [Article(title='', link=loc, date='', lastmod=lastmod, description='')
+            for _, loc, lastmod in sorted(heap, reverse=True)]
+
+
+def title_from_link(link: str) -> str:
+    """没有标题时用链接最后一段生成标题（去掉末尾的数字 id）"""
+    slug = link.rstrip('/').split('/')[-1]
+    slug = re.sub(r'-\d+$', '', slug)
+    return slug.replace('-', ' ').title()
+
@@ -0,0 +1,314 @@
+"""
+来源插件
+每个来源（博客、Square……）只需实现三个步骤：
+    discover      发现待抓取的文章（列表页、RSS、sitemap……）
+    fetch_detail  抓取单篇文章的原始结果（FetchResult）
+    extract       把原始结果解析进文章字典
+    parse_html    （可选）解析渲染后页面的模块级函数，在解析进程池中运行，结果放进 FetchResult.data 再交给 extract
+串行/多标签页/流水线三种抓取方式、时间预算与复查在这里统一实现，
+浏览器、限速器、熔断器来自共享运行时（common.runtime），多个来源同时运行时共用
+"""
+import time
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set
+
+from common.article import Article, canonical_url
+from common.deadline import CrawlDeadline, newest_first
+from common.extraction import PendingExtraction, take_all, take_ready
+from common.fetch_result import FetchResult, FetchStatus
+from common.runtime import Runtime, get_runtime
+
+
+class Source:
+    # 来源名（日志与注册表中使用）
+    name = 'source'
+    # 多标签页模式下导航后至少等待的秒数，None 使用 TabPool 的默认值
+    tab_settle_time: Optional[float] = None
+    # 解析渲染后页面的函数 (html) -> 详情字段，在解析进程池中运行（需为模块级函数，用 staticmethod 包装），
+    # None 表示在 extract 中直接解析
+    parse_html: Optional[Callable[[str], Dict]] = None
+
+    def __init__(self, runtime: Runtime = None, tabs: int = 1, capture_api: bool = False,
+                 rate_limiter=None, circuit_breaker=None, deadline: CrawlDeadline = None):
+        """
+        初始化来源
+
+        Args:
+            runtime: 共享运行时，默认使用进程内共享实例
+            tabs: 详情页并发标签页数量，1 表示串行抓取
+            capture_api: 是否优先从页面自身的 JSON 接口响应中提取文章（失败时回退到 DOM 解析）
+            rate_limiter: 按主机限速器，默认使用运行时的
+            circuit_breaker: 按主机熔断器，默认使用运行时的
+            deadline: 运行时间预算，剩余时间不够再抓一篇时停止抓取详情
+        """
+        self.runtime = runtime or get_runtime()
+        self.browser = self.runtime.browser
+        if capture_api and not self.browser.capture_api:
+            if self.browser.started:
+                print(f"[{self.name}] 共享浏览器已启动，无法再开启接口捕获，使用 DOM 解析")
+                capture_api = False
+            else:
+                self.browser.capture_api = True
+        self.tabs = max(1, tabs)
+        self.capture_api = capture_api
+        self.rate_limiter = rate_limiter or self.runtime.rate_limiter
+        self.circuit_breaker = circuit_breaker or self.runtime.circuit_breaker
+        self.deadline = deadline
+        self.articles: List[Dict] = []
+
+    @property
+    def driver(self):
+        """共享浏览器的驱动（未启动时启动）"""
+        return self.browser.driver
+
+    @property
+    def network_capture(self):
+        return self.browser.network_capture
+
+    def _restart_driver(self):
+        self.browser.restart()
+
+    # ---- 插件接口 ----
+
+    def discover(self, max_articles: int = 20, skip_links: Set[str] = None,
+                 known_lastmod: Dict[str, str] = None, watermark: datetime = None) -> List[Dict]:
+        """
+        发现待抓取的文章
+
+        Args:
+            max_articles: 最大文章数量
+            skip_links: 已完成的链接，跳过且不计入数量
+            known_lastmod: 已有文章的链接 -> 上次的 sitemap lastmod，lastmod 更新的文章重新抓取
+            watermark: 水位线，遍历到更早的文章即可停止（不支持的来源忽略）
+
+        Returns:
+            文章列表（尚未获取详细内容）
+        """
+        raise NotImplementedError
+
+    def fetch_detail(self, article: Dict) -> FetchResult:
+        """抓取单篇文章的原始结果（在浏览器锁内调用）"""
+        raise NotImplementedError
+
+    def extract(self, article: Dict, result: FetchResult) -> Dict:
+        """把原始结果解析进文章（失败时也要返回文章，正文可以为空）"""
+        raise NotImplementedError
+
+    def warm_cache(self, sample_articles: int = 3):
+        """
+        预热浏览器缓存：打开几篇文章，让静态资源进入持久化磁盘缓存
+
+        Args:
+            sample_articles: 打开的文章数量
+        """
+        for article in self.discover(sample_articles):
+            print(f"  预热: {article['link'][:80]}")
+            self.rate_limiter.acquire(article['link'])
+            with self.browser.lock:
+                self.driver.get(article['link'])
+                time.sleep(3)
+
+    # ---- 共享的抓取流程 ----
+
+    def _fetch(self, article: Dict) -> FetchResult:
+        started = time.time()
+        if not self.circuit_breaker.allow(article['link']):
+            result = FetchResult(article['link'], FetchStatus.BLOCKED, error='主机已熔断', attempts=0)
+        else:
+            with self.browser.lock:
+                result = self.fetch_detail(article)
+        if self.deadline and result.attempts:
+            self.deadline.observe(time.time() - started)
+        return result
+
+    def extract_later(self, article: Dict, result: FetchResult) -> PendingExtraction:
+        """
+        开始解析一篇文章：渲染后的页面交给解析进程池（调用方可以接着加载下一篇），
+        接口数据与失败的结果不需要解析，取回时直接 extract
+
+        Returns:
+            PendingExtraction，result() 返回补全后的文章
+        """
+        if (self.parse_html is None or result is None or result.data or not result.html
+                or result.status not in (FetchStatus.OK, FetchStatus.EMPTY)):
+            return PendingExtraction(lambda: self.extract(article, result))
+        future = self.runtime.extractor.submit(self.parse_html, result.html)
+
+        def finish() -> Dict:
+            try:
+                result.data = future.result()
+            except Exception as e:
+                print(f"  解析页面失败 {article['link'][:80]}: {e}")
+                result.data = None
+            # 已经解析成紧凑的详情字段，原始页面不再保留
+            result.html = ''
+            return self.extract(article, result)
+
+        return PendingExtraction(finish, future)
+
+    def fetch_content(self, link: str) -> str:
+        """抓取单篇文章的正文（复查旧文章时使用），失败时返回空字符串"""
+        article = Article(link=link, title='', description='')
+        result = self._fetch(article)
+        if result.status not in (FetchStatus.OK, FetchStatus.EMPTY):
+            return ''
+        return self.extract_later(article, result).result().get('content', '')
+
+    def iter_article_details(self, articles: List[Dict], fetch_content: bool = True,
+                             tabs: int = None) -> Iterator[Dict]:
+        """
+        逐篇获取文章详细内容，每完成一篇就产出一篇
+
+        Args:
+            articles: 文章列表
+            fetch_content: 是否获取文章详细内容
+            tabs: 并发的标签页数，默认 self.tabs
+
+        Yields:
+            已补全详细内容的文章（串行模式按列表顺序，多标签页模式下按完成顺序）
+        """
+        tabs = tabs or self.tabs
+        if not fetch_content:
+            yield from articles
+        elif tabs > 1:
+            yield from self.iter_contents_in_tabs(articles, tabs)
+        else:
+            # 页面在解析进程池里解析，同时加载下一篇
+            pending = deque()
+            window = self.runtime.extractor.window
+            for i, article in enumerate(articles, 1):
+                if self.deadline and not self.deadline.can_fetch():
+                    break
+                print(f"[{self.name}] [{i}/{len(articles)}] 获取详情: {article['title'][:50]}...")
+                pending.append(self.extract_later(article, self._fetch(article)))
+                yield from take_ready(pending, window)
+            yield from take_all(pending)
+
+    def iter_crawl(self, max_articles: int = 20, fetch_content: bool = True,
+                   skip_links: Set[str] = None, known_lastmod: Dict[str, str] = None,
+                   watermark: datetime = None) -> Iterator[Dict]:
+        """
+        爬取文章的生成器版本，文章完成一篇产出一篇，便于调用方边爬边保存
+
+        Args:
+            max_articles: 最大爬取文章数量
+            fetch_content: 是否获取文章详细内容
+            skip_links: 已完成（断点日志、文章库中）的链接，跳过不再爬取
+            known_lastmod: 已有文章的 sitemap lastmod（sitemap 模式）
+            watermark: 水位线
+
+        Yields:
+            文章字典
+        """
+        # 新文章按发布时间从新到旧抓取，时间预算不够时先保证最新的
+        articles = newest_first(self.discover(max_articles, skip_links, known_lastmod, watermark))
+        yield from self.iter_article_details(articles, fetch_content)
+
+    def crawl(self, max_articles: int = 20, fetch_content: bool = True) -> List[Dict]:
+        """
+        爬取文章
+
+        Args:
+            max_articles: 最大爬取文章数量
+            fetch_content: 是否获取文章详细内容
+
+        Returns:
+            文章列表（按发现顺序）
+        """
+        articles = self.discover(max_articles)
+        for _ in self.iter_article_details(articles, fetch_content):
+            pass
+        self.articles = articles
+        return articles
+
+    def crawl_pipeline(self, max_articles: int = 20, queue_size: int = 4,
+                       skip_links: Set[str] = None, on_article=None,
+                       known_lastmod: Dict[str, str] = None, watermark: datetime = None) -> List[Dict]:
+        """
+        用 asyncio 流水线爬取：发现、详情抓取、解析三个阶段重叠执行
+
+        Args:
+            max_articles: 最大爬取文章数量
+            queue_size: 阶段之间的队列容量
+            skip_links: 已完成的链接，跳过不再爬取
+            on_article: 每篇文章完成时的回调 (文章)，如写入断点日志
+            known_lastmod: 已有文章的 sitemap lastmod（sitemap 模式）
+            watermark: 水位线
+
+        Returns:
+            文章列表（按发现顺序）
+        """
+        from common.pipeline import CrawlPipeline
+        print(f"[{self.name}] 流水线模式")
+
+        def discover():
+            return newest_first(self.discover(max_articles, skip_links, known_lastmod, watermark))
+
+        def finished(i: int, article: Dict):
+            print(f"[{self.name}] [{i + 1}] 已完成: {article['title'][:50]}...")
+            if on_article:
+                on_article(article)
+
+        pipeline = CrawlPipeline(
+            discover=discover,
+            fetch=self._fetch,
+            # 解析线程只是等待解析进程池的结果
+            extract=lambda article, result: self.extract_later(article, result).result(),
+            on_article=finished,
+            should_continue=self.deadline.can_fetch if self.deadline else None,
+            queue_size=queue_size,
+            extract_workers=max(2, self.runtime.extractor.workers),
+        )
+        self.articles = pipeline.run_sync()
+        return self.articles
+
+    def iter_contents_in_tabs(self, articles: Iterable[Dict], tabs: int = None) -> Iterator[Dict]:
+        """
+        在共享浏览器的多个标签页中并发获取文章详情，结果写回文章并按完成顺序产出
+        （整批期间占用浏览器，其他来源的页面加载等这一批结束）
+
+        Args:
+            articles: 文章列表（需包含 link）
+            tabs: 标签页数，默认 self.tabs
+
+        Yields:
+            已补全详细内容的文章
+        """
+        from common.tab_pool import TabPool
+        # 规范化链接相同（只差跟踪参数、末尾斜杠……）的文章只加载一次
+        by_link = {}
+        for article in map(Article.coerce, articles):
+            by_link.setdefault(article.canonical_link, []).append(article)
+
+        tabs = tabs or self.tabs
+        print(f"[{self.name}] 使用 {tabs} 个标签页并发获取 {len(by_link)} 篇文章详情...")
+        options = {} if self.tab_settle_time is None else {'settle_time': self.tab_settle_time}
+        pending = deque()
+        window = self.runtime.extractor.window
+        with self.browser.lock:
+            pool = TabPool(self.driver, size=tabs, rate_limiter=self.rate_limiter,
+                           circuit_breaker=self.circuit_breaker, **options)
+            last = time.time()
+            try:
+                urls = [same[0].link for same in by_link.values()]
+                for i, (url, html) in enumerate(pool.fetch_all(urls), 1):
+                    print(f"[{self.name}] [{i}/{len(by_link)}] 已完成: {url[:80]}")
+                    if self.deadline:
+                        # 多个标签页并发，按相邻两次完成的间隔估计单页耗时
+                        self.deadline.observe(time.time() - last)
+                        last = time.time()
+                    for article in by_link[canonical_url(url)]:
+                        # 同一链接的多篇文章各自解析（extract 会改写 result）
+                        result = FetchResult(url, FetchStatus.OK if html else FetchStatus.TIMEOUT, html=html)
+                        pending.append(self.extract_later(article, result))
+                    yield from take_ready(pending, window)
+                    if self.deadline and not self.deadline.can_fetch():
+                        break
+                yield from take_all(pending)
+            finally:
+                pool.close()
+
+    def close(self):
+        """来源本身不持有浏览器；共享浏览器由运行时关闭（common.runtime.close_runtime）"""
+        pass
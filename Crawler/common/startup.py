@@ -0,0 +1,42 @@
+"""
+启动耗时统计
+记录进程启动到驱动就绪、首个请求发出等关键时间点，用于衡量冷启动开销
+"""
+import time
+from typing import Dict
+
+# 本模块应在入口脚本中尽早导入，以此作为起点
+_START = time.perf_counter()
+_marks: Dict[str, float] = {}
+
+LABELS = {
+    'imports': '依赖导入完成',
+    'driver_resolved': '驱动路径解析完成',
+    'driver_ready': '浏览器就绪',
+    'first_request': '首个请求发出',
+}
+
+
+def mark(event: str):
+    """
+    记录某个事件首次发生的时间点（重复调用只保留第一次）
+
+    Args:
+        event: 事件名，见 LABELS
+    """
+    if event not in _marks:
+        _marks[event] = time.perf_counter() - _START
+
+
+def elapsed(event: str) -> float:
+    """返回事件相对启动的秒数，未发生时返回 -1"""
+    return _marks.get(event, -1.0)
+
+
+def report():
+    """打印启动各阶段耗时"""
+    if not _marks:
+        return
+    print("\n启动耗时:")
+    for event, seconds in sorted(_marks.items(), key=lambda x: x[1]):
+        print(f"  {LABELS.get(event, event)}: {seconds:.2f}s")
@@ -0,0 +1,180 @@
+"""
+单浏览器多标签页并发抓取
+在同一个 Chrome 实例中打开 K 个标签页，把文章 URL 分派到各标签页，
+哪个标签页先加载完成就先收割哪个，以约一个浏览器的内存开销获得并行度
+"""
+import time
+from collections import deque
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from common.fetch_result import FetchStatus, classify_page
+
+
+class _Tab:
+    """单个标签页的状态"""
+
+    def __init__(self, handle: str):
+        self.handle = handle
+        self.url = None
+        self.phase = 'idle'  # idle -> loading -> scrolled -> idle
+        self.started = 0.0
+        self.scrolled_at = 0.0
+
+
+class TabPool:
+    def __init__(self, driver, size: int = 4,
+                 settle_time: float = 3.0,
+                 scroll_wait: float = 2.0,
+                 timeout: float = 30.0,
+                 poll_interval: float = 0.2,
+                 ready_selector: str = None,
+                 rate_limiter=None,
+                 circuit_breaker=None):
+        """
+        初始化标签页池
+
+        Args:
+            driver: 已创建的 Selenium WebDriver
+            size: 标签页数量
+            settle_time: 导航后至少等待的秒数（SPA 在 readyState 完成后仍会继续渲染）
+            scroll_wait: 滚动到底部后等待懒加载的秒数
+            timeout: 单个页面的最长等待时间，超时后按现状收割
+            poll_interval: 轮询各标签页状态的间隔
+            ready_selector: 可选，收割前要求页面中存在的 CSS 选择器
+            rate_limiter: 可选，按主机限速器；没有令牌时暂不向空闲标签页分派
+            circuit_breaker: 可选，按主机熔断器；已熔断主机的 URL 直接以失败产出
+        """
+        self.driver = driver
+        self.size = max(1, size)
+        self.settle_time = settle_time
+        self.scroll_wait = scroll_wait
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.ready_selector = ready_selector
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self.tabs: List[_Tab] = []
+        self._origin_handle = None
+
+    def open(self):
+        """打开标签页（第一个标签页复用当前窗口）"""
+        if self.tabs:
+            return
+        self._origin_handle = self.driver.current_window_handle
+        self.tabs.append(_Tab(self._origin_handle))
+        for _ in range(self.size - 1):
+            self.driver.switch_to.new_window('tab')
+            self.tabs.append(_Tab(self.driver.current_window_handle))
+
+    def _dispatch(self, tab: _Tab, url: str):
+        """在标签页中发起导航（不阻塞等待加载完成）"""
+        self.driver.switch_to.window(tab.handle)
+        self.driver.execute_script("window.location.href = arguments[0];", url)
+        tab.url = url
+        tab.phase = 'loading'
+        tab.started = time.time()
+
+    def _poll(self, tab: _Tab) -> Optional[Tuple[str, Optional[str]]]:
+        """
+        检查标签页状态，必要时推进到下一阶段
+
+        Returns:
+            页面可收割时返回 (url, html)，否则返回 None
+        """
+        now = time.time()
+        self.driver.switch_to.window(tab.handle)
+        elapsed = now - tab.started
+
+        if tab.phase == 'loading':
+            state, href = self.driver.execute_script("return [document.readyState, location.href];")
+            loaded = state == 'complete' and href != 'about:blank'
+            if (loaded and elapsed >= self.settle_time) or elapsed >= self.timeout:
+                # 滚动到底部触发懒加载
+                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                tab.phase = 'scrolled'
+                tab.scrolled_at = now
+            return None
+
+        if tab.phase == 'scrolled' and now - tab.scrolled_at >= self.scroll_wait:
+            if self.ready_selector and elapsed < self.timeout:
+                found = self.driver.execute_script(
+                    "return document.querySelector(arguments[0]) !== null;", self.ready_selector
+                )
+                if not found:
+                    return None
+            return tab.url, self.driver.page_source
+        return None
+
+    def fetch_all(self, urls: Iterable[str]) -> Iterator[Tuple[str, Optional[str]]]:
+        """
+        并发抓取多个 URL，按完成顺序产出结果
+
+        Args:
+            urls: 要抓取的 URL 列表
+
+        Yields:
+            (url, html)，页面出错时 html 为 None
+        """
+        self.open()
+        pending = deque(urls)
+
+        while pending or any(tab.phase != 'idle' for tab in self.tabs):
+            for tab in self.tabs:
+                if tab.phase == 'idle':
+                    if not pending:
+                        continue
+                    if self.circuit_breaker and not self.circuit_breaker.allow(pending[0]):
+                        yield pending.popleft(), None
+                        continue
+                    if self.rate_limiter and not self.rate_limiter.try_acquire(pending[0]):
+                        continue
+                    url = pending.popleft()
+                    try:
+                        self._dispatch(tab, url)
+                    except Exception as e:
+                        print(f"  [标签页] 导航失败 {url}: {e}")
+                        tab.phase = 'idle'
+                        yield url, None
+                    continue
+
+                try:
+                    result = self._poll(tab)
+                except Exception as e:
+                    print(f"  [标签页] 读取页面失败 {tab.url}: {e}")
+                    result = (tab.url, None)
+
+                if result is not None:
+                    tab.phase = 'idle'
+                    tab.url = None
+                    status = classify_page(result[1], result[0]) if result[1] else FetchStatus.TIMEOUT
+                    if self.circuit_breaker:
+                        self.circuit_breaker.record(result[0], status)
+                    if self.rate_limiter:
+                        if status == FetchStatus.BLOCKED:
+                            self.rate_limiter.throttled(result[0])
+                        elif status == FetchStatus.TIMEOUT:
+                            self.rate_limiter.failure(result[0])
+                        else:
+                            self.rate_limiter.success(result[0])
+                    if status in (FetchStatus.BLOCKED, FetchStatus.NOT_FOUND):
+                        result = (result[0], None)
+                    yield result
+
+            time.sleep(self.poll_interval)
+
+    def close(self):
+        """关闭额外打开的标签页，切回原窗口"""
+        for tab in self.tabs:
+            if tab.handle == self._origin_handle:
+                continue
+            try:
+                self.driver.switch_to.window(tab.handle)
+                self.driver.close()
+            except Exception:
+                pass
+        if self._origin_handle:
+            try:
+                self.driver.switch_to.window(self._origin_handle)
+            except Exception:
+                pass
+        self.tabs = []
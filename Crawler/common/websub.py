@@ -0,0 +1,364 @@
+"""
+WebSub 推送
+feed 重新生成且内容有变化时，通知 WebSub hub（只通知有变化的 feed），
+hub 再把新内容推给订阅者，订阅者不必轮询：
+    WebSubState   记录每个 feed 上次的条目摘要，找出有变化的 feed，待通知的地址写进状态文件
+    publish       向 hub 发送 publish 通知（hub.mode=publish&hub.url=...），失败按退避重试
+    WebSubHub     最小的内置 hub：处理订阅（验证订阅意图）、收到 publish 后抓取 feed 推给订阅者
+    RecordingHub  本地的 hub 替身，只记录收到的 publish 通知（可以让前几次请求失败，检验重试）
+
+发布到 GitHub Pages 时 feed 在部署步骤之后才能访问，所以生成 feed 时只记录待通知的地址，
+部署完成后再由 websub_notify.py 统一通知；守护进程自己提供 feed，每轮结束后直接通知
+"""
+import hashlib
+import hmac
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import parse_qs, parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+from common.feed_formats import FORMATS, output_paths
+
+
+def topic_url(base_url: str, root_dir: str, path: str) -> str:
+    """
+    feed 文件发布后的地址
+
+    Args:
+        base_url: 发布地址（对应 root_dir），如 https://example.github.io/binance-feeds/
+        root_dir: 主 feed 所在的目录
+        path: feed 文件路径（子 feed 在子目录里）
+    """
+    relative = os.path.relpath(path, root_dir).replace(os.sep, '/')
+    return urljoin(base_url.rstrip('/') + '/', relative)
+
+
+def feed_key(articles: Iterable[Dict]) -> str:
+    """feed 条目的摘要：条目、正文指纹或日期有变化时改变"""
+    digest = hashlib.sha1()
+    for article in articles:
+        fingerprint = article.get('fingerprint') or article.get('body') or ''
+        digest.update(f"{article.get('link', '')} {fingerprint} {article.get('date', '')}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+class WebSubState:
+    def __init__(self, path: str, base_url: str, root_dir: str, formats: Iterable[str] = FORMATS):
+        """
+        各 feed 上次通知时的摘要与待通知的地址
+
+        Args:
+            path: 状态文件（JSON）
+            base_url: feed 的发布地址
+            root_dir: 主 feed 所在的目录
+            formats: feed 的格式（每种格式是一个单独的 topic）
+        """
+        self.path = path
+        self.base_url = base_url
+        self.root_dir = root_dir
+        self.formats = tuple(formats)
+        self.keys: Dict[str, str] = {}
+        self.pending: List[str] = []
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    state = json.load(f)
+                self.keys = state.get('keys', {})
+                self.pending = state.get('pending', [])
+            except ValueError as e:
+                print(f"WebSub 状态文件损坏，重新开始: {path} ({e})")
+
+    def topics(self, output_file: str) -> List[str]:
+        """一个 feed 各格式的地址"""
+        return [topic_url(self.base_url, self.root_dir, path)
+                for path in output_paths(output_file, self.formats).values()]
+
+    def record(self, output_file: str, articles: Iterable[Dict]) -> bool:
+        """
+        记录刚生成的 feed，条目有变化时把它的地址加入待通知
+
+        Args:
+            output_file: feed 的 RSS 路径
+            articles: feed 中的文章
+
+        Returns:
+            是否有变化
+        """
+        name = os.path.relpath(output_file, self.root_dir).replace(os.sep, '/')
+        key = feed_key(articles)
+        if self.keys.get(name) == key:
+            return False
+        self.keys[name] = key
+        for topic in self.topics(output_file):
+            if topic not in self.pending:
+                self.pending.append(topic)
+        return True
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'keys': self.keys, 'pending': self.pending}, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, self.path)
+
+    def flush(self, hub_url: str, client=None) -> bool:
+        """
+        通知 hub 所有待通知的地址，成功的从待通知中移除（失败的留到下次）
+
+        Returns:
+            是否全部成功
+        """
+        if not self.pending:
+            return True
+        failed = publish(hub_url, self.pending, client)
+        self.pending = [topic for topic in self.pending if topic in failed]
+        self.save()
+        return not failed
+
+
+def publish(hub_url: str, topics: Iterable[str], client=None) -> List[str]:
+    """
+    向 hub 发送 publish 通知（每个地址一个请求；网络错误与 429/5xx 由 HttpClient 按退避重试）
+
+    Args:
+        hub_url: hub 地址
+        topics: 有更新的 feed 地址
+        client: HttpClient，默认共享客户端
+
+    Returns:
+        通知失败的地址
+    """
+    if client is None:
+        from common.http_client import get_client
+        client = get_client()
+    failed = []
+    for topic in topics:
+        try:
+            response = client.request('POST', hub_url, data={'hub.mode': 'publish', 'hub.url': topic}, timeout=15)
+            ok = 200 <= response.status_code < 300
+            status = response.status_code
+        except Exception as e:
+            ok, status = False, e
+        if ok:
+            print(f"  WebSub 已通知: {topic}")
+        else:
+            print(f"  WebSub 通知失败 ({status}): {topic}")
+            failed.append(topic)
+    return failed
+
+
+def _form(handler: BaseHTTPRequestHandler) -> Dict[str, List[str]]:
+    length = int(handler.headers.get('Content-Length') or 0)
+    return parse_qs(handler.rfile.read(length).decode('utf-8'))
+
+
+def _add_query(url: str, params: Dict[str, str]) -> str:
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True) + list(params.items())
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+class WebSubHub:
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, public_url: str = None,
+                 state_file: str = None, lease_seconds: int = 10 * 86400, client=None):
+        """
+        最小的 WebSub hub（订阅与 publish 都在同一个地址上）
+
+        Args:
+            host: 监听地址
+            port: 监听端口，0 表示随机
+            public_url: 订阅者看到的 hub 地址（写进推送的 Link 头），默认 http://host:port/
+            state_file: 保存订阅的 JSON 文件，None 表示只在内存中
+            lease_seconds: 订阅者没有指定时的租期
+            client: 抓取 feed 与推送用的 HttpClient，默认共享客户端
+        """
+        self.state_file = state_file
+        self.lease_seconds = lease_seconds
+        self._client = client
+        self._lock = threading.Lock()
+        # topic -> callback -> {'secret': ..., 'expires': 时间戳}
+        self.subscriptions: Dict[str, Dict[str, Dict]] = {}
+        if state_file and os.path.exists(state_file):
+            with open(state_file, 'r', encoding='utf-8') as f:
+                self.subscriptions = json.load(f)
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.url = public_url or f'http://{host}:{self.server.server_address[1]}/'
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            from common.http_client import get_client
+            self._client = get_client()
+        return self._client
+
+    def _save(self):
+        if not self.state_file:
+            return
+        os.makedirs(os.path.dirname(self.state_file) or '.', exist_ok=True)
+        tmp = self.state_file + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.subscriptions, f)
+        os.replace(tmp, self.state_file)
+
+    def _verify(self, mode: str, topic: str, callback: str, lease: int, secret: str):
+        """验证订阅意图：订阅者原样返回 challenge 才生效"""
+        challenge = hashlib.sha1(os.urandom(16)).hexdigest()
+        params = {'hub.mode': mode, 'hub.topic': topic, 'hub.challenge': challenge}
+        if mode == 'subscribe':
+            params['hub.lease_seconds'] = str(lease)
+        try:
+            response = self.client.get(_add_query(callback, params), timeout=15)
+            confirmed = 200 <= response.status_code < 300 and response.text.strip() == challenge
+        except Exception as e:
+            print(f"WebSub hub: 验证失败 {callback}: {e}")
+            return
+        if not confirmed:
+            print(f"WebSub hub: 订阅者未确认 {mode} {callback}")
+            return
+        with self._lock:
+            if mode == 'subscribe':
+                self.subscriptions.setdefault(topic, {})[callback] = {
+                    'secret': secret, 'expires': time.time() + lease}
+            else:
+                self.subscriptions.get(topic, {}).pop(callback, None)
+            self._save()
+        print(f"WebSub hub: {mode} {topic} -> {callback}")
+
+    def distribute(self, topic: str) -> int:
+        """
+        抓取 topic 的最新内容推给所有订阅者（推送失败由 HttpClient 按退避重试）
+
+        Returns:
+            推送成功的订阅者数
+        """
+        now = time.time()
+        with self._lock:
+            subscribers = {callback: sub for callback, sub in self.subscriptions.get(topic, {}).items()
+                           if sub['expires'] > now}
+        if not subscribers:
+            return 0
+        try:
+            response = self.client.get(topic, timeout=30)
+            response.raise_for_status()
+        except Exception as e:
+            print(f"WebSub hub: 抓取 {topic} 失败: {e}")
+            return 0
+        body = response.content
+        headers = {
+            'Content-Type': response.headers.get('Content-Type', 'application/xml'),
+            'Link': f'<{self.url}>; rel="hub", <{topic}>; rel="self"',
+        }
+        delivered = 0
+        for callback, sub in subscribers.items():
+            sub_headers = dict(headers)
+            if sub.get('secret'):
+                signature = hmac.new(sub['secret'].encode('utf-8'), body, hashlib.sha256).hexdigest()
+                sub_headers['X-Hub-Signature'] = f'sha256={signature}'
+            try:
+                result = self.client.request('POST', callback, data=body, headers=sub_headers, timeout=15)
+                if 200 <= result.status_code < 300:
+                    delivered += 1
+                elif result.status_code == 410:
+                    # 订阅者明确表示不再需要
+                    with self._lock:
+                        self.subscriptions.get(topic, {}).pop(callback, None)
+                        self._save()
+            except Exception as e:
+                print(f"WebSub hub: 推送到 {callback} 失败: {e}")
+        print(f"WebSub hub: {topic} 已推送给 {delivered}/{len(subscribers)} 个订阅者")
+        return delivered
+
+    def _handler(self):
+        hub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self, code: int, text: str = ''):
+                data = text.encode('utf-8')
+                self.send_response(code)
+                self.send_header('Content-Type', 'text/plain; charset=utf-8')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                form = _form(self)
+                mode = (form.get('hub.mode') or [''])[0]
+                if mode == 'publish':
+                    topics = form.get('hub.url') or form.get('hub.topic') or []
+                    if not topics:
+                        return self._reply(400, 'hub.url required')
+                    self._reply(204)
+                    for topic in topics:
+                        threading.Thread(target=hub.distribute, args=(topic,), daemon=True).start()
+                elif mode in ('subscribe', 'unsubscribe'):
+                    topic = (form.get('hub.topic') or [''])[0]
+                    callback = (form.get('hub.callback') or [''])[0]
+                    if not topic or not callback:
+                        return self._reply(400, 'hub.topic and hub.callback required')
+                    try:
+                        lease = int((form.get('hub.lease_seconds') or [hub.lease_seconds])[0])
+                    except ValueError:
+                        lease = hub.lease_seconds
+                    secret = (form.get('hub.secret') or [''])[0]
+                    self._reply(202)
+                    threading.Thread(target=hub._verify, args=(mode, topic, callback, lease, secret),
+                                     daemon=True).start()
+                else:
+                    self._reply(400, 'unsupported hub.mode')
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name='websub-hub', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class RecordingHub:
+    def __init__(self, fail_first: int = 0, status: int = 503):
+        """
+        本地的 hub 替身：记录收到的 publish 通知，不推送
+
+        Args:
+            fail_first: 前几次请求返回 status（检验重试）
+            status: 失败时返回的状态码
+        """
+        self.fail_first = fail_first
+        self.status = status
+        self.requests = 0
+        self.published: List[str] = []
+        self._lock = threading.Lock()
+        recorder = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                form = _form(self)
+                with recorder._lock:
+                    recorder.requests += 1
+                    failing = recorder.requests <= recorder.fail_first
+                    if not failing and (form.get('hub.mode') or [''])[0] == 'publish':
+                        recorder.published.extend(form.get('hub.url', []))
+                self.send_response(recorder.status if failing else 204)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}/'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
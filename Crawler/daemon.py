@@ -0,0 +1,330 @@
+"""
+爬虫守护进程
+常驻运行，内部调度各爬虫（每个来源单独的间隔，带随机抖动），共享浏览器在两轮之间保持打开，
+省去每次运行的解释器启动、导入、ChromeDriver 与浏览器冷启动；
+并提供一个只监听本机的 HTTP 控制/健康检查接口，供 C# 托管服务调用，不必每次都启动新进程
+
+接口:
+    GET  /health        守护进程是否正常（调度线程存活）
+    GET  /status        各来源的运行状态
+    POST /run/<来源>     立即运行某个来源（排队，不等待完成）
+    POST /stop          停止守护进程
+
+指定 --feeds-port 时同时启动本地 feed 服务（见 serve_feeds.py），每轮生成 feed 后立即加载；
+配置了 WebSub（FEED_BASE_URL 与 WEBSUB_HUB）时每轮结束后立即通知 hub 有新条目的 feed，
+指定 --hub-port 时同时启动内置的 WebSub hub（common.websub.WebSubHub，没有设置 WEBSUB_HUB 时使用它）
+
+用法:
+    python daemon.py [--port 8765] [--feeds-port 8080] [--hub-port 8081] [--once]
+"""
+import json
+import os
+import random
+import signal
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common.fetch_result import get_circuit_breaker
+from common import runner
+from common.runtime import close_runtime, get_runtime
+from sources import SOURCES, configs, load
+
+DEFAULT_PORT = int(os.environ.get('CRAWLER_DAEMON_PORT', 8765))
+
+
+def _iso(ts: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(ts).isoformat(timespec='seconds') if ts else None
+
+
+class Source:
+    def __init__(self, name: str, module, interval: float = None, jitter: float = 0.1):
+        """
+        一个定时运行的爬虫来源
+
+        Args:
+            name: 来源名（用于接口路径与日志）
+            module: 入口模块（见 sources.py）
+            interval: 运行间隔（秒），默认使用模块的 INTERVAL
+            jitter: 间隔的随机抖动比例（0.1 表示 ±10%），避免多个来源总在同一时刻启动
+        """
+        self.name = name
+        self.module = module
+        self.interval = interval or module.INTERVAL
+        self.jitter = jitter
+        self.crawler = None
+        self.next_run = time.time()
+        self.running = False
+        self.runs = 0
+        self.failures = 0
+        self.last_started: Optional[float] = None
+        self.last_finished: Optional[float] = None
+        self.last_ok: Optional[bool] = None
+        self.last_error = ''
+
+    def schedule_next(self):
+        spread = self.interval * self.jitter
+        self.next_run = time.time() + self.interval + random.uniform(-spread, spread)
+
+    def status(self) -> Dict:
+        return {
+            'interval': self.interval,
+            'running': self.running,
+            'runs': self.runs,
+            'failures': self.failures,
+            'browser_warm': self.crawler is not None and get_runtime().browser.started,
+            'next_run': _iso(self.next_run),
+            'last_started': _iso(self.last_started),
+            'last_finished': _iso(self.last_finished),
+            'last_duration': round(self.last_finished - self.last_started, 1)
+            if self.last_started and self.last_finished and self.last_finished >= self.last_started else None,
+            'last_ok': self.last_ok,
+            'last_error': self.last_error,
+        }
+
+
+class CrawlerDaemon:
+    def __init__(self, sources: List[Source], recycle_after: int = 12, feed_server=None):
+        """
+        初始化守护进程
+
+        Args:
+            sources: 要调度的来源
+            recycle_after: 共享浏览器最多连续使用的轮数（各来源合计），之后关闭重建（防止浏览器长期运行内存膨胀）
+            feed_server: 本地 feed 服务（FeedServer），每轮结束后重新加载 feed
+        """
+        self.sources = {source.name: source for source in sources}
+        self.recycle_after = recycle_after
+        self.feed_server = feed_server
+        self.ticks_since_start = 0
+        self.started = time.time()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def trigger(self, name: str) -> bool:
+        """让某个来源尽快运行，来源不存在时返回 False"""
+        with self._lock:
+            source = self.sources.get(name)
+            if source is None:
+                return False
+            source.next_run = time.time()
+        self._wake.set()
+        return True
+
+    def healthy(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and not self._stopping.is_set()
+
+    def status(self) -> Dict:
+        with self._lock:
+            return {
+                'healthy': self.healthy(),
+                'started': _iso(self.started),
+                'uptime': round(time.time() - self.started),
+                'sources': {name: source.status() for name, source in self.sources.items()},
+            }
+
+    def _close_browser(self):
+        """关闭共享浏览器（下一轮第一次加载页面时重新启动）"""
+        try:
+            get_runtime().browser.close()
+        except Exception as e:
+            print(f"关闭浏览器失败: {e}")
+        self.ticks_since_start = 0
+
+    def run_source(self, source: Source):
+        """运行一轮（共享浏览器保持打开供下一轮复用，出错时关闭，下一轮冷启动）"""
+        print(f"\n[{datetime.now():%H:%M:%S}] 守护进程: 开始运行 {source.name}")
+        with self._lock:
+            source.running = True
+            source.last_started = time.time()
+        ok, error = False, ''
+        try:
+            if source.crawler is None:
+                source.crawler = source.module.create_crawler()
+            # 熔断状态只在一轮内有效
+            get_circuit_breaker().reset()
+            ok = bool(source.module.run(crawler=source.crawler))
+            self.ticks_since_start += 1
+            if self.ticks_since_start >= self.recycle_after:
+                print(f"共享浏览器已连续使用 {self.ticks_since_start} 轮，关闭重建")
+                self._close_browser()
+        except Exception as e:
+            error = str(e).split('\n')[0]
+            traceback.print_exc()
+            source.crawler = None
+            self._close_browser()
+        if self.feed_server is not None:
+            self.feed_server.refresh()
+        self.notify_hub(source)
+        with self._lock:
+            source.running = False
+            source.last_finished = time.time()
+            source.last_ok = ok
+            source.last_error = error
+            source.runs += 1
+            if not ok:
+                source.failures += 1
+            source.schedule_next()
+        print(f"[{datetime.now():%H:%M:%S}] 守护进程: {source.name} {'完成' if ok else '失败'}，"
+              f"下次运行 {_iso(source.next_run)}")
+
+    def notify_hub(self, source: Source):
+        """通知 WebSub hub 本轮有新条目的 feed（守护进程自己提供 feed，生成后即可访问）"""
+        if not hasattr(source.module, 'CONFIG'):
+            return
+        for config in configs(source.module):
+            try:
+                runner.notify_hub(config)
+            except Exception as e:
+                print(f"[{config.name}] WebSub 通知失败: {e}")
+
+    def _loop(self):
+        while not self._stopping.is_set():
+            with self._lock:
+                now = time.time()
+                due = [s for s in self.sources.values() if s.next_run <= now]
+                wait = min(s.next_run for s in self.sources.values()) - now
+            # 各来源依次运行，同一时刻只有一个浏览器在抓取
+            for source in sorted(due, key=lambda s: s.next_run):
+                if self._stopping.is_set():
+                    break
+                self.run_source(source)
+            if not due:
+                self._wake.wait(timeout=max(1.0, wait))
+                self._wake.clear()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._loop, name='crawler-scheduler', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 60.0):
+        """
+        停止调度并关闭浏览器
+
+        Args:
+            timeout: 等待正在运行的一轮结束的秒数，超时后直接关闭浏览器（该轮会以失败结束）
+        """
+        self._stopping.set()
+        self._wake.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        close_runtime()
+
+
+def make_handler(daemon: CrawlerDaemon, on_stop):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, code: int, body: Dict):
+            data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+            self.send_response(code)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path == '/health':
+                healthy = daemon.healthy()
+                self._send(200 if healthy else 503, {'healthy': healthy})
+            elif self.path == '/status':
+                self._send(200, daemon.status())
+            else:
+                self._send(404, {'error': 'not found'})
+
+        def do_POST(self):
+            if self.path.startswith('/run/'):
+                name = self.path[len('/run/'):]
+                if daemon.trigger(name):
+                    self._send(202, {'queued': name})
+                else:
+                    self._send(404, {'error': f'unknown source: {name}'})
+            elif self.path == '/stop':
+                self._send(202, {'stopping': True})
+                threading.Thread(target=on_stop, daemon=True).start()
+            else:
+                self._send(404, {'error': 'not found'})
+
+        def log_message(self, format, *args):
+            # 健康检查很频繁，不打印访问日志
+            pass
+
+    return Handler
+
+
+def main():
+    port = DEFAULT_PORT
+    if '--port' in sys.argv:
+        port = int(sys.argv[sys.argv.index('--port') + 1])
+
+    feed_server = None
+    if '--feeds-port' in sys.argv:
+        from serve_feeds import FEED_FILES
+        from common.feed_server import FeedServer
+        feed_server = FeedServer(FEED_FILES, port=int(sys.argv[sys.argv.index('--feeds-port') + 1]))
+
+    hub = None
+    if '--hub-port' in sys.argv:
+        from common.websub import WebSubHub
+        hub = WebSubHub(host=os.environ.get('WEBSUB_HUB_HOST', '127.0.0.1'),
+                        port=int(sys.argv[sys.argv.index('--hub-port') + 1]),
+                        public_url=os.environ.get('WEBSUB_HUB') or None,
+                        state_file=os.path.join(os.path.dirname(os.path.abspath(__file__)), '.state',
+                                                'websub_subscriptions.json'))
+        # 来源的配置在导入时读取环境变量
+        os.environ.setdefault('WEBSUB_HUB', hub.url)
+
+    sources = [Source(name, load(name)) for name in SOURCES]
+    daemon = CrawlerDaemon(sources, feed_server=feed_server)
+
+    if '--once' in sys.argv:
+        # 依次运行每个来源一轮后退出（调试用）
+        for source in sources:
+            daemon.run_source(source)
+        daemon.stop()
+        sys.exit(0 if all(s.last_ok for s in sources) else 1)
+
+    stopped = threading.Event()
+
+    def shutdown():
+        if stopped.is_set():
+            return
+        stopped.set()
+        print("\n守护进程正在停止...")
+        server.shutdown()
+
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(daemon, shutdown))
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=shutdown, daemon=True).start())
+
+    print("=" * 60)
+    print(f"爬虫守护进程已启动: http://127.0.0.1:{port}")
+    print(f"来源: {', '.join(f'{s.name}（每 {s.interval / 3600:g} 小时）' for s in sources)}")
+    if feed_server is not None:
+        print(f"feed 服务: http://127.0.0.1:{feed_server.port}/")
+        feed_server.start()
+    if hub is not None:
+        print(f"WebSub hub: {hub.url}")
+        hub.start()
+    print("=" * 60)
+    daemon.start()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        daemon.stop()
+        if feed_server is not None:
+            feed_server.stop()
+        if hub is not None:
+            hub.stop()
+        print("守护进程已停止")
+
+
+if __name__ == '__main__':
+    main()
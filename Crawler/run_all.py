@@ -1,48 +1,42 @@
 """
-总开关：依次运行所有爬虫
+总开关：运行所有爬虫
+各来源在同一进程内并发运行，共用一个浏览器、HTTP 连接池与限速器（见 common.runtime）：
+页面加载在浏览器锁内依次进行，一个来源解析、复查、生成 feed 时另一个来源可以继续加载页面
+
+用法:
+    python run_all.py [来源名 ...]      不指定时运行 sources.SOURCES 中的全部来源
 """
-import subprocess
-import sys
 import os
+import sys
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from sources import SOURCES, load
+from common import startup, http_client
+from common.runtime import close_runtime
+
 
-def run_crawler(crawler_name: str, script_path: str) -> bool:
+def run_source(name: str) -> bool:
     """
-    运行单个爬虫
+    运行单个来源
     
     Args:
-        crawler_name: 爬虫名称（用于显示）
-        script_path: 脚本路径
+        name: 来源名
     
     Returns:
         是否成功
     """
-    print(f"\n{'='*60}")
-    print(f"[{datetime.now().strftime('%H:%M:%S')}] 开始运行: {crawler_name}")
-    print(f"{'='*60}")
-    
+    print(f"\n[{datetime.now().strftime('%H:%M:%S')}] 开始运行: {name}")
     try:
-        # 获取脚本所在目录作为工作目录
-        working_dir = os.path.dirname(script_path)
-        
-        # 运行 Python 脚本
-        result = subprocess.run(
-            [sys.executable, script_path],
-            cwd=working_dir,
-            check=False
-        )
-        
-        if result.returncode == 0:
-            print(f"\n[OK] {crawler_name} 运行成功")
-            return True
-        else:
-            print(f"\n[失败] {crawler_name} 运行失败，退出码: {result.returncode}")
-            return False
-            
+        ok = bool(load(name).run())
     except Exception as e:
-        print(f"\n[错误] {crawler_name} 运行出错: {e}")
+        print(f"\n[错误] {name} 运行出错: {e}")
+        traceback.print_exc()
         return False
+    print(f"\n[{'OK' if ok else '失败'}] {name} 运行{'成功' if ok else '失败'}")
+    return ok
 
 
 def main():
@@ -51,44 +45,33 @@ def main():
     print("=" * 60)
     print(f"开始时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
-    # 获取当前脚本所在目录
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    
-    # 定义要运行的爬虫列表
-    crawlers = [
-        ("Binance Blog 爬虫", os.path.join(base_dir, "binance", "main.py")),
-        ("Binance Square 详情爬虫", os.path.join(base_dir, "binance_detail", "main.py")),
-    ]
+    names = [arg for arg in sys.argv[1:] if not arg.startswith('-')] or list(SOURCES)
+    unknown = [name for name in names if name not in SOURCES]
+    if unknown:
+        print(f"未知来源: {', '.join(unknown)}（可选: {', '.join(SOURCES)}）")
+        sys.exit(2)
     
-    # 统计结果
-    results = []
-    
-    # 依次运行每个爬虫
-    for crawler_name, script_path in crawlers:
-        if not os.path.exists(script_path):
-            print(f"\n[跳过] {crawler_name}: 脚本不存在 ({script_path})")
-            results.append((crawler_name, None))
-            continue
-        
-        success = run_crawler(crawler_name, script_path)
-        results.append((crawler_name, success))
+    try:
+        with ThreadPoolExecutor(max_workers=len(names)) as executor:
+            results = list(zip(names, executor.map(run_source, names)))
+    finally:
+        close_runtime()
     
     # 打印汇总
     print("\n" + "=" * 60)
     print("       运行汇总")
     print("=" * 60)
     
-    for crawler_name, success in results:
-        if success is None:
-            status = "⏭️ 跳过"
-        elif success:
-            status = "✅ 成功"
-        else:
-            status = "❌ 失败"
-        print(f"  {status}  {crawler_name}")
+    for name, success in results:
+        status = "✅ 成功" if success else "❌ 失败"
+        print(f"  {status}  {name}")
     
     print(f"\n结束时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("=" * 60)
+    startup.report()
+    http_client.report()
+    if not all(success for _, success in results):
+        sys.exit(1)
 
 
 if __name__ == "__main__":
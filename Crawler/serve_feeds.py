@@ -0,0 +1,52 @@
+"""
+本地 feed 服务
+从内存提供各爬虫生成的 feed（ETag/304、gzip/brotli、limit/since 参数），feed 重新生成后自动加载
+
+用法:
+    python serve_feeds.py [--host 127.0.0.1] [--port 8080]
+
+    curl -i http://127.0.0.1:8080/binance_blog_feed.xml?limit=10
+    curl -i http://127.0.0.1:8080/binance_square_feed.xml?since=2024-01-01
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common.feed_server import FeedServer, brotli
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PORT = int(os.environ.get('FEED_SERVER_PORT', 8080))
+
+# URL 中的文件名 -> feed 文件
+FEED_FILES = {
+    'binance_blog_feed.xml': os.path.join(BASE_DIR, 'binance', 'feeds', 'binance_blog_feed.xml'),
+    'binance_square_feed.xml': os.path.join(BASE_DIR, 'binance_detail', 'feeds', 'binance_square_feed.xml'),
+}
+
+
+def main():
+    host = '127.0.0.1'
+    port = DEFAULT_PORT
+    if '--host' in sys.argv:
+        host = sys.argv[sys.argv.index('--host') + 1]
+    if '--port' in sys.argv:
+        port = int(sys.argv[sys.argv.index('--port') + 1])
+
+    server = FeedServer(FEED_FILES, host=host, port=port)
+    print("=" * 60)
+    print(f"feed 服务已启动: http://{host}:{server.port}/")
+    for name, path in FEED_FILES.items():
+        print(f"  /{name}{'' if os.path.exists(path) else '（尚未生成）'}")
+    if brotli is None:
+        print("提示: 未安装 brotli，只提供 gzip 压缩")
+    print("=" * 60)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,31 @@
+"""
+来源注册表
+来源名 -> 入口模块；入口模块需提供:
+    INTERVAL                        守护进程中的运行间隔（秒）
+    CONFIG                          来源配置（common.runner.SourceConfig）
+    LOCALES                         （可选）语言列表，第一个为 CONFIG 的语言
+    create_crawler(deadline=None)   创建来源（common.source.Source 子类）
+    run(crawler=None, backfill=False, time_budget=None)   爬取一次并生成 feed
+新增来源时实现一个 Source 子类与对应的 main.py，再在这里登记即可
+"""
+import importlib
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+SOURCES = {
+    'blog': 'binance.main',
+    'square': 'binance_detail.main',
+}
+
+
+def load(name: str):
+    """导入某个来源的入口模块"""
+    return importlib.import_module(SOURCES[name])
+
+
+def configs(module) -> list:
+    """来源各语言的配置（没有 LOCALES 的来源只有 CONFIG 本身）"""
+    config = module.CONFIG
+    return [config.for_locale(locale) for locale in getattr(module, 'LOCALES', [config.language])]
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 与各脚本一样以 Crawler 目录为导入根（from common.xxx import ...）
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,64 @@
+"""RSSGenerator.generate_archived：RFC 5005 归档页写满后不再变化"""
+import os
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from common.article import Article
+from common.rss_generator import RSSGenerator, archive_path
+
+
+def article(day: int, month: int = 1) -> Article:
+    return Article(title=f'Post {month}-{day}', link=f'https://example.com/p/{month}-{day}',
+                   date=f'2024-{month:02d}-{day:02d} 08:00:00', content=f'<p>body {month}-{day}</p>')
+
+
+def titles(path):
+    return [item.findtext('title') for item in ET.parse(path).getroot().iter('item')]
+
+
+def snapshot(path):
+    with open(path, 'rb') as f:
+        return f.read(), os.stat(path).st_mtime_ns
+
+
+@pytest.fixture
+def generator():
+    return RSSGenerator(feed_title='Test', feed_url='https://feeds.example.com/test')
+
+
+def test_full_archive_page_is_unchanged_across_runs(tmp_path, generator):
+    output = str(tmp_path / 'test.xml')
+    articles = [article(day) for day in range(1, 11)]
+    # 10 篇：当前 feed 3 篇，其余 7 篇归档为第 1 页（4 篇，已写满）与第 2 页（3 篇）
+    assert sorted(generator.generate_archived(articles, output, feed_size=3, page_size=4)) == [1, 2]
+    assert titles(archive_path(output, 1)) == ['Post 1-4', 'Post 1-3', 'Post 1-2', 'Post 1-1']
+    page1 = snapshot(archive_path(output, 1))
+
+    # 下一次运行：两篇新文章把当前 feed 里的两篇挤进第 2 页
+    articles += [article(1, month=2), article(2, month=2)]
+    assert generator.generate_archived(articles, output, feed_size=3, page_size=4) == {
+        2: archive_path(output, 2), 3: archive_path(output, 3)}
+    assert snapshot(archive_path(output, 1)) == page1
+    assert titles(output) == ['Post 2-2', 'Post 2-1', 'Post 1-10']
+
+    # 页面丢失时按文章库重新生成，内容与原来的逐字节相同
+    os.remove(archive_path(output, 1))
+    assert list(generator.generate_archived(articles, output, feed_size=3, page_size=4)) == [1]
+    assert snapshot(archive_path(output, 1))[0] == page1[0]
+
+
+def test_bumped_archived_article_stays_on_its_page(tmp_path, generator):
+    output = str(tmp_path / 'test.xml')
+    articles = [article(day) for day in range(1, 8)]
+    generator.generate_archived(articles, output, feed_size=3, page_size=4)
+    page1 = snapshot(archive_path(output, 1))
+
+    # 复查后修改时间变新的归档文章不回到当前 feed，归档页也不重写
+    bumped = articles[0]
+    bumped['date'] = '2024-06-01 00:00:00'
+    bumped['content'] = '<p>edited</p>'
+    assert generator.generate_archived(articles, output, feed_size=3, page_size=4) == {}
+    assert 'Post 1-1' not in titles(output)
+    assert titles(output) == ['Post 1-7', 'Post 1-6', 'Post 1-5']
+    assert snapshot(archive_path(output, 1)) == page1
@@ -0,0 +1,80 @@
+"""common.article：Article 的 dict 接口、二进制格式与 pickle"""
+import pickle
+
+import pytest
+
+from common.article import Article
+
+
+def sample() -> Article:
+    return Article(link='https://example.com/a?utm_source=x', title='标题', description='摘要',
+                   content='<p>正文 ✓</p>', date='2024-05-01 08:00:00', tags=['BTC', 'ETH'], archive_seq=2)
+
+
+def same(a: Article, b: Article):
+    assert a.to_dict() == b.to_dict()
+
+
+def test_dict_protocol():
+    article = sample()
+    assert article['title'] == '标题' and article['tags'] == ['BTC', 'ETH']
+    assert article.get('author') is None and article.get('missing', 1) == 1
+    with pytest.raises(KeyError):
+        article['author']
+    with pytest.raises(KeyError):
+        article['missing']
+    assert 'tags' in article and 'author' not in article
+    article.update({'author': 'A'}, locale='en')
+    assert article['author'] == 'A' and article.locale == 'en'
+    assert len(article) == len(list(article.keys()))
+    assert article.pop('archive_seq') == 2 and 'archive_seq' not in article
+    assert article.canonical_link == 'https://example.com/a'
+    assert article.item_guid == Article(link=article.link).item_guid != Article(link='b').item_guid
+    assert article.updated_at.year == 2024
+
+
+def test_bytes_round_trip_keeps_fields_content_and_extra():
+    article = sample()
+    loaded = Article.from_bytes(article.to_bytes())
+    # 正文读出时保持为 bytes，访问时才解码
+    assert isinstance(loaded._content, bytes)
+    assert loaded.content == '<p>正文 ✓</p>'
+    same(loaded, article)
+
+
+def test_content_equal_to_description_is_stored_once():
+    long = '<p>' + 'x' * 500 + '</p>'
+    article = Article(link='a', description=long, content=long)
+    data = article.to_bytes()
+    assert len(data) < 2 * len(long)
+    loaded = Article.from_bytes(data)
+    assert loaded.content == long and loaded.description == long
+
+
+def test_empty_and_missing_content_survive():
+    assert Article.from_bytes(Article(link='a').to_bytes()).content is None
+    assert Article.from_bytes(Article(link='a', content='').to_bytes()).content == ''
+
+
+def test_non_string_slot_value_round_trips():
+    article = Article(link='a')
+    article['checked_at'] = 1714550400
+    loaded = Article.from_bytes(article.to_bytes())
+    assert loaded['checked_at'] == 1714550400
+
+
+def test_from_bytes_rejects_torn_and_unknown_records():
+    data = sample().to_bytes()
+    for cut in (0, 3, len(data) - 1):
+        with pytest.raises(ValueError):
+            Article.from_bytes(data[:cut])
+    with pytest.raises(ValueError):
+        Article.from_bytes(b'\x09' + data[1:])
+
+
+def test_pickle_uses_binary_format():
+    article = sample()
+    loaded = pickle.loads(pickle.dumps(article))
+    assert isinstance(loaded, Article)
+    same(loaded, article)
+    assert Article.__reduce__(article) == (Article.from_bytes, (article.to_bytes(),))
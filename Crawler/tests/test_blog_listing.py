@@ -0,0 +1,79 @@
+"""binance.crawler.BinanceBlogCrawler.iter_listing：按批翻页，到达水位线时停止"""
+from datetime import datetime, timezone
+
+import pytest
+
+from binance.crawler import BinanceBlogCrawler
+from common.article import Article
+
+WATERMARK = datetime(2024, 3, 1, tzinfo=timezone.utc)
+
+
+def post(n, day, month=3):
+    return Article(title=f'post {n}', link=f'https://www.binance.com/en/blog/p-{n}',
+                   date=f'2024-{month:02d}-{day:02d}')
+
+
+class Listing:
+    """代替浏览器：extract_article_list 返回到目前为止加载的全部批次（与无限滚动一样累积）"""
+
+    def __init__(self, *batches):
+        self.batches = list(batches)
+        self.loaded = 1
+
+    def attach(self, crawler):
+        crawler.fetch_page = lambda url, wait_selector=None: 'page'
+        crawler.extract_article_list = lambda soup: [a for b in self.batches[:self.loaded] for a in b]
+        crawler._load_more = self.load_more
+
+    def load_more(self, url):
+        if self.loaded >= len(self.batches):
+            return None
+        self.loaded += 1
+        return 'page'
+
+
+@pytest.fixture
+def crawler():
+    crawler = BinanceBlogCrawler.__new__(BinanceBlogCrawler)
+    crawler.base_url = 'https://www.binance.com/en/blog'
+    crawler.category_urls = []
+    crawler.deadline = None
+    return crawler
+
+
+def links(articles):
+    return [a['link'].rsplit('-', 1)[1] for a in articles]
+
+
+def test_pinned_old_post_does_not_stop_paging(crawler):
+    listing = Listing([post(0, 1, month=1), post(1, 20), post(2, 19)],
+                      [post(3, 18), post(4, 17)],
+                      [post(5, 2), post(6, 10, month=2)])
+    listing.attach(crawler)
+    assert links(crawler.iter_listing(WATERMARK)) == ['1', '2', '3', '4', '5']
+    assert listing.loaded == 3
+
+
+def test_stops_after_batch_that_crosses_watermark(crawler):
+    listing = Listing([post(1, 20), post(2, 10)],
+                      [post(3, 5), post(4, 10, month=2)],
+                      [post(5, 1, month=2)])
+    listing.attach(crawler)
+    assert links(crawler.iter_listing(WATERMARK)) == ['1', '2', '3']
+    assert listing.loaded == 2
+
+
+def test_stops_when_whole_batch_is_known(crawler):
+    undated = [Article(title=f'u{i}', link=f'https://www.binance.com/en/blog/u-{i}') for i in range(4)]
+    listing = Listing(undated[:2], undated[2:], [post(9, 20)])
+    listing.attach(crawler)
+    known = {a['link'] for a in undated[2:]}
+    assert links(crawler.iter_listing(WATERMARK, known)) == ['0', '1']
+    assert listing.loaded == 2
+
+
+def test_backfill_pages_until_max_batches(crawler):
+    listing = Listing([post(1, 20)], [post(2, 1, month=1)], [post(3, 1, month=1)])
+    listing.attach(crawler)
+    assert links(crawler.iter_listing(None, max_batches=2)) == ['1', '2']
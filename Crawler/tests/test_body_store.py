@@ -0,0 +1,93 @@
+"""common.body_store：按内容哈希去重、压缩字典、清理不再引用的正文"""
+import os
+import random
+
+import pytest
+
+from common import body_store
+from common.article_store import ArticleStore
+from common.body_store import MIN_TRAINING_SAMPLES, BodyStore, body_hash
+
+
+def rich_text(i: int) -> str:
+    rng = random.Random(i)
+    words = ['bitcoin', 'wallet', 'staking', 'rewards', 'liquidity', 'security', 'network', 'users']
+    paragraphs = ''.join(f'<p class="richtext-paragraph css-1x2y3z">{" ".join(rng.choices(words, k=40))}</p>'
+                         for _ in range(8))
+    return f'<div class="richtext-container css-9a8b7c"><h2 class="css-h2">Post {i}</h2>{paragraphs}</div>'
+
+
+def stored_files(root):
+    return sorted(name for _, _, names in os.walk(os.path.join(root, 'objects')) for name in names)
+
+
+def test_put_is_content_addressed_and_deduplicated(tmp_path):
+    store = BodyStore(str(tmp_path))
+    body = '<p>同一篇正文</p>'
+    digest = store.put(body)
+    assert digest == body_hash(body)
+    assert store.put(body) == digest
+    assert stored_files(tmp_path) == [digest + store.extension]
+    assert digest in store
+    assert store.get(digest) == body
+    assert store.get('0' * 64) == ''
+    assert store.get('') == ''
+
+
+def test_gc_removes_unreferenced_bodies(tmp_path):
+    store = BodyStore(str(tmp_path))
+    keep, drop = store.put('<p>keep</p>'), store.put('<p>drop</p>')
+    assert store.gc({keep}) == 1
+    assert list(store.digests()) == [keep]
+    assert drop not in store
+    assert store.stats()['bodies'] == 1
+
+
+def test_zlib_bodies_stay_readable(tmp_path, monkeypatch):
+    monkeypatch.setattr(body_store, 'zstandard', None)
+    digest = BodyStore(str(tmp_path)).put('<p>zlib</p>')
+    assert stored_files(tmp_path) == [digest + '.zz']
+    monkeypatch.undo()
+    assert BodyStore(str(tmp_path)).get(digest) == '<p>zlib</p>'
+
+
+def test_dictionary_is_trained_once_and_old_bodies_stay_readable(tmp_path):
+    pytest.importorskip('zstandard')
+    store = BodyStore(str(tmp_path))
+    before = store.put(rich_text(-1))
+    for i in range(MIN_TRAINING_SAMPLES - 2):
+        store.put(rich_text(i))
+    assert store.ensure_dictionary() == 0
+    store.put(rich_text(MIN_TRAINING_SAMPLES))
+    dict_id = store.ensure_dictionary()
+    assert dict_id
+    assert store.ensure_dictionary() == dict_id
+
+    after = store.put(rich_text(10 ** 6))
+    reopened = BodyStore(str(tmp_path))
+    assert reopened.dict_id == dict_id
+    assert reopened.get(before) == rich_text(-1)
+    assert reopened.get(after) == rich_text(10 ** 6)
+    assert not BodyStore(str(tmp_path), use_dictionary=False).dict_id
+
+
+def test_article_store_keeps_hashes_and_drops_bodies_past_retention(tmp_path):
+    bodies = BodyStore(str(tmp_path / 'bodies'))
+    store = ArticleStore(str(tmp_path / 'articles.json'), bodies, body_retention=2)
+    store.upsert({'link': f'https://example.com/{i}', 'date': f'2024-03-0{i}', 'content': rich_text(i)}
+                 for i in range(1, 4))
+    # 两篇转载的同一正文
+    store.upsert([{'link': 'https://example.com/copy', 'date': '2024-03-04', 'content': rich_text(3)}])
+    store.save()
+
+    reloaded = ArticleStore(str(tmp_path / 'articles.json'), bodies, body_retention=2)
+    newest = reloaded.newest()
+    assert [a.link for a in newest] == ['https://example.com/copy', 'https://example.com/3',
+                                       'https://example.com/2', 'https://example.com/1']
+    assert all(a.get('content') is None and a.body for a in newest)
+    assert newest[0].body == newest[1].body
+    assert reloaded.content(newest[0]) == rich_text(3)
+    # 超出保留数量的文章保留记录（仍算已完成），正文被清理
+    assert reloaded.content(newest[2]) == ''
+    assert bodies.stats()['bodies'] == 1
+    assert 'https://example.com/1' in reloaded.completed_links()
@@ -0,0 +1,69 @@
+"""common.checkpoint：二进制断点日志，崩溃时写了一半的记录不影响之后的记录"""
+import json
+import os
+import struct
+
+from common.article import Article
+from common.checkpoint import CheckpointJournal
+
+
+def done(n: int) -> Article:
+    return Article(link=f'https://example.com/{n}', title=f'Post {n}', content=f'<p>{n}</p>')
+
+
+def torn_record(article: Article, keep: int) -> bytes:
+    record = article.to_bytes()
+    return (struct.pack('<I', len(record)) + record)[:keep]
+
+
+def test_round_trip_keeps_last_version_of_each_link(tmp_path):
+    journal = CheckpointJournal(str(tmp_path / 'state' / 'blog.journal'))
+    journal.append(done(1))
+    journal.append({'link': 'https://example.com/2', 'title': 'dict', 'content': 'x'})
+    journal.append(Article(link='https://example.com/1', title='Post 1 (edited)', content='<p>edited</p>'))
+    loaded = journal.load()
+    assert [a.link for a in loaded] == ['https://example.com/1', 'https://example.com/2']
+    assert loaded[0].title == 'Post 1 (edited)' and loaded[0].content == '<p>edited</p>'
+    assert journal.completed_links() == {'https://example.com/1', 'https://example.com/2'}
+
+
+def test_torn_record_followed_by_good_record(tmp_path):
+    path = str(tmp_path / 'blog.journal')
+    CheckpointJournal(path).append(done(1))
+    size = os.path.getsize(path)
+    # 进程在写第二条记录时崩溃
+    with open(path, 'ab') as f:
+        f.write(torn_record(done(2), keep=11))
+
+    # 重启后继续追加
+    journal = CheckpointJournal(path)
+    journal.append(done(3))
+    assert [a.link for a in journal.load()] == ['https://example.com/1', 'https://example.com/3']
+    assert os.path.getsize(path) == size + len(torn_record(done(3), keep=10 ** 6))
+
+
+def test_load_truncates_torn_length_prefix(tmp_path):
+    path = str(tmp_path / 'blog.journal')
+    CheckpointJournal(path).append(done(1))
+    size = os.path.getsize(path)
+    with open(path, 'ab') as f:
+        f.write(b'\x20\x00')
+    journal = CheckpointJournal(path)
+    assert [a.link for a in journal.load()] == ['https://example.com/1']
+    assert os.path.getsize(path) == size
+    journal.append(done(2))
+    assert len(CheckpointJournal(path).load()) == 2
+
+
+def test_legacy_jsonl_is_read_and_cleared(tmp_path):
+    path = str(tmp_path / 'blog.journal')
+    legacy = str(tmp_path / 'blog.jsonl')
+    with open(legacy, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'link': 'https://example.com/old', 'content': 'old'}) + '\n')
+        f.write('{"link": "https://example.com/half"\n')
+    journal = CheckpointJournal(path)
+    journal.append(done(1))
+    assert [a.link for a in journal.load()] == ['https://example.com/old', 'https://example.com/1']
+    journal.clear()
+    assert journal.load() == []
+    assert not os.path.exists(path) and not os.path.exists(legacy)
@@ -0,0 +1,132 @@
+"""common.feed_formats：一次遍历写出 RSS / Atom / JSON Feed"""
+import json
+import os
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+
+import pytest
+
+from common.feed_formats import (NS_ATOM, NS_CONTENT, FeedEntry, FeedMeta, content_html, output_paths,
+                                 sanitize, write_feeds)
+
+BUILT = datetime(2024, 3, 2, 12, 0, tzinfo=timezone.utc)
+ATOM = f'{{{NS_ATOM}}}'
+
+
+def entries(count=3):
+    for i in range(count, 0, -1):
+        date = datetime(2024, 3, i, 8, 0, tzinfo=timezone.utc)
+        yield FeedEntry(id=f'id-{i}', title=f'Post {i} <b>&</b>\x0b', link=f'https://example.com/p/{i}',
+                        date=date, updated=date.replace(hour=9) if i == 2 else None,
+                        description=f'summary {i}', content=f'<p>body {i}</p>', author='Binance',
+                        category='Markets' if i % 2 else '')
+
+
+@pytest.fixture
+def meta():
+    return FeedMeta(title='Test Feed', description='desc', link='https://example.com/blog',
+                    generator='tests', feed_url='https://feeds.example.com/test',
+                    hub='https://hub.example.com/')
+
+
+@pytest.fixture
+def written(tmp_path, meta):
+    paths = write_feeds(meta, entries(), output_paths(str(tmp_path / 'test.xml')), built=BUILT)
+    return paths
+
+
+def test_writes_every_format_from_one_pass(tmp_path, meta):
+    consumed = []
+
+    def once():
+        for entry in entries():
+            consumed.append(entry.id)
+            yield entry
+
+    paths = write_feeds(meta, once(), output_paths(str(tmp_path / 'test.xml')), built=BUILT)
+    assert consumed == ['id-3', 'id-2', 'id-1']
+    assert paths == {'rss': str(tmp_path / 'test.xml'), 'atom': str(tmp_path / 'test.atom'),
+                     'json': str(tmp_path / 'test.json')}
+    assert sorted(os.listdir(tmp_path)) == ['test.atom', 'test.json', 'test.xml']
+
+
+def test_rss(written):
+    channel = ET.parse(written['rss']).getroot().find('channel')
+    assert channel.findtext('title') == 'Test Feed'
+    assert channel.findtext('lastBuildDate') == 'Sat, 02 Mar 2024 12:00:00 +0000'
+    links = {link.get('rel'): link.get('href') for link in channel.iter(f'{ATOM}link')}
+    assert links == {'self': 'https://feeds.example.com/test.xml', 'hub': 'https://hub.example.com/'}
+    items = channel.findall('item')
+    assert [item.findtext('title') for item in items] == ['Post 3 <b>&</b>', 'Post 2 <b>&</b>', 'Post 1 <b>&</b>']
+    assert items[0].findtext(f'{{{NS_CONTENT}}}encoded') == '<p>body 3</p>'
+    assert items[0].findtext('category') == 'Markets'
+    assert items[1].find('category') is None
+    # 修改过的条目以修改时间作为 pubDate
+    assert items[1].findtext('pubDate') == 'Sat, 02 Mar 2024 09:00:00 +0000'
+
+
+def test_atom(written):
+    feed = ET.parse(written['atom']).getroot()
+    assert feed.findtext(f'{ATOM}id') == 'https://feeds.example.com/test.atom'
+    assert feed.findtext(f'{ATOM}updated') == '2024-03-02T12:00:00Z'
+    entry = feed.findall(f'{ATOM}entry')[1]
+    assert entry.findtext(f'{ATOM}published') == '2024-03-02T08:00:00Z'
+    assert entry.findtext(f'{ATOM}updated') == '2024-03-02T09:00:00Z'
+    assert entry.findtext(f'{ATOM}content') == '<p>body 2</p>'
+    assert entry.find(f'{ATOM}author').findtext(f'{ATOM}name') == 'Binance'
+
+
+def test_json_feed(written):
+    with open(written['json'], encoding='utf-8') as f:
+        feed = json.load(f)
+    assert feed['version'] == 'https://jsonfeed.org/version/1.1'
+    assert feed['feed_url'] == 'https://feeds.example.com/test.json'
+    assert feed['hubs'] == [{'type': 'WebSub', 'url': 'https://hub.example.com/'}]
+    assert [item['id'] for item in feed['items']] == ['id-3', 'id-2', 'id-1']
+    assert feed['items'][0]['tags'] == ['Markets']
+    assert feed['items'][1]['date_modified'] == '2024-03-02T09:00:00Z'
+
+
+def test_plain_feed_has_no_paging_namespaces(tmp_path):
+    meta = FeedMeta(title='T', description='d', link='https://example.com')
+    paths = write_feeds(meta, entries(1), output_paths(str(tmp_path / 'plain.xml'), ('rss', 'json')))
+    with open(paths['rss'], encoding='utf-8') as f:
+        assert 'xmlns:atom' not in f.read()
+    with open(paths['json'], encoding='utf-8') as f:
+        assert 'feed_url' not in json.load(f)
+
+
+def test_archive_links(tmp_path):
+    meta = FeedMeta(title='T', description='d', link='https://example.com', archive=True,
+                    links={'current': '../test', 'prev-archive': 'page-1'})
+    paths = write_feeds(meta, entries(1), output_paths(str(tmp_path / 'page-2.xml')))
+    channel = ET.parse(paths['rss']).getroot().find('channel')
+    links = {link.get('rel'): link.get('href') for link in channel.iter(f'{ATOM}link')}
+    assert links == {'current': '../test.xml', 'prev-archive': 'page-1.xml'}
+    assert channel.find('{http://purl.org/syndication/history/1.0}archive') is not None
+    with open(paths['json'], encoding='utf-8') as f:
+        feed = json.load(f)
+    assert feed['next_url'] == 'page-1.json'
+    assert feed['_rfc5005'] == {'current': '../test.json', 'prev-archive': 'page-1.json', 'archive': True}
+
+
+def test_failed_write_keeps_previous_files(tmp_path, meta, written):
+    with open(written['rss'], encoding='utf-8') as f:
+        before = f.read()
+
+    def broken():
+        yield next(entries())
+        raise RuntimeError('boom')
+
+    with pytest.raises(RuntimeError):
+        write_feeds(meta, broken(), output_paths(str(tmp_path / 'test.xml')))
+    with open(written['rss'], encoding='utf-8') as f:
+        assert f.read() == before
+    assert sorted(os.listdir(tmp_path)) == ['test.atom', 'test.json', 'test.xml']
+
+
+def test_sanitize_and_content_html():
+    assert sanitize('a\x00b\x1fc\ufffe') == 'abc'
+    assert sanitize(None) == ''
+    assert content_html('line <one>\nline two') == '<p>line &lt;one&gt;</p><p>line two</p>'
+    assert content_html(' <p>html</p>\x0b ') == '<p>html</p>'
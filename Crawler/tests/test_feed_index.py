@@ -0,0 +1,66 @@
+"""common.feed_index：标签提取与缓存、倒排索引与子 feed"""
+from common.article import Article
+from common.feed_index import Tagger, TagIndex, slugify, write_sub_feeds
+
+ARTICLES = [
+    {'title': 'Binance Will Delist ABC', 'category': 'Announcements', 'fingerprint': 'f0',
+     'content': '<a href="/en/trade/ABC_USDT?contentId=1">ABC</a>'},
+    {'title': 'Weekly Market Report', 'category': 'Markets', 'fingerprint': 'f1',
+     'content': 'BTC and $SOL led, $ETH lagged; price $100'},
+    {'title': 'New Listing: SOL Futures', 'description': 'USDⓈ-M perpetual contract', 'category': 'Announcements',
+     'fingerprint': 'f2', 'content': '<a href="/en/futures/SOLUSDT">SOL</a>'},
+    {'title': 'Security Tips', 'category': 'Security', 'fingerprint': 'f3', 'content': 'stay safe'},
+]
+
+
+def test_extract_tags():
+    tagger = Tagger()
+    assert tagger.extract(ARTICLES[0]) == ['category:announcements', 'ticker:ABC', 'topic:delisting']
+    assert tagger.extract(ARTICLES[1]) == ['category:markets', 'ticker:ETH', 'ticker:SOL']
+    assert tagger.extract(ARTICLES[2]) == ['category:announcements', 'topic:futures', 'topic:listing']
+    assert Tagger(topics={}).extract(ARTICLES[0]) == ['category:announcements', 'ticker:ABC']
+
+
+def test_tags_are_cached_until_fingerprint_or_topics_change():
+    loads = []
+
+    def load(article):
+        loads.append(article['fingerprint'])
+        return ARTICLES[0]['content']
+
+    article = Article.from_dict(dict(ARTICLES[0], content=None))
+    tagger = Tagger()
+    assert tagger.tags(article, load) == ['category:announcements', 'ticker:ABC', 'topic:delisting']
+    assert tagger.tags(article, load) == article['tags']
+    assert loads == ['f0']
+
+    article['fingerprint'] = 'f0-edited'
+    tagger.tags(article, load)
+    assert loads == ['f0', 'f0-edited']
+
+    assert Tagger(topics={'security': 'secur'}).tags(article, load) == ['category:announcements', 'ticker:ABC']
+    assert len(loads) == 3
+
+
+def test_index_select_merges_postings_newest_first():
+    index = TagIndex([dict(a) for a in ARTICLES], Tagger())
+    assert index.counts()['category:announcements'] == 2
+    titles = [a['title'] for a in index.select(['ticker:SOL', 'category:announcements', 'topic:futures'])]
+    assert titles == ['Binance Will Delist ABC', 'Weekly Market Report', 'New Listing: SOL Futures']
+    assert [a['title'] for a in index.select(['category:announcements'], limit=1)] == ['Binance Will Delist ABC']
+    assert index.select(['ticker:DOGE']) == []
+
+
+def test_write_sub_feeds_skips_empty_feeds(tmp_path):
+    index = TagIndex([dict(a) for a in ARTICLES], Tagger())
+    generated = {}
+
+    def generate(articles, output_file, name):
+        generated[name] = (output_file, [a['fingerprint'] for a in articles])
+
+    written = write_sub_feeds(index, {'SOL & ETH': ['ticker:SOL', 'ticker:ETH'], 'doge': ['ticker:DOGE'],
+                                      'security': ['category:security']}, str(tmp_path), generate, limit=5)
+    assert written == {'SOL & ETH': str(tmp_path / 'sol-eth.xml'), 'security': str(tmp_path / 'security.xml')}
+    assert generated['SOL & ETH'][1] == ['f1']
+    assert generated['security'][1] == ['f3']
+    assert slugify(' Spot / Margin ') == 'spot-margin'
@@ -0,0 +1,96 @@
+"""common.feed_server：ETag/304、压缩版本与 limit/since 参数"""
+import gzip
+import os
+import urllib.error
+import urllib.request
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from common.feed_server import FeedServer
+from common.rss_generator import RSSGenerator
+
+ARTICLES = [
+    {'title': f'Article {i}', 'link': f'https://example.com/a/{i}',
+     'date': f'2024-01-0{i} 00:00:00', 'description': f'summary {i}', 'content': f'<p>body {i}</p>'}
+    for i in range(1, 6)
+]
+
+
+def _generate(path, articles=ARTICLES):
+    RSSGenerator(feed_title='Test').generate_rss(articles, path, formats=('rss',))
+    # 保证重新生成后修改时间一定变化（文件系统时间精度可能较粗）
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+def _get(server, path, headers=None):
+    request = urllib.request.Request(f'http://127.0.0.1:{server.port}/{path}', headers=headers or {})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+def _titles(body):
+    return [item.findtext('title') for item in ET.fromstring(body).iter('item')]
+
+
+@pytest.fixture
+def served(tmp_path):
+    path = str(tmp_path / 'feed.xml')
+    _generate(path)
+    server = FeedServer({'feed.xml': path}, port=0)
+    server.start()
+    try:
+        yield server, path
+    finally:
+        server.stop()
+
+
+def test_if_none_match_returns_304(served):
+    server, _ = served
+    status, headers, body = _get(server, 'feed.xml')
+    assert status == 200 and len(_titles(body)) == 5
+    etag = headers['ETag']
+
+    status, headers, body = _get(server, 'feed.xml', {'If-None-Match': etag})
+    assert status == 304
+    assert headers['ETag'] == etag
+    assert body == b''
+
+
+def test_etag_stable_when_regenerated_with_same_items(served):
+    server, path = served
+    etag = _get(server, 'feed.xml')[1]['ETag']
+
+    _generate(path)
+    status, headers, _ = _get(server, 'feed.xml', {'If-None-Match': etag})
+    assert status == 304
+    assert headers['ETag'] == etag
+
+    _generate(path, ARTICLES + [dict(ARTICLES[0], title='Article 6', link='https://example.com/a/6',
+                                     date='2024-01-06 00:00:00')])
+    status, headers, _ = _get(server, 'feed.xml', {'If-None-Match': etag})
+    assert status == 200
+    assert headers['ETag'] != etag
+
+
+def test_gzip_variant(served):
+    server, _ = served
+    plain = _get(server, 'feed.xml')[2]
+    status, headers, body = _get(server, 'feed.xml', {'Accept-Encoding': 'gzip'})
+    assert status == 200
+    assert headers['Content-Encoding'] == 'gzip'
+    assert headers['Vary'] == 'Accept-Encoding'
+    assert gzip.decompress(body) == plain
+
+
+def test_limit_and_since(served):
+    server, _ = served
+    assert _titles(_get(server, 'feed.xml?limit=2')[2]) == ['Article 5', 'Article 4']
+    assert _titles(_get(server, 'feed.xml?since=2024-01-03')[2]) == ['Article 5', 'Article 4']
+    assert _titles(_get(server, 'feed.xml?limit=1&since=2024-01-02')[2]) == ['Article 5']
+    assert _get(server, 'feed.xml?limit=-1')[0] == 400
+    assert _get(server, 'missing.xml')[0] == 404
@@ -0,0 +1,123 @@
+"""common.fetch_result：结果分类、按类别重试与熔断器"""
+import time
+import types
+
+import pytest
+
+from common import fetch_result
+from common.fetch_result import (CircuitBreaker, FetchStatus, classify_exception, classify_page,
+                                 fetch_with_policy)
+from common.rate_limiter import HostBudget, RateLimiter
+
+URL = 'https://www.example.com/en/blog/post-1'
+ARTICLE = '<html><title>Post</title><body>' + 'text ' * 100 + '</body></html>'
+
+
+class InvalidSessionIdException(Exception):
+    pass
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """记录重试前的等待而不真的等待"""
+    sleeps = []
+    monkeypatch.setattr(fetch_result, 'time', types.SimpleNamespace(time=time.time, sleep=sleeps.append))
+    return sleeps
+
+
+def loader(*outcomes):
+    """按顺序返回给定结果的 load 函数，异常实例会被抛出；calls 记录每次的 reload 参数"""
+    outcomes = list(outcomes)
+
+    def load(reload):
+        load.calls.append(reload)
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+    load.calls = []
+    return load
+
+
+@pytest.mark.parametrize('html, current_url, has_content, expected', [
+    (ARTICLE, URL, True, FetchStatus.OK),
+    (ARTICLE, URL, False, FetchStatus.EMPTY),
+    ('', URL, True, FetchStatus.EMPTY),
+    ('<html><title>Access Denied</title></html>', URL, True, FetchStatus.BLOCKED),
+    ('<html><title>404 | Binance</title></html>', URL, False, FetchStatus.NOT_FOUND),
+    (ARTICLE, 'https://www.example.com/en/404', False, FetchStatus.NOT_FOUND),
+])
+def test_classify_page(html, current_url, has_content, expected):
+    assert classify_page(html, current_url, has_content) == expected
+
+
+def test_classify_exception():
+    assert classify_exception(InvalidSessionIdException('gone')) == FetchStatus.DRIVER_DEAD
+    assert classify_exception(RuntimeError('chrome not reachable')) == FetchStatus.DRIVER_DEAD
+    assert classify_exception(TimeoutError('Timed out receiving message')) == FetchStatus.TIMEOUT
+
+
+def test_circuit_breaker_opens_after_consecutive_blocks():
+    breaker = CircuitBreaker(threshold=2)
+    breaker.record(URL, FetchStatus.BLOCKED)
+    breaker.record(URL, FetchStatus.OK)
+    breaker.record(URL, FetchStatus.BLOCKED)
+    assert breaker.allow(URL)
+    # 浏览器失效不打断连续拦截计数
+    breaker.record(URL, FetchStatus.DRIVER_DEAD)
+    breaker.record(URL, FetchStatus.BLOCKED)
+    assert breaker.is_open(URL)
+    assert breaker.allow('https://other.example.com/')
+    breaker.reset()
+    assert breaker.allow(URL)
+
+
+def test_empty_page_is_re_read_without_reload(sleeps):
+    load = loader((ARTICLE, False, URL), (ARTICLE, True, URL))
+    result = fetch_with_policy(URL, load)
+    assert result.ok and result.attempts == 2
+    assert load.calls == [True, False]
+    assert sleeps == [3.0]
+
+
+def test_timeouts_are_retried_up_to_policy(sleeps):
+    load = loader(TimeoutError('t1'), TimeoutError('t2'), TimeoutError('t3'), (ARTICLE, True, URL))
+    result = fetch_with_policy(URL, load, max_attempts=5)
+    assert result.status == FetchStatus.TIMEOUT
+    assert result.attempts == 3
+    assert result.error == 't3'
+
+
+def test_not_found_and_blocked_are_not_retried(sleeps):
+    result = fetch_with_policy(URL, loader(('<title>404</title>', False, URL)))
+    assert result.status == FetchStatus.NOT_FOUND and result.attempts == 1
+    result = fetch_with_policy(URL, loader(('<title>Just a moment...</title>', False, URL)))
+    assert result.status == FetchStatus.BLOCKED and result.attempts == 1
+
+
+def test_driver_dead_restarts_once(sleeps):
+    restarts = []
+    load = loader(InvalidSessionIdException('invalid session id'), (ARTICLE, True, URL))
+    result = fetch_with_policy(URL, load, restart=lambda: restarts.append(1))
+    assert result.ok
+    assert restarts == [1]
+
+
+def test_max_attempts_caps_all_retries(sleeps):
+    load = loader(TimeoutError('t'), (ARTICLE, False, URL), (ARTICLE, True, URL))
+    result = fetch_with_policy(URL, load, max_attempts=2)
+    assert result.status == FetchStatus.EMPTY and result.attempts == 2
+
+
+def test_open_breaker_fails_fast_and_limiter_is_fed(sleeps):
+    breaker = CircuitBreaker(threshold=1)
+    limiter = RateLimiter(default=HostBudget(rate=100.0, burst=10, cooldown=0.0))
+    blocked = ('<title>Access Denied</title>', False, URL)
+    assert fetch_with_policy(URL, loader(blocked), rate_limiter=limiter, circuit_breaker=breaker).status == FetchStatus.BLOCKED
+    assert limiter.snapshot()['www.example.com'] == pytest.approx(50.0)
+
+    load = loader((ARTICLE, True, URL))
+    result = fetch_with_policy(URL, load, circuit_breaker=breaker)
+    assert result.status == FetchStatus.BLOCKED and result.attempts == 0
+    assert load.calls == []
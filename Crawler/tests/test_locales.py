@@ -0,0 +1,69 @@
+"""common.locales 与 runner.run_locales：按 content ID 分组、共享元数据、并发抓取正文"""
+from common import runner
+from common.article import Article
+from common.locales import content_id, group_by_content, localize, share_metadata
+
+
+def blog_link(locale, n):
+    return f'https://www.binance.com/{locale}/blog/markets/post-title-42149982468490346{n}'
+
+
+def test_content_id_and_localize():
+    assert content_id(blog_link('en', 1)) == content_id(blog_link('zh-CN', 1)) == '421499824684903461'
+    assert content_id('https://www.binance.com/pt-BR/blog/markets/') == 'https://www.binance.com/blog/markets'
+    assert localize(blog_link('en', 1), 'pt-BR') == blog_link('pt-BR', 1)
+    assert localize('https://example.com/blog', 'fr') == 'https://example.com/blog'
+
+
+def test_group_and_share_metadata():
+    groups = group_by_content({
+        'en': [{'link': blog_link('en', 1), 'date': '2024-03-01', 'image_url': 'cover.png'},
+               {'link': blog_link('en', 2), 'category': 'Markets'}],
+        'zh-CN': [Article(link=blog_link('zh-CN', 1), category='市场'), Article(link=blog_link('zh-CN', 3))],
+    })
+    assert list(groups) == ['421499824684903461', '421499824684903462', '421499824684903463']
+    group = groups['421499824684903461']
+    assert all(isinstance(a, Article) for a in group.values())
+    assert group['zh-CN'].locale == 'zh-CN'
+    share_metadata(group)
+    assert group['zh-CN'].date == '2024-03-01'
+    assert group['zh-CN'].image_url == 'cover.png'
+    # 主语言缺失的字段也从其他语言补全
+    assert group['en'].category == '市场' and group['zh-CN'].category == '市场'
+
+
+class FakeSource:
+    tabs = 1
+
+    def __init__(self, locale, fetched):
+        self.locale = locale
+        self.fetched = fetched
+
+    def discover(self, max_articles, skip_links, known_lastmod, watermark):
+        links = [blog_link(self.locale, 1), 'https://www.binance.com/en/blog/markets/shared-421499824684903469']
+        return [Article(title=f'{self.locale} {i}', link=link, date=f'2024-03-0{i + 1}') for i, link in enumerate(links)]
+
+    def iter_article_details(self, articles, fetch_content=True, tabs=None):
+        for article in articles:
+            self.fetched.append((article.link, tabs))
+            article['content'] = f'<p>{article.link}</p>'
+            yield article
+
+    def fetch_content(self, link):
+        return ''
+
+
+def test_run_locales_fetches_shared_pages_once_in_a_tab_pool(tmp_path):
+    config = runner.SourceConfig(name='blog', output_file=str(tmp_path / 'feeds' / 'blog.xml'),
+                                 checkpoint_file=str(tmp_path / 'state' / 'blog.journal'),
+                                 store_file=str(tmp_path / 'state' / 'blog.json'), feed_title='Blog',
+                                 feed_description='d', feed_link='https://www.binance.com/en/blog',
+                                 default_author='Binance', locale_tabs=4)
+    fetched = []
+    assert runner.run_locales(config, ['en', 'zh-CN'], lambda deadline, locale: FakeSource(locale, fetched))
+    # 两个语言指向同一链接的文章只抓一次，全部文章在 locale_tabs 个标签页里抓取
+    assert sorted(link for link, _ in fetched) == sorted([
+        blog_link('en', 1), blog_link('zh-CN', 1), 'https://www.binance.com/en/blog/markets/shared-421499824684903469'])
+    assert {tabs for _, tabs in fetched} == {4}
+    assert (tmp_path / 'feeds' / 'blog.xml').exists()
+    assert (tmp_path / 'feeds' / 'blog_zh-CN.xml').exists()
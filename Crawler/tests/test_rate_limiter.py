@@ -0,0 +1,107 @@
+"""common.rate_limiter：令牌桶、AIMD 调速与拦截冷却"""
+import types
+
+import pytest
+
+from common import rate_limiter
+from common.rate_limiter import HostBudget, RateLimiter, is_block_page
+
+URL = 'https://www.example.com/a'
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter, 'time', types.SimpleNamespace(monotonic=clock.monotonic, sleep=clock.sleep))
+    return clock
+
+
+def test_token_bucket_allows_burst_then_refills(clock):
+    limiter = RateLimiter({'www.example.com': HostBudget(rate=2.0, burst=2)})
+    assert limiter.try_acquire(URL)
+    assert limiter.try_acquire(URL)
+    assert not limiter.try_acquire(URL)
+    clock.now += 0.5
+    assert limiter.try_acquire(URL)
+    # acquire 在令牌不足时等待 1/rate 秒
+    assert limiter.acquire(URL) == pytest.approx(0.5)
+
+
+def test_hosts_have_separate_buckets(clock):
+    limiter = RateLimiter(default=HostBudget(rate=1.0, burst=1))
+    assert limiter.try_acquire('https://a.example.com/')
+    assert not limiter.try_acquire('https://a.example.com/')
+    assert limiter.try_acquire('https://b.example.com/')
+
+
+def test_additive_increase_is_capped(clock):
+    limiter = RateLimiter(default=HostBudget(rate=1.0, max_rate=1.25, increase=0.1))
+    for _ in range(10):
+        limiter.success(URL)
+    assert limiter.snapshot()['www.example.com'] == pytest.approx(1.25)
+
+
+def test_failure_slows_down_without_cooldown(clock):
+    limiter = RateLimiter(default=HostBudget(rate=1.0, decrease=0.5))
+    limiter.failure(URL)
+    assert limiter.snapshot()['www.example.com'] == pytest.approx(0.75)
+    assert limiter.try_acquire(URL)
+
+
+def test_throttled_halves_rate_and_pauses(clock):
+    limiter = RateLimiter(default=HostBudget(rate=2.0, min_rate=0.5, decrease=0.5, cooldown=30.0))
+    limiter.throttled(URL)
+    assert limiter.snapshot()['www.example.com'] == pytest.approx(1.0)
+    clock.now += 29.0
+    assert not limiter.try_acquire(URL)
+    clock.now += 2.0
+    assert limiter.try_acquire(URL)
+
+    limiter.throttled(URL)
+    limiter.throttled(URL)
+    assert limiter.snapshot()['www.example.com'] == pytest.approx(0.5)
+
+
+def test_record_status_honours_retry_after(clock):
+    limiter = RateLimiter(default=HostBudget(rate=1.0, cooldown=30.0))
+    limiter.record_status(URL, 429, retry_after=5.0)
+    clock.now += 4.0
+    assert not limiter.try_acquire(URL)
+    clock.now += 2.0
+    assert limiter.try_acquire(URL)
+
+    rate = limiter.snapshot()['www.example.com']
+    limiter.record_status(URL, 503)
+    assert limiter.snapshot()['www.example.com'] < rate
+    rate = limiter.snapshot()['www.example.com']
+    limiter.record_status(URL, 200)
+    assert limiter.snapshot()['www.example.com'] > rate
+
+
+def test_configure_keeps_learned_rate_and_cooldown(clock):
+    limiter = RateLimiter(default=HostBudget(rate=1.0, cooldown=30.0))
+    limiter.throttled(URL)
+    limiter.configure({'www.example.com': HostBudget(rate=3.0, min_rate=0.2, max_rate=3.0)})
+    assert limiter.snapshot()['www.example.com'] == pytest.approx(0.5)
+    assert not limiter.try_acquire(URL)
+
+    limiter.configure({'www.example.com': HostBudget(rate=3.0, min_rate=0.8)})
+    assert limiter.snapshot()['www.example.com'] == pytest.approx(0.8)
+
+
+def test_block_page_detection():
+    assert is_block_page('<html><title>Access Denied</title></html>')
+    assert is_block_page('<html><body>Please complete the captcha</body></html>')
+    assert not is_block_page('<html><title>Blog</title><body>' + 'x' * 30000 + 'captcha</body></html>')
+    assert not is_block_page('')
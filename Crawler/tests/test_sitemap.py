@@ -0,0 +1,111 @@
+"""common.sitemap：流式解析索引与子 sitemap，按 URL 规则与 lastmod 筛选"""
+import gzip
+import io
+import re
+from datetime import datetime, timezone
+
+from common import sitemap
+
+NS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+INDEX = 'https://example.com/sitemap.xml'
+
+
+def urlset(*entries):
+    urls = ''.join(f'<url><loc>{loc}</loc><lastmod>{lastmod}</lastmod></url>' for loc, lastmod in entries)
+    return f'<?xml version="1.0" encoding="UTF-8"?><urlset {NS}>{urls}</urlset>'.encode()
+
+
+class Response:
+    def __init__(self, body: bytes):
+        self.raw = io.BytesIO(body)
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class StaticClient:
+    """按 URL 返回固定内容的 HTTP 客户端，记录请求过的 URL"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requested = []
+        self.responses = []
+
+    def get_stream(self, url):
+        self.requested.append(url)
+        if url not in self.pages:
+            raise IOError(f'404 {url}')
+        response = Response(self.pages[url])
+        self.responses.append(response)
+        return response
+
+
+def blog(n):
+    return f'https://www.binance.com/en/blog/markets/post-{n}'
+
+
+PAGES = {
+    INDEX: (f'<sitemapindex {NS}>'
+            '<sitemap><loc>https://example.com/sitemap-blog-1.xml.gz</loc></sitemap>'
+            '<sitemap><loc>https://example.com/sitemap-blog-2.xml</loc></sitemap>'
+            '<sitemap><loc>https://example.com/sitemap-futures.xml</loc></sitemap>'
+            '</sitemapindex>').encode(),
+    'https://example.com/sitemap-blog-1.xml.gz': gzip.compress(urlset(
+        (blog(1), '2024-03-01'),
+        (blog(2), '2024-03-05T10:00:00+00:00'),
+        ('https://www.binance.com/en/blog/markets', '2024-03-09'),
+    )),
+    'https://example.com/sitemap-blog-2.xml': urlset(
+        (blog(3), '2024-02-01'),
+        (blog(4), '2024-03-07'),
+        (blog(5), ''),
+    ),
+    'https://example.com/sitemap-futures.xml': urlset(('https://www.binance.com/en/futures/x', '2024-03-09')),
+}
+
+
+def test_iter_entries_follows_matching_children_and_closes_streams():
+    client = StaticClient(PAGES)
+    entries = list(sitemap.iter_entries(INDEX, child_pattern='blog', client=client))
+    assert [loc for loc, _ in entries] == [blog(1), blog(2), 'https://www.binance.com/en/blog/markets',
+                                         blog(3), blog(4), blog(5)]
+    assert 'https://example.com/sitemap-futures.xml' not in client.requested
+    assert all(response.closed for response in client.responses)
+
+
+def test_broken_child_sitemap_is_skipped():
+    pages = dict(PAGES)
+    del pages['https://example.com/sitemap-blog-1.xml.gz']
+    entries = list(sitemap.iter_entries(INDEX, child_pattern='blog', client=StaticClient(pages)))
+    assert [loc for loc, _ in entries] == [blog(3), blog(4), blog(5)]
+
+
+def test_discover_returns_newest_posts_first_up_to_max():
+    articles = sitemap.discover(sitemap.BLOG_POST_PATTERN, INDEX, child_pattern='blog',
+                                max_articles=3, client=StaticClient(PAGES))
+    assert [a.link for a in articles] == [blog(4), blog(2), blog(1)]
+    assert articles[1].lastmod == '2024-03-05T10:00:00+00:00'
+    assert articles[0].title == '' and articles[0].date == ''
+
+
+def test_discover_filters_by_known_lastmod_and_since():
+    known = {
+        blog(1): '2024-03-01',              # 没有更新
+        blog(2): '2024-03-01',              # lastmod 更新了，重新抓取
+        blog(4): '',                        # 没有记录 lastmod，不再抓取
+    }
+    since = datetime(2024, 2, 15, tzinfo=timezone.utc)
+    articles = sitemap.discover(sitemap.BLOG_POST_PATTERN, INDEX, child_pattern='blog',
+                                known=known, since=since, client=StaticClient(PAGES))
+    # blog 3 早于 since；blog 5 没有 lastmod，不能按时间排除
+    assert [a.link for a in articles] == [blog(2), blog(5)]
+
+
+def test_post_patterns():
+    assert re.search(sitemap.BLOG_POST_PATTERN, blog(1))
+    assert not re.search(sitemap.BLOG_POST_PATTERN, 'https://www.binance.com/en/blog/markets')
+    assert re.search(sitemap.SQUARE_POST_PATTERN, 'https://www.binance.com/en/square/post/123456')
+    assert re.search(sitemap.SQUARE_POST_PATTERN, 'https://www.binance.com/en/square/news/btc-rallies-98765')
+    assert not re.search(sitemap.SQUARE_POST_PATTERN, 'https://www.binance.com/en/square/profile/someone')
+    assert sitemap.title_from_link(blog(7) + '-421499824684903463') == 'Post 7'
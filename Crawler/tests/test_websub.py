@@ -0,0 +1,78 @@
+"""common.websub：WebSubState 只通知有变化的 feed，publish 失败时重试"""
+import os
+
+import pytest
+
+from common.http_client import HttpClient
+from common.websub import RecordingHub, WebSubState
+
+BASE_URL = 'https://example.github.io/feeds/'
+ARTICLES = [{'link': f'https://example.com/a/{i}', 'date': f'2024-01-0{i}', 'fingerprint': f'f{i}'}
+            for i in range(1, 4)]
+
+
+@pytest.fixture
+def hub():
+    hub = RecordingHub(fail_first=2)
+    yield hub
+    hub.close()
+
+
+@pytest.fixture
+def client():
+    client = HttpClient(max_retries=3, backoff_base=0.01, backoff_max=0.05)
+    yield client
+    client.close()
+
+
+def _state(tmp_path):
+    return WebSubState(str(tmp_path / 'websub.json'), BASE_URL, str(tmp_path), formats=('rss', 'atom'))
+
+
+def test_flush_retries_and_posts_only_changed_feeds(tmp_path, hub, client):
+    main_feed = str(tmp_path / 'feed.xml')
+    sub_feed = str(tmp_path / 'tags' / 'markets.xml')
+
+    state = _state(tmp_path)
+    assert state.record(main_feed, ARTICLES)
+    assert state.record(sub_feed, ARTICLES[:1])
+    assert state.flush(hub.url, client)
+    # 前两次请求返回 503，由 HttpClient 重试后成功
+    assert hub.requests == 4 + 2
+    assert hub.published == [BASE_URL + 'feed.xml', BASE_URL + 'feed.atom',
+                             BASE_URL + 'tags/markets.xml', BASE_URL + 'tags/markets.atom']
+    assert state.pending == []
+
+    # 条目没变的重新生成：什么也不通知（状态从文件重新加载）
+    state = _state(tmp_path)
+    assert not state.record(main_feed, list(ARTICLES))
+    assert not state.record(sub_feed, ARTICLES[:1])
+    assert state.flush(hub.url, client)
+    assert hub.requests == 6
+
+    # 只有子 feed 有新条目时只通知子 feed
+    hub.published.clear()
+    assert not state.record(main_feed, ARTICLES)
+    assert state.record(sub_feed, ARTICLES[:2])
+    assert state.flush(hub.url, client)
+    assert hub.published == [BASE_URL + 'tags/markets.xml', BASE_URL + 'tags/markets.atom']
+
+
+def test_failed_topics_stay_pending(tmp_path, client):
+    hub = RecordingHub(fail_first=100)
+    no_retry = HttpClient(max_retries=0)
+    try:
+        state = _state(tmp_path)
+        state.record(str(tmp_path / 'feed.xml'), ARTICLES)
+        assert not state.flush(hub.url, no_retry)
+        assert hub.published == []
+        assert _state(tmp_path).pending == [BASE_URL + 'feed.xml', BASE_URL + 'feed.atom']
+
+        hub.fail_first = 0
+        state = _state(tmp_path)
+        assert state.flush(hub.url, client)
+        assert hub.published == [BASE_URL + 'feed.xml', BASE_URL + 'feed.atom']
+        assert os.path.exists(state.path)
+    finally:
+        no_retry.close()
+        hub.close()
@@ -0,0 +1,40 @@
+"""
+预热浏览器磁盘缓存
+在正式爬取之前用持久化配置目录打开各来源的页面，需设置环境变量 BINANCE_CRAWLER_CACHE
+（各来源共用一个浏览器与配置目录，依次预热后关闭一次）
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from sources import SOURCES, load
+from common.browser_profile import CACHE_ROOT_ENV, cache_root
+from common.runtime import close_runtime
+
+
+def main():
+    root = cache_root()
+    if not root:
+        print(f"未设置 {CACHE_ROOT_ENV}，持久化缓存未启用，无需预热")
+        return
+
+    print(f"缓存目录: {root}")
+    failed = []
+    try:
+        for name in SOURCES:
+            print(f"\n预热: {name}")
+            try:
+                load(name).create_crawler().warm_cache()
+            except Exception as e:
+                print(f"[错误] {name} 预热失败: {e}")
+                failed.append(name)
+    finally:
+        close_runtime()
+    if failed:
+        print(f"\n预热失败: {', '.join(failed)}")
+        sys.exit(1)
+    print("[OK] 浏览器缓存预热完成")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+WebSub 通知
+feed 发布（部署到 GitHub Pages）之后运行：把各来源生成 feed 时记下的、有新条目的 feed 地址通知给 WebSub hub，
+由 hub 推送给订阅者；失败的地址留在状态文件里，下次运行时再通知
+
+需要环境变量 FEED_BASE_URL 与 WEBSUB_HUB（与生成 feed 时相同），未配置时什么也不做
+
+用法:
+    python websub_notify.py [来源名 ...]      不指定时通知 sources.SOURCES 中的全部来源
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from sources import SOURCES, configs, load
+from common import runner
+
+
+def main():
+    names = [arg for arg in sys.argv[1:] if not arg.startswith('-')] or list(SOURCES)
+    ok = True
+    for name in names:
+        module = load(name)
+        config = module.CONFIG
+        if not (config.websub_hub and config.feed_base_url):
+            print(f"[{name}] 未配置 WEBSUB_HUB / FEED_BASE_URL，跳过")
+            continue
+        # 多语言来源每个语言有自己的 feed 与状态文件
+        for locale_config in configs(module):
+            ok = runner.notify_hub(locale_config) and ok
+    # 通知失败不影响已经发布的 feed，留到下次运行
+    if not ok:
+        print("部分 feed 通知失败，下次运行时重试")
+
+
+if __name__ == '__main__':
+    main()